@@ -3,23 +3,73 @@ CLI and GUI entry points for the GEE downloader.
 """
 import sys
 import os
+import json
 import math
-import multiprocessing
+import re
+import importlib.util
 import time
 import logging
-from datetime import datetime, timedelta
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from calendar import monthrange
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+from typing import Any, Optional
+from shapely.geometry import mapping, shape
 
-from .config import DEFAULT_BBOX, DEFAULT_START, DEFAULT_END, OUTDIR_DEFAULT, TARGET_RES, DEFAULT_WORKERS, ENABLE_DYNAMIC_WORKERS
+from .config import (
+    DEFAULT_BBOX, DEFAULT_START, DEFAULT_END, OUTDIR_DEFAULT, TARGET_RES, DEFAULT_WORKERS,
+    ENABLE_DYNAMIC_WORKERS, MONTH_CONCURRENCY, USABLE_CPUS, SATELLITE_DATE_RANGES
+)
 from .utils import month_ranges
-from .processing import process_month
+from .processing import process_month, plan_tile_grid, month_is_done, Sensors
+from .download import warm_up_session
+from .geometry_cache import GEOMETRY_CACHE_DB, lookup_geometry, record_geometry
+from .console_progress import MonthProgressTotals
 
-# Try to import tkinter for GUI
+# Optional orjson for fast key file and GeoJSON parsing
 try:
-    import tkinter as tk
-    from tkinter import ttk, filedialog, messagebox
-    TKINTER_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    TKINTER_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+# tkinter is imported only when a window is opened, so `import gee` stays Tk-free;
+# availability is probed via its C extension, which is what is missing on Tk-less Pythons
+TKINTER_AVAILABLE = importlib.util.find_spec("_tkinter") is not None
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available. Raises ValueError on invalid JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode a text file's bytes: honour a UTF-8/UTF-16 BOM, else UTF-8 with a latin-1 fallback."""
+    if raw[:3] == b'\xef\xbb\xbf':
+        return raw[3:].decode('utf-8')
+    if raw[:2] in (b'\xff\xfe', b'\xfe\xff'):
+        return raw.decode('utf-16')
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('latin-1')
+
+
+def _key_file_has_project_id(key_path: str) -> bool:
+    """
+    Check a service account key file for a 'project_id' field. Files containing the key are
+    accepted without parsing; others are parsed (orjson when available) to tell an invalid
+    file from one that lacks the field. Raises ValueError on invalid JSON.
+    """
+    with open(key_path, 'rb') as f:
+        data = f.read()
+    if b'"project_id"' in data:
+        return True
+    return 'project_id' in _json_loads(data)
 
 
 def show_settings_dialog(parent=None):
@@ -28,6 +78,8 @@ def show_settings_dialog(parent=None):
         print("ERROR: tkinter not available. Cannot show settings dialog.")
         return False
     
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
     from .settings import load_settings, save_settings
     
     # Load existing settings
@@ -39,10 +91,6 @@ def show_settings_dialog(parent=None):
     dialog.geometry("600x350")
     dialog.resizable(False, False)
     
-    if not parent:
-        dialog.transient()
-        dialog.grab_set()
-    
     result = [False]  # Use list to allow modification in nested functions
     
     # Variables
@@ -69,11 +117,11 @@ def show_settings_dialog(parent=None):
     key_frame = ttk.LabelFrame(main_frame, text="Service Account Key (Recommended)", padding="10")
     key_frame.pack(fill=tk.X, pady=(0, 10))
     
-    key_entry_frame = ttk.Frame(key_frame)
-    key_entry_frame.pack(fill=tk.X)
+    # Entry and Browse share the first grid row; the help text spans both columns below
+    key_frame.columnconfigure(0, weight=1)
     
-    key_entry = ttk.Entry(key_entry_frame, textvariable=key_path_var, width=50)
-    key_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+    key_entry = ttk.Entry(key_frame, textvariable=key_path_var, width=50)
+    key_entry.grid(row=0, column=0, sticky=tk.W+tk.E, padx=(0, 5))
     
     def browse_key_file():
         try:
@@ -85,22 +133,20 @@ def show_settings_dialog(parent=None):
             if filename:
                 key_path_var.set(filename)
         except Exception as e:
-            import logging
             logging.error(f"Error browsing for service account key: {e}", exc_info=True)
-            import tkinter.messagebox as messagebox
             messagebox.showerror(
                 "Error",
                 f"Failed to browse for service account key file:\n\n{str(e)}\n\nPlease enter the path manually."
             )
     
-    browse_btn = ttk.Button(key_entry_frame, text="Browse", command=browse_key_file, width=12)
-    browse_btn.pack(side=tk.LEFT)
+    browse_btn = ttk.Button(key_frame, text="Browse", command=browse_key_file, width=12)
+    browse_btn.grid(row=0, column=1)
     
     key_help = tk.Label(key_frame, 
                        text="Select your Google Cloud service account JSON key file.\n"
                             "This automatically includes your project ID.",
                        font=("Arial", 8), fg="gray", justify=tk.LEFT)
-    key_help.pack(anchor=tk.W, pady=(5, 0))
+    key_help.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
     
     # Divider
     divider = ttk.Separator(main_frame, orient=tk.HORIZONTAL)
@@ -139,14 +185,11 @@ def show_settings_dialog(parent=None):
             
             # Try to validate it's a JSON file
             try:
-                import json
-                with open(key_path, 'r') as f:
-                    key_data = json.load(f)
-                    if 'project_id' not in key_data:
-                        messagebox.showwarning("Warning", 
-                            "Key file doesn't contain 'project_id' field.\n"
-                            "Make sure it's a valid Google Cloud service account key file.")
-            except json.JSONDecodeError:
+                if not _key_file_has_project_id(key_path):
+                    messagebox.showwarning("Warning", 
+                        "Key file doesn't contain 'project_id' field.\n"
+                        "Make sure it's a valid Google Cloud service account key file.")
+            except ValueError:
                 messagebox.showerror("Error", "Invalid JSON file. Please select a valid service account key file.")
                 return
             except Exception as e:
@@ -169,14 +212,15 @@ def show_settings_dialog(parent=None):
     cancel_btn = ttk.Button(button_frame, text="Cancel", command=cancel, width=15)
     cancel_btn.pack(side=tk.LEFT, padx=5)
     
-    # Make dialog modal
-    if parent:
-        dialog.transient(parent)
-        dialog.grab_set()
+    dialog.bind('<Return>', lambda event: save_and_close())
+    dialog.bind('<Escape>', lambda event: cancel())
     
     # Center dialog
     dialog.update_idletasks()
     if parent:
+        # Make dialog modal
+        dialog.transient(parent)
+        dialog.grab_set()
         try:
             x = parent.winfo_x() + (parent.winfo_width() // 2) - (dialog.winfo_width() // 2)
             y = parent.winfo_y() + (parent.winfo_height() // 2) - (dialog.winfo_height() // 2)
@@ -196,6 +240,22 @@ def show_settings_dialog(parent=None):
     return result[0]
 
 
+# Entry-point module (main.py), which owns Earth Engine authentication; resolved on first use
+_main_module = None
+
+
+def _get_main():
+    """Get the main module, importing it only if it is not already loaded."""
+    global _main_module
+    if _main_module is None:
+        _main_module = sys.modules.get('main') or importlib.import_module('main')
+    return _main_module
+
+
+# Runs blocking work for the GUI (disk reads, network round-trips) so the Tk thread stays responsive
+_gui_background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gui-bg")
+
+
 def check_earth_engine_initialized():
     """Check if Earth Engine is initialized."""
     try:
@@ -206,12 +266,242 @@ def check_earth_engine_initialized():
         return False
 
 
-def gui_and_run():
-    """Run GUI or CLI interface and process months."""
-    if TKINTER_AVAILABLE:
+def _preload_map_window():
+    """Import the map window module ahead of its first use (a missing webview/folium only shows up then)."""
+    try:
+        importlib.import_module(".map_window", __package__)
+    except Exception as e:
+        logging.debug(f"Map window preload failed: {e}")
+
+
+# Characters that can appear in a typed "lon_min,lat_min,lon_max,lat_max" bbox
+_BBOX_ENTRY_CHARS = frozenset("0123456789.,-+eE ")
+
+
+# A complete "lon_min,lat_min,lon_max,lat_max" bbox, validated and split in one match
+_BBOX_NUM = r'\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*'
+_BBOX_RE = re.compile(r'^' + r','.join([_BBOX_NUM] * 4) + r'$')
+
+
+# Leading "{" of a JSON object, after any whitespace
+_JSON_OBJECT_RE = re.compile(r'\s*\{')
+
+
+def _parse_bbox_content(content: str) -> tuple:
+    """
+    Parse an imported bbox file's text: CSV "lon_min,lat_min,lon_max,lat_max", or a GeoJSON
+    Feature, FeatureCollection (first feature) or Polygon.
+    
+    Returns:
+        (bbox list or None, shapely Polygon or None)
+    """
+    bbox = None
+    # Only content that opens a JSON object can be GeoJSON, and such content is never a CSV bbox
+    is_json = _JSON_OBJECT_RE.match(content) is not None
+    
+    # Try CSV format: lon_min,lat_min,lon_max,lat_max
+    # (split stops after the 4th field; float() ignores the surrounding whitespace)
+    parts = [] if is_json else content.split(',', 4)
+    if len(parts) >= 4:
+        try:
+            # NaN/inf pass here and are rejected by the caller's range check
+            bbox = [float(x) for x in parts[:4]]
+        except ValueError:
+            pass
+    
+    # Try GeoJSON format - store full geometry for polygon support
+    geometry_obj = None
+    if is_json:
+        try:
+            geojson = _json_loads(content)
+            if geojson.get('type') == 'Feature' and geojson.get('geometry'):
+                # Only polygons are used; other geometry types are rejected before building them
+                geom_dict = geojson['geometry']
+                if geom_dict.get('type') == 'Polygon':
+                    geometry_obj = shape(geom_dict)
+                    bbox = list(geometry_obj.bounds)
+            elif geojson.get('type') == 'FeatureCollection' and geojson.get('features'):
+                if geojson['features']:
+                    geom_dict = geojson['features'][0].get('geometry', {})
+                    if geom_dict.get('type') == 'Polygon':
+                        geometry_obj = shape(geom_dict)
+                        bbox = list(geometry_obj.bounds)
+            elif geojson.get('type') == 'Polygon':
+                geometry_obj = shape(geojson)
+                bbox = list(geometry_obj.bounds)
+        except Exception as e:
+            logging.debug(f"Error parsing GeoJSON: {e}")
+    
+    return bbox, geometry_obj
+
+
+def _bbox_in_range(bbox) -> bool:
+    """True for a lon_min,lat_min,lon_max,lat_max bbox inside WGS84 bounds with min < max (NaN fails)."""
+    lon_min, lat_min, lon_max, lat_max = bbox
+    return -180 <= lon_min < lon_max <= 180 and -90 <= lat_min < lat_max <= 90
+
+
+def _bbox_entry_allows(proposed: str) -> bool:
+    """Tk validatecommand for the bbox entry: reject keystrokes that can never form a bbox."""
+    return set(proposed) <= _BBOX_ENTRY_CHARS
+
+
+# Satellites checked when validating a date range (LANDSAT_7_SLC_FAILURE is a flag, not a sensor)
+_CHECKED_SATELLITES = (
+    "LANDSAT_4", "LANDSAT_5", "LANDSAT_7", "LANDSAT_8", "LANDSAT_9",
+    "SENTINEL_2", "MODIS_TERRA", "MODIS_AQUA", "ASTER", "VIIRS"
+)
+
+# Operational ranges parsed once: (name, start, end or None while still operational)
+_SAT_RANGES_DT = [
+    (sat, datetime.fromisoformat(SATELLITE_DATE_RANGES[sat][0]),
+     datetime.fromisoformat(SATELLITE_DATE_RANGES[sat][1]) if SATELLITE_DATE_RANGES[sat][1] else None)
+    for sat in _CHECKED_SATELLITES if sat in SATELLITE_DATE_RANGES
+]
+_EARLIEST_START_DT = min(sat_start for _, sat_start, _ in _SAT_RANGES_DT)
+
+# Suggested start for an empty date range: first of the Landsat 4 launch month ("1982-07-01")
+_SUGGESTED_START = SATELLITE_DATE_RANGES["LANDSAT_4"][0][:8] + "01"
+
+
+@lru_cache(maxsize=16)
+def _parse_bbox_str(bbox_str: str) -> Optional[tuple]:
+    """Parse "lon_min,lat_min,lon_max,lat_max" into a float tuple, or None if it is not 4 numbers."""
+    parts = bbox_str.split(",")
+    if len(parts) != 4:
+        return None
+    try:
+        return tuple(float(p) for p in parts)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4)
+def _suggested_range_for(today: date) -> tuple:
+    """Suggested (start, end) date range for a day: Landsat 4 start to the end of the current/previous month."""
+    # If we're past the 15th of the month, include current month, otherwise use previous month
+    if today.day >= 15:
+        year, month = today.year, today.month
+    elif today.month == 1:
+        year, month = today.year - 1, 12
+    else:
+        year, month = today.year, today.month - 1
+    return _SUGGESTED_START, f"{year:04d}-{month:02d}-{monthrange(year, month)[1]:02d}"
+
+
+@lru_cache(maxsize=256)
+def _calc_tile_geom(bbox: tuple, tile_count: int, target_res: float, num_workers: int) -> tuple:
+    """
+    Estimate the tile grid for a bbox split into about tile_count tiles.
+    
+    Returns:
+        (actual_tiles, size_mb per tile, pixels_per_side, estimated time string)
+    """
+    lon_min, lat_min, lon_max, lat_max = bbox
+    center_lat = (lat_min + lat_max) / 2.0
+    meters_per_deg_lon = 111320 * math.cos(math.radians(center_lat))
+    meters_per_deg_lat = 111000
+    lon_span_m = (lon_max - lon_min) * meters_per_deg_lon
+    lat_span_m = (lat_max - lat_min) * meters_per_deg_lat
+    
+    # Calculate aspect ratio
+    aspect = lon_span_m / lat_span_m if lat_span_m > 0 else 1.0
+    nx = max(1, round(math.sqrt(tile_count * aspect)))
+    ny = max(1, round(math.sqrt(tile_count / aspect)))
+    actual_tiles = nx * ny
+    
+    # Calculate tile dimensions
+    tile_width_m = lon_span_m / nx
+    tile_height_m = lat_span_m / ny
+    tile_side_m = max(tile_width_m, tile_height_m)
+    
+    # Calculate pixels per tile at the target resolution
+    pixels_per_side = tile_side_m / target_res
+    pixels_per_tile = pixels_per_side * pixels_per_side
+    
+    # Calculate download size (6 bands × Float32 = 24 bytes per pixel)
+    bytes_per_pixel = 6 * 4  # 6 bands × 4 bytes (Float32)
+    size_bytes = pixels_per_tile * bytes_per_pixel
+    size_mb = size_bytes / (1024 * 1024)
+    
+    # Estimate time per tile (seconds)
+    # Earth Engine processing: ~3-5 seconds (depends on complexity, resolution)
+    # Download time: size_mb / download_speed_mbps (assume 10 Mbps = 1.25 MB/s)
+    # Local processing: ~1-2 seconds
+    ee_processing_time = 4.0  # Average Earth Engine processing time
+    download_speed_mbps = 10.0  # Conservative estimate: 10 Mbps
+    download_time = size_mb / (download_speed_mbps / 8)  # Convert Mbps to MB/s
+    local_processing_time = 1.5  # Local validation, masking, etc.
+    time_per_tile = ee_processing_time + download_time + local_processing_time
+    
+    # Total time with parallel workers
+    tiles_per_worker = actual_tiles / num_workers
+    estimated_total_seconds = tiles_per_worker * time_per_tile
+    
+    # Format time estimate
+    if estimated_total_seconds < 60:
+        time_str = f"{estimated_total_seconds:.0f} sec"
+    elif estimated_total_seconds < 3600:
+        time_str = f"{estimated_total_seconds / 60:.1f} min"
+    else:
+        time_str = f"{estimated_total_seconds / 3600:.1f} hours"
+    
+    return actual_tiles, size_mb, pixels_per_side, time_str
+
+
+@dataclass
+class RunConfig:
+    """Run parameters collected from the GUI form or the command-line prompts."""
+    geometry: Any  # bbox tuple (lon_min, lat_min, lon_max, lat_max) or imported Shapely polygon
+    start: str
+    end: str
+    out: str
+    workers: int
+    enable_harmonize: bool = True
+    include_modis: bool = True
+    include_aster: bool = True
+    include_viirs: bool = True
+    target_resolution: float = TARGET_RES
+    max_tiles: Optional[int] = None
+    enable_dynamic_workers: bool = ENABLE_DYNAMIC_WORKERS
+    server_mode: bool = False
+    
+    def to_dict(self) -> dict:
+        """JSON-serializable form; an imported polygon is stored as GeoJSON."""
+        d = asdict(self)
+        if not isinstance(self.geometry, tuple):
+            d["geometry"] = mapping(self.geometry)
+        return d
+    
+    @classmethod
+    def from_dict(cls, d: dict) -> "RunConfig":
+        """Inverse of to_dict."""
+        d = dict(d)
+        if isinstance(d["geometry"], dict):
+            d["geometry"] = shape(d["geometry"])
+        else:
+            d["geometry"] = tuple(d["geometry"])
+        return cls(**d)
+    
+    @classmethod
+    def from_gui(cls) -> Optional["RunConfig"]:
+        """Show the start form. Returns None if the user cancels."""
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox
+        
+        from .settings import load_settings, save_settings, SETTINGS_DIR
+        
+        # Parsed bbox imports are cached next to the user's settings
+        geometry_cache_db = str(SETTINGS_DIR / GEOMETRY_CACHE_DB)
+        
         print("Initializing GUI...", flush=True)
         logging.info("Initializing GUI...")
         
+        # Read saved settings while Tk starts up; the map window module (webview, folium)
+        # is imported in the background too, so the map buttons don't stall on it
+        settings_future = _gui_background.submit(load_settings)
+        _gui_background.submit(_preload_map_window)
+        
         root = tk.Tk()
         root.title("Dead Sea — All Upgrades Downloader")
         root.geometry("700x800")
@@ -232,8 +522,17 @@ def gui_and_run():
         
         canvas_frame = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         
+        # Resizes arrive in bursts while the window is dragged; only the last width is applied
+        pending_resize = [None]
+        
         def configure_canvas_width(event):
             canvas_width = event.width
+            if pending_resize[0] is not None:
+                root.after_cancel(pending_resize[0])
+            pending_resize[0] = root.after(30, apply_canvas_width, canvas_width)
+        
+        def apply_canvas_width(canvas_width):
+            pending_resize[0] = None
             canvas.itemconfig(canvas_frame, width=canvas_width)
         
         canvas.bind('<Configure>', configure_canvas_width)
@@ -247,9 +546,8 @@ def gui_and_run():
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
         
-        # Load saved settings
-        from .settings import load_settings, save_settings
-        settings = load_settings()
+        # Saved settings, loaded in the background since startup
+        settings = settings_future.result()
         
         # Variables - load from settings if available, otherwise use defaults
         bbox_default = settings.get('bbox', (",".join(map(str, DEFAULT_BBOX)) if DEFAULT_BBOX else ""))
@@ -271,6 +569,7 @@ def gui_and_run():
         dynamic_workers_var = tk.BooleanVar(value=True)  # Enable dynamic workers by default
         server_mode_var = tk.BooleanVar(value=False)  # Server mode - maximize resources
         submit_clicked = [False]
+        validated_ranges = {}  # (start, end) -> satellite availability, reused across submits
         
         def browse_folder():
             try:
@@ -285,7 +584,6 @@ def gui_and_run():
                 if folder:
                     out_var.set(folder)
             except Exception as e:
-                import tkinter.messagebox as messagebox
                 logging.error(f"Error browsing for output folder: {e}", exc_info=True)
                 messagebox.showerror(
                     "Error",
@@ -302,7 +600,6 @@ def gui_and_run():
                 if filename:
                     service_account_key_var.set(filename)
             except Exception as e:
-                import tkinter.messagebox as messagebox
                 logging.error(f"Error browsing for service account key: {e}", exc_info=True)
                 messagebox.showerror(
                     "Error",
@@ -311,38 +608,20 @@ def gui_and_run():
         
         def check_satellites_available(start: str, end: str) -> bool:
             """Check if any satellites are operational during the date range."""
-            from .utils import is_satellite_operational
-            from .config import SATELLITE_DATE_RANGES
-            
-            # Check all satellites except SLC_FAILURE (that's a special flag)
-            satellites_to_check = [
-                "LANDSAT_4", "LANDSAT_5", "LANDSAT_7", "LANDSAT_8", "LANDSAT_9",
-                "SENTINEL_2", "MODIS_TERRA", "MODIS_AQUA", "ASTER", "VIIRS"
-            ]
-            
-            # Find the earliest satellite start date
-            earliest_start = None
-            for sat in satellites_to_check:
-                if sat in SATELLITE_DATE_RANGES:
-                    sat_start = SATELLITE_DATE_RANGES[sat][0]
-                    if earliest_start is None or sat_start < earliest_start:
-                        earliest_start = sat_start
-            
-            # Check if start date is before earliest satellite
             start_dt = datetime.fromisoformat(start)
-            earliest_dt = datetime.fromisoformat(earliest_start) if earliest_start else None
+            end_dt = datetime.fromisoformat(end)
             
-            if earliest_dt and start_dt < earliest_dt:
+            # Check if start date is before earliest satellite
+            if start_dt < _EARLIEST_START_DT:
                 # Start date is before any satellites exist
-                logging.info(f"Start date {start} is before earliest satellite ({earliest_start})")
+                logging.info(f"Start date {start} is before earliest satellite ({_EARLIEST_START_DT.date()})")
                 return False
             
             # Check if any satellites are operational during the date range
-            available_sats = []
-            for sat in satellites_to_check:
-                if is_satellite_operational(sat, start, end):
-                    available_sats.append(sat)
-                    logging.debug(f"Satellite {sat} is operational for {start} to {end}")
+            available_sats = [
+                sat for sat, sat_start, sat_end in _SAT_RANGES_DT
+                if sat_start <= end_dt and (sat_end is None or sat_end >= start_dt)
+            ]
             
             if available_sats:
                 logging.debug(f"Found {len(available_sats)} operational satellites: {available_sats}")
@@ -353,49 +632,7 @@ def gui_and_run():
         
         def calculate_suggested_date_range() -> tuple:
             """Calculate suggested date range: Landsat 4 start to current/previous month."""
-            from datetime import datetime
-            from .config import SATELLITE_DATE_RANGES
-            
-            # Get Landsat 4 start date (first month: 1982-07)
-            landsat4_start = SATELLITE_DATE_RANGES["LANDSAT_4"][0]  # "1982-07-16"
-            landsat4_start_dt = datetime.fromisoformat(landsat4_start)
-            suggested_start = landsat4_start_dt.replace(day=1).strftime("%Y-%m-%d")  # "1982-07-01"
-            
-            # Get current date
-            now = datetime.now()
-            current_day = now.day
-            current_month = now.month
-            current_year = now.year
-            
-            # If we're past the 15th of the month, include current month, otherwise use previous month
-            if current_day >= 15:
-                # Use current month
-                suggested_end = now.replace(day=1)
-                # Get last day of current month
-                if current_month == 12:
-                    last_day = datetime(current_year, 12, 31)
-                else:
-                    next_month = datetime(current_year, current_month + 1, 1)
-                    last_day = next_month - timedelta(days=1)
-                suggested_end_str = last_day.strftime("%Y-%m-%d")
-            else:
-                # Use previous month
-                if current_month == 1:
-                    prev_month = 12
-                    prev_year = current_year - 1
-                else:
-                    prev_month = current_month - 1
-                    prev_year = current_year
-                prev_month_start = datetime(prev_year, prev_month, 1)
-                # Get last day of previous month
-                if prev_month == 12:
-                    last_day = datetime(prev_year, 12, 31)
-                else:
-                    next_month = datetime(prev_year, prev_month + 1, 1)
-                    last_day = next_month - timedelta(days=1)
-                suggested_end_str = last_day.strftime("%Y-%m-%d")
-            
-            return suggested_start, suggested_end_str
+            return _suggested_range_for(date.today())
         
         def submit():
             # Save all settings including parameters
@@ -411,7 +648,10 @@ def gui_and_run():
             try:
                 if start_date and end_date:
                     logging.info(f"Checking satellite availability for date range: {start_date} to {end_date}")
-                    satellites_available = check_satellites_available(start_date, end_date)
+                    satellites_available = validated_ranges.get((start_date, end_date))
+                    if satellites_available is None:
+                        satellites_available = check_satellites_available(start_date, end_date)
+                        validated_ranges[(start_date, end_date)] = satellites_available
                     logging.info(f"Satellite availability check result: {satellites_available}")
                     
                     if not satellites_available:
@@ -462,22 +702,36 @@ def gui_and_run():
                 max_tiles=max_tiles if max_tiles else None
             )
             
-            # Initialize Earth Engine if we have credentials
+            # Validate tile count before submitting
+            if not validate_tile_count():
+                # Show error dialog
+                messagebox.showerror("Validation Error", 
+                    "Tile count would result in tiles exceeding 40 MB limit!\n"
+                    "Please increase the tile count or leave empty for auto-calculation.")
+                return
+            
+            # Initialize Earth Engine if we have credentials.
+            # Initialization is a network round-trip, so it runs in the background while the form stays live.
             if key_path or project_id:
+                submit_btn.config(state=tk.DISABLED)
+                root.config(cursor="watch")
+                root.after(100, finish_submit, _gui_background.submit(initialize_earth_engine))
+                return
+            finish_submit(None)
+        
+        def initialize_earth_engine():
+            return _get_main().initialize_earth_engine()
+        
+        def finish_submit(init_future):
+            """Close the form once Earth Engine initialization (if started) has succeeded."""
+            if init_future is not None:
+                if not init_future.done():
+                    root.after(100, finish_submit, init_future)
+                    return
+                submit_btn.config(state=tk.NORMAL)
+                root.config(cursor="")
                 try:
-                    import sys
-                    import importlib
-                    main_module = sys.modules.get('main') or importlib.import_module('main')
-                    if not main_module.initialize_earth_engine():
-                        messagebox.showerror(
-                            "Authentication Failed",
-                            "Failed to initialize Earth Engine.\n\n"
-                            "Please check:\n"
-                            "1. Service account key file is valid\n"
-                            "2. Project ID is correct (if provided)\n"
-                            "3. You have proper permissions"
-                        )
-                        return
+                    initialized = init_future.result()
                 except Exception as e:
                     messagebox.showerror(
                         "Error",
@@ -485,23 +739,30 @@ def gui_and_run():
                         "Please check your settings and try again."
                     )
                     return
-            
-            # Validate tile count before submitting
-            if not validate_tile_count():
-                # Show error dialog
-                messagebox.showerror("Validation Error", 
-                    "Tile count would result in tiles exceeding 40 MB limit!\n"
-                    "Please increase the tile count or leave empty for auto-calculation.")
-                return
+                if not initialized:
+                    messagebox.showerror(
+                        "Authentication Failed",
+                        "Failed to initialize Earth Engine.\n\n"
+                        "Please check:\n"
+                        "1. Service account key file is valid\n"
+                        "2. Project ID is correct (if provided)\n"
+                        "3. You have proper permissions"
+                    )
+                    return
             
             submit_clicked[0] = True
-            root.quit()
-            root.destroy()
+            root.after(0, close_form)
         
         def cancel():
-            root.quit()
+            close_form()
+        
+        def close_form():
+            # bind_all is global to the Tcl interpreter; drop it so it does not outlive the form
+            canvas.unbind_all("<MouseWheel>")
             root.destroy()
         
+        root.protocol("WM_DELETE_WINDOW", close_form)
+        
         # Layout
         title_label = tk.Label(scrollable_frame, text="Dead Sea — All Upgrades Downloader", font=("Arial", 14, "bold"))
         title_label.pack(pady=10)
@@ -512,26 +773,20 @@ def gui_and_run():
         ttk.Label(frame, text="BBox lon_min,lat_min,lon_max,lat_max:").grid(row=0, column=0, sticky=tk.W, pady=5)
         bbox_frame = ttk.Frame(frame)
         bbox_frame.grid(row=0, column=1, sticky=tk.W+tk.E, pady=5)
-        ttk.Entry(bbox_frame, textvariable=bbox_var, width=30).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # Numeric input is enforced while typing; paste/import/map set bbox_var directly
+        bbox_vcmd = (root.register(_bbox_entry_allows), "%P")
+        ttk.Entry(bbox_frame, textvariable=bbox_var, width=30, validate="key",
+                  validatecommand=bbox_vcmd).pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         def open_map_selector():
             """Open interactive map selector in embedded Python window."""
             try:
                 from .map_window import open_map_selector_window
-                import tkinter.messagebox as messagebox
-                import threading
                 
                 # Get current bbox if set
                 try:
-                    bbox_str = bbox_var.get().strip()
-                    if bbox_str:
-                        current_bbox = tuple(map(float, bbox_str.split(",")))
-                        if len(current_bbox) == 4:
-                            initial_bbox = current_bbox
-                        else:
-                            initial_bbox = None
-                    else:
-                        initial_bbox = None
+                    m = _BBOX_RE.match(bbox_var.get())
+                    initial_bbox = tuple(map(float, m.groups())) if m else None
                 except (ValueError, AttributeError):
                     initial_bbox = None
                 
@@ -561,7 +816,6 @@ def gui_and_run():
                 monitor_thread.start()
                 
             except ImportError as e:
-                import tkinter.messagebox as messagebox
                 messagebox.showerror(
                     "Missing Dependencies",
                     f"Map selector requires additional package:\n\n"
@@ -570,23 +824,18 @@ def gui_and_run():
                     f"Error: {e}"
                 )
             except Exception as e:
-                import tkinter.messagebox as messagebox
                 messagebox.showerror("Error", f"Failed to open map selector: {e}")
         
         def paste_from_map():
             """Paste bbox from clipboard (after user saves from map selector)."""
             try:
-                import tkinter.messagebox as messagebox
                 try:
                     # Try multiple methods to get clipboard
                     clipboard_text = None
                     
-                    # Method 1: Try tkinter clipboard
+                    # Method 1: Try tkinter clipboard (read through the form's own root)
                     try:
-                        root_temp = tk.Tk()
-                        root_temp.withdraw()
-                        clipboard_text = root_temp.clipboard_get()
-                        root_temp.destroy()
+                        clipboard_text = root.clipboard_get()
                     except tk.TclError:
                         pass
                     
@@ -614,14 +863,9 @@ def gui_and_run():
                     if clipboard_text.startswith('GEE_BBOX:'):
                         bbox_str = clipboard_text.replace('GEE_BBOX:', '').strip()
                     else:
-                        # Try to parse as bbox
-                        parts = clipboard_text.strip().split(',')
-                        if len(parts) == 4:
-                            try:
-                                bbox = tuple(map(float, parts))
-                                bbox_str = ",".join(map(str, bbox))
-                            except (ValueError, TypeError):
-                                pass
+                        # Try to parse as bbox; the numbers are only checked, the pasted text is kept as-is
+                        if _BBOX_RE.match(clipboard_text):
+                            bbox_str = clipboard_text.strip()
                     
                     if bbox_str:
                         bbox_var.set(bbox_str)
@@ -637,10 +881,8 @@ def gui_and_run():
                             "3. The bbox will be automatically added, or click 'Paste from Map' again"
                         )
                 except Exception as e:
-                    import tkinter.messagebox as messagebox
                     messagebox.showerror("Error", f"Failed to paste BBox: {e}")
             except Exception as e:
-                import tkinter.messagebox as messagebox
                 messagebox.showerror("Error", f"Failed to paste BBox: {e}")
         
         # Periodic clipboard check disabled - user must manually paste or use "Paste from Map" button
@@ -661,7 +903,6 @@ def gui_and_run():
         def import_bbox_file():
             """Import bbox from a file."""
             try:
-                import tkinter.messagebox as messagebox
                 try:
                     filename = filedialog.askopenfilename(
                         title="Import BBox from File",
@@ -676,7 +917,6 @@ def gui_and_run():
                     if not filename:
                         return
                 except Exception as e:
-                    import tkinter.messagebox as messagebox
                     logging.error(f"Error browsing for BBox file: {e}", exc_info=True)
                     messagebox.showerror(
                         "Error",
@@ -684,69 +924,25 @@ def gui_and_run():
                     )
                     return
                 
-                # Read and parse file with encoding handling
-                try:
-                    with open(filename, 'r', encoding='utf-8') as f:
-                        content = f.read().strip()
-                except UnicodeDecodeError:
-                    # Try with different encoding
-                    with open(filename, 'r', encoding='latin-1') as f:
-                        content = f.read().strip()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to read file: {e}")
-                    return
-                
-                bbox = None
-                
-                # Try CSV format: lon_min,lat_min,lon_max,lat_max
-                parts = content.split(',')
-                if len(parts) >= 4:
-                    try:
-                        coords = [float(x.strip()) for x in parts[:4]]
-                        if all(not math.isnan(x) for x in coords):
-                            bbox = coords
-                    except ValueError:
-                        pass
-                
-                # Try GeoJSON format - store full geometry for polygon support
-                geometry_obj = None
-                if not bbox:
+                # An unchanged file imported before is not read or parsed again
+                cached = lookup_geometry(geometry_cache_db, filename)
+                if cached is not None:
+                    bbox, geometry_obj = cached
+                else:
+                    # Read the file once and decode it in memory
                     try:
-                        import json
-                        from shapely.geometry import shape
-                        geojson = json.loads(content)
-                        if geojson.get('type') == 'Feature' and geojson.get('geometry'):
-                            geometry_obj = shape(geojson['geometry'])
-                            if geometry_obj.geom_type == 'Polygon':
-                                coords = geojson['geometry']['coordinates'][0]
-                                lons = [c[0] for c in coords]
-                                lats = [c[1] for c in coords]
-                                bbox = [min(lons), min(lats), max(lons), max(lats)]
-                        elif geojson.get('type') == 'FeatureCollection' and geojson.get('features'):
-                            if geojson['features']:
-                                geom_dict = geojson['features'][0].get('geometry', {})
-                                if geom_dict.get('type') == 'Polygon':
-                                    geometry_obj = shape(geom_dict)
-                                    coords = geom_dict['coordinates'][0]
-                                    lons = [c[0] for c in coords]
-                                    lats = [c[1] for c in coords]
-                                    bbox = [min(lons), min(lats), max(lons), max(lats)]
-                        elif geojson.get('type') == 'Polygon':
-                            geometry_obj = shape(geojson)
-                            coords = geojson['coordinates'][0]
-                            lons = [c[0] for c in coords]
-                            lats = [c[1] for c in coords]
-                            bbox = [min(lons), min(lats), max(lons), max(lats)]
-                    except (json.JSONDecodeError, KeyError, IndexError, Exception) as e:
-                        logging.debug(f"Error parsing GeoJSON: {e}")
-                        pass
+                        with open(filename, 'rb') as f:
+                            content = _decode_text(f.read())
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Failed to read file: {e}")
+                        return
+                    bbox, geometry_obj = _parse_bbox_content(content)
+                    if bbox:
+                        record_geometry(geometry_cache_db, filename, bbox, geometry_obj)
                 
                 if bbox and len(bbox) == 4:
                     # Validate bbox coordinates
-                    lon_min, lat_min, lon_max, lat_max = bbox
-                    if not (-180 <= lon_min <= 180 and -180 <= lon_max <= 180 and
-                            -90 <= lat_min <= 90 and -90 <= lat_max <= 90 and
-                            lon_min < lon_max and lat_min < lat_max):
+                    if not _bbox_in_range(bbox):
                         messagebox.showerror(
                             "Invalid Coordinates",
                             "BBox coordinates are out of valid range:\n"
@@ -786,7 +982,6 @@ def gui_and_run():
                                         "Map Window",
                                         f"BBox imported successfully, but could not open map window:\n{e}"
                                     ))
-                            import threading
                             thread = threading.Thread(target=open_map, daemon=True)
                             thread.start()
                         except Exception as e:
@@ -804,18 +999,22 @@ def gui_and_run():
                         "2. GeoJSON: Feature or FeatureCollection with Polygon geometry"
                     )
             except Exception as e:
-                import tkinter.messagebox as messagebox
                 messagebox.showerror("Error", f"Failed to import BBox file: {e}")
         
         ttk.Button(bbox_frame, text="🗺️ Map", command=open_map_selector, width=10).pack(side=tk.LEFT, padx=2)
         ttk.Button(bbox_frame, text="📋 Paste", command=paste_from_map, width=10).pack(side=tk.LEFT, padx=2)
         ttk.Button(bbox_frame, text="📁 Import", command=import_bbox_file, width=10).pack(side=tk.LEFT, padx=2)
         
-        ttk.Label(frame, text="Start date (YYYY-MM-DD):").grid(row=1, column=0, sticky=tk.W, pady=5)
-        ttk.Entry(frame, textvariable=start_var, width=40).grid(row=1, column=1, pady=5)
+        def add_entry_rows(rows):
+            """Grid plain "label: entry" rows given as (row, label, variable), in creation (tab) order."""
+            for row, text, var in rows:
+                ttk.Label(frame, text=text).grid(row=row, column=0, sticky=tk.W, pady=5)
+                ttk.Entry(frame, textvariable=var, width=40).grid(row=row, column=1, pady=5)
         
-        ttk.Label(frame, text="End date (YYYY-MM-DD):").grid(row=2, column=0, sticky=tk.W, pady=5)
-        ttk.Entry(frame, textvariable=end_var, width=40).grid(row=2, column=1, pady=5)
+        add_entry_rows([
+            (1, "Start date (YYYY-MM-DD):", start_var),
+            (2, "End date (YYYY-MM-DD):", end_var),
+        ])
         
         ttk.Label(frame, text="Output folder:").grid(row=3, column=0, sticky=tk.W, pady=5)
         folder_frame = ttk.Frame(frame)
@@ -833,8 +1032,7 @@ def gui_and_run():
         ttk.Entry(key_frame, textvariable=service_account_key_var, width=30).pack(side=tk.LEFT, fill=tk.X, expand=True)
         ttk.Button(key_frame, text="Browse", command=browse_service_account_key, width=10).pack(side=tk.LEFT, padx=5)
         
-        ttk.Label(frame, text="Project ID (optional):").grid(row=7, column=0, sticky=tk.W, pady=5)
-        ttk.Entry(frame, textvariable=project_id_var, width=40).grid(row=7, column=1, pady=5)
+        add_entry_rows([(7, "Project ID (optional):", project_id_var)])
         # Use tk.Label instead of ttk.Label for fg color support
         help_style = ttk.Style()
         help_style.configure("Help.TLabel", foreground="gray", font=("Arial", 8))
@@ -843,154 +1041,136 @@ def gui_and_run():
         
         ttk.Separator(frame, orient=tk.HORIZONTAL).grid(row=9, column=0, columnspan=2, sticky=tk.W+tk.E, pady=10)
         
-        ttk.Checkbutton(frame, text="Enable harmonization (S2 <-> LS)", variable=harm_var).grid(row=10, column=0, columnspan=2, sticky=tk.W, pady=5)
-        
-        ttk.Checkbutton(frame, text="Include MODIS", variable=modis_var).grid(row=11, column=0, columnspan=2, sticky=tk.W, pady=5)
-        ttk.Checkbutton(frame, text="Include ASTER", variable=aster_var).grid(row=12, column=0, columnspan=2, sticky=tk.W, pady=5)
-        ttk.Checkbutton(frame, text="Include VIIRS", variable=viirs_var).grid(row=13, column=0, columnspan=2, sticky=tk.W, pady=5)
-        ttk.Checkbutton(frame, text="Enable dynamic worker scaling (auto-adjust based on system performance)", 
-                       variable=dynamic_workers_var).grid(row=15, column=0, columnspan=2, sticky=tk.W, pady=5)
+        # Option checkboxes, (row, label, variable)
+        option_rows = [
+            (10, "Enable harmonization (S2 <-> LS)", harm_var),
+            (11, "Include MODIS", modis_var),
+            (12, "Include ASTER", aster_var),
+            (13, "Include VIIRS", viirs_var),
+            (15, "Enable dynamic worker scaling (auto-adjust based on system performance)", dynamic_workers_var),
+        ]
+        for row, text, var in option_rows:
+            ttk.Checkbutton(frame, text=text, variable=var).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=5)
         # Fix: ttk.Checkbutton doesn't support foreground/font directly - use Style instead
         style = ttk.Style()
         style.configure("ServerMode.TCheckbutton", foreground="blue", font=("Arial", 9, "bold"))
         ttk.Checkbutton(frame, text="Server Mode (maximize resources, focus all CPU/memory on processing)", 
                        variable=server_mode_var, style="ServerMode.TCheckbutton").grid(row=16, column=0, columnspan=2, sticky=tk.W, pady=5)
         
-        ttk.Label(frame, text="Resolution (meters, forced to 5m):").grid(row=17, column=0, sticky=tk.W, pady=5)
         resolution_var = tk.StringVar(value="5.0")
-        ttk.Entry(frame, textvariable=resolution_var, width=40).grid(row=17, column=1, pady=5)
-        ttk.Label(frame, text="Workers:").grid(row=18, column=0, sticky=tk.W, pady=5)
-        workers_entry = ttk.Entry(frame, textvariable=workers_var, width=40)
-        workers_entry.grid(row=18, column=1, pady=5)
-        
-        ttk.Label(frame, text="Max tiles (empty = auto):").grid(row=19, column=0, sticky=tk.W, pady=5)
-        tile_entry = ttk.Entry(frame, textvariable=max_tiles_var, width=40)
-        tile_entry.grid(row=19, column=1, pady=5)
+        add_entry_rows([
+            (17, "Resolution (meters, forced to 5m):", resolution_var),
+            (18, "Workers:", workers_var),
+            (19, "Max tiles (empty = auto):", max_tiles_var),
+        ])
         
         # Validation label for tile size warning
         # Fix: Use Style for ttk.Label foreground color (more reliable across platforms)
+        # Error and OK styles are configured once; validation only switches between them
         warning_style = ttk.Style()
         warning_style.configure("Warning.TLabel", foreground="red", font=("Arial", 8))
+        warning_style.configure("TileOK.TLabel", foreground="green", font=("Arial", 8))
         tile_warning_label = ttk.Label(frame, text="", style="Warning.TLabel")
         tile_warning_label.grid(row=20, column=1, sticky=tk.W, pady=2)
+        tile_status = [("", "Warning.TLabel")]
+        
+        def show_tile_status(text, style="Warning.TLabel"):
+            # Repeated validations mostly produce the same message; skip the widget update then
+            if tile_status[0] != (text, style):
+                tile_status[0] = (text, style)
+                tile_warning_label.config(text=text, style=style)
+        
+        # Latest parsed field values: None when empty (or an unusable bbox/worker count);
+        # invalid_entry marks a tile count that is not a number
+        invalid_entry = object()
+        parsed = {"bbox": None, "workers": None, "tiles": None}
         
         def validate_tile_count(*args):
             """Validate tile count and calculate expected tile size."""
             try:
-                tile_count_str = max_tiles_var.get().strip()
-                if not tile_count_str:
-                    tile_warning_label.config(text="")
+                tile_count = parsed["tiles"]
+                if tile_count is None:
+                    show_tile_status("")
                     return True
                 
-                tile_count = int(tile_count_str)
+                if tile_count is invalid_entry:
+                    raise ValueError("tile count is not a number")
                 if tile_count < 1:
-                    warning_style.configure("Warning.TLabel", foreground="red")
-                    tile_warning_label.config(text="Error: Tile count must be at least 1", style="Warning.TLabel")
+                    show_tile_status("Error: Tile count must be at least 1")
+                    return False
+                
+                # A bbox still being typed ("35.1,") has no parse; report it without raising
+                bbox = parsed["bbox"]
+                if bbox is None:
+                    show_tile_status("Error: Invalid bbox or calculation")
                     return False
                 
                 # Calculate expected tile size
                 try:
-                    bbox_str = bbox_var.get()
-                    bbox = tuple(map(float, bbox_str.split(",")))
-                    lon_min, lat_min, lon_max, lat_max = bbox
-                    center_lat = (lat_min + lat_max) / 2.0
-                    
-                    import math
-                    meters_per_deg_lon = 111320 * math.cos(math.radians(center_lat))
-                    meters_per_deg_lat = 111000
-                    lon_span_m = (lon_max - lon_min) * meters_per_deg_lon
-                    lat_span_m = (lat_max - lat_min) * meters_per_deg_lat
+                    num_workers = max(1, min(parsed["workers"] or 8, 8))  # Cap at 8
                     
-                    # Calculate aspect ratio
-                    aspect = lon_span_m / lat_span_m if lat_span_m > 0 else 1.0
-                    nx = max(1, round(math.sqrt(tile_count * aspect)))
-                    ny = max(1, round(math.sqrt(tile_count / aspect)))
-                    actual_tiles = nx * ny
-                    
-                    # Calculate tile dimensions
-                    tile_width_m = lon_span_m / nx
-                    tile_height_m = lat_span_m / ny
-                    tile_side_m = max(tile_width_m, tile_height_m)
-                    
-                    # Calculate pixels per tile at 5m resolution
-                    pixels_per_side = tile_side_m / TARGET_RES
-                    pixels_per_tile = pixels_per_side * pixels_per_side
-                    
-                    # Calculate download size (6 bands × Float32 = 24 bytes per pixel)
-                    bytes_per_pixel = 6 * 4  # 6 bands × 4 bytes (Float32)
-                    size_bytes = pixels_per_tile * bytes_per_pixel
-                    size_mb = size_bytes / (1024 * 1024)
+                    # Pure geometry math, memoized: traces fire on every keystroke
+                    actual_tiles, size_mb, pixels_per_side, time_str = _calc_tile_geom(
+                        bbox, tile_count, TARGET_RES, num_workers)
                     
                     # Check against 40 MB limit
                     if size_mb > 40:
-                        warning_style.configure("Warning.TLabel", foreground="red")
-                        tile_warning_label.config(
-                            text=f"ERROR: {size_mb:.1f} MB per tile exceeds 40 MB limit! Use more tiles.",
-                            style="Warning.TLabel"
-                        )
+                        show_tile_status(f"ERROR: {size_mb:.1f} MB per tile exceeds 40 MB limit! Use more tiles.")
                         return False
                     else:
-                        # Estimate processing time
-                        # Factors: Earth Engine processing (~3-5 sec), download (~size/10 Mbps), local processing (~1-2 sec)
-                        # Conservative estimate: 5 seconds base + download time
-                        try:
-                            num_workers = int(workers_var.get()) if workers_var.get().strip() else 8
-                            num_workers = max(1, min(num_workers, 8))  # Cap at 8
-                        except (ValueError, AttributeError):
-                            num_workers = 8
-                        
-                        # Estimate time per tile (seconds)
-                        # Earth Engine processing: ~3-5 seconds (depends on complexity, resolution)
-                        # Download time: size_mb / download_speed_mbps (assume 10 Mbps = 1.25 MB/s)
-                        # Local processing: ~1-2 seconds
-                        ee_processing_time = 4.0  # Average Earth Engine processing time
-                        download_speed_mbps = 10.0  # Conservative estimate: 10 Mbps
-                        download_time = size_mb / (download_speed_mbps / 8)  # Convert Mbps to MB/s
-                        local_processing_time = 1.5  # Local validation, masking, etc.
-                        time_per_tile = ee_processing_time + download_time + local_processing_time
-                        
-                        # Total time with parallel workers
-                        total_tiles = actual_tiles
-                        tiles_per_worker = total_tiles / num_workers
-                        estimated_total_seconds = tiles_per_worker * time_per_tile
-                        
-                        # Format time estimate
-                        if estimated_total_seconds < 60:
-                            time_str = f"{estimated_total_seconds:.0f} sec"
-                        elif estimated_total_seconds < 3600:
-                            minutes = estimated_total_seconds / 60
-                            time_str = f"{minutes:.1f} min"
-                        else:
-                            hours = estimated_total_seconds / 3600
-                            time_str = f"{hours:.1f} hours"
-                        
-                        warning_style.configure("Warning.TLabel", foreground="green")
-                        tile_warning_label.config(
-                            text=f"OK: ~{size_mb:.1f} MB/tile, {actual_tiles} tiles, ~{int(pixels_per_side)} px/tile | Est. time: {time_str}",
-                            style="Warning.TLabel"
+                        show_tile_status(
+                            f"OK: ~{size_mb:.1f} MB/tile, {actual_tiles} tiles, ~{int(pixels_per_side)} px/tile | Est. time: {time_str}",
+                            "TileOK.TLabel"
                         )
                         return True
                 except (ValueError, ZeroDivisionError) as e:
-                    warning_style.configure("Warning.TLabel", foreground="red")
-                    tile_warning_label.config(text="Error: Invalid bbox or calculation", style="Warning.TLabel")
+                    show_tile_status("Error: Invalid bbox or calculation")
                     return False
                     
             except ValueError:
-                warning_style.configure("Warning.TLabel", foreground="red")
-                tile_warning_label.config(text="Error: Tile count must be a number", style="Warning.TLabel")
+                show_tile_status("Error: Tile count must be a number")
                 return False
         
-        # Bind validation to tile count, bbox, and workers changes
-        max_tiles_var.trace('w', validate_tile_count)
-        bbox_var.trace('w', validate_tile_count)
-        workers_var.trace('w', validate_tile_count)
+        # Bind validation to tile count, bbox, and workers changes, debounced so a burst of
+        # keystrokes validates once, 150 ms after the last one (submit still validates directly)
+        pending_validation = [None]
+        
+        def parse_inputs(*args):
+            """Parse the three fields once per edit; validation and submit read the results."""
+            parsed["bbox"] = _parse_bbox_str(bbox_var.get())
+            try:
+                workers_str = workers_var.get().strip()
+                parsed["workers"] = int(workers_str) if workers_str else None
+            except ValueError:
+                parsed["workers"] = None
+            try:
+                tiles_str = max_tiles_var.get().strip()
+                parsed["tiles"] = int(tiles_str) if tiles_str else None
+            except ValueError:
+                parsed["tiles"] = invalid_entry
+        
+        def schedule_tile_validation(*args):
+            parse_inputs()
+            if pending_validation[0] is not None:
+                root.after_cancel(pending_validation[0])
+            pending_validation[0] = root.after(150, run_tile_validation)
+        
+        def run_tile_validation():
+            pending_validation[0] = None
+            validate_tile_count()
+        
+        max_tiles_var.trace_add('write', schedule_tile_validation)
+        bbox_var.trace_add('write', schedule_tile_validation)
+        workers_var.trace_add('write', schedule_tile_validation)
+        parse_inputs()
         
         ttk.Label(frame, text="(All satellites forced to 5m resolution)", font=("Arial", 8)).grid(row=21, column=1, sticky=tk.W, pady=2)
         
         button_frame = ttk.Frame(frame)
         button_frame.grid(row=22, column=0, columnspan=2, pady=20)
         
-        ttk.Button(button_frame, text="Submit", command=submit).pack(side=tk.LEFT, padx=5)
+        submit_btn = ttk.Button(button_frame, text="Submit", command=submit)
+        submit_btn.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Cancel", command=cancel).pack(side=tk.LEFT, padx=5)
         
         print("Opening GUI window...", flush=True)
@@ -998,7 +1178,7 @@ def gui_and_run():
         
         if not submit_clicked[0]:
             print("Cancelled", flush=True)
-            return
+            return None
         
         # Fix: Add logging to track execution flow
         logging.info("Start menu closed, beginning processing setup...")
@@ -1013,13 +1193,8 @@ def gui_and_run():
             geometry = imported_geometry[0]
             logging.info("Using imported polygon geometry")
         else:
-            # Try to parse as bbox tuple
-            try:
-                bbox = tuple(map(float, bbox_str.split(",")))
-                if len(bbox) == 4:
-                    geometry = bbox  # Use bbox tuple
-            except (ValueError, AttributeError):
-                pass
+            # Use the bbox tuple already parsed while editing
+            geometry = parsed["bbox"]
             
             # If bbox parsing failed, try to load from saved geometry file in bbox_files folder
             if geometry is None:
@@ -1028,31 +1203,31 @@ def gui_and_run():
                     from .map_window import _get_bbox_files_dir
                     bbox_dir = _get_bbox_files_dir()
                     # Look for most recent GeoJSON file
-                    import json
-                    from shapely.geometry import shape
-                    import glob
-                    geojson_files = sorted(glob.glob(os.path.join(bbox_dir, '*.geojson')), key=os.path.getmtime, reverse=True)
-                    if geojson_files:
+                    # One directory pass; DirEntry.stat() is cached per entry (no sort, no extra stats)
+                    with os.scandir(bbox_dir) as entries:
+                        newest = max((entry for entry in entries if entry.name.endswith('.geojson')),
+                                     key=lambda entry: entry.stat().st_mtime, default=None)
+                    cached = lookup_geometry(geometry_cache_db, newest.path) if newest is not None else None
+                    if cached is not None and cached[1] is not None:
+                        geometry = cached[1]
+                    elif newest is not None:
                         # Try to load the most recent one
-                        with open(geojson_files[0], 'r') as f:
-                            geojson = json.load(f)
-                            if geojson.get('type') == 'Feature' and geojson.get('geometry'):
-                                geometry = shape(geojson['geometry'])
-                            elif geojson.get('type') == 'Polygon':
-                                geometry = shape(geojson)
+                        with open(newest.path, 'rb') as f:
+                            geojson = _json_loads(f.read())
+                        if geojson.get('type') == 'Feature' and geojson.get('geometry'):
+                            geometry = shape(geojson['geometry'])
+                        elif geojson.get('type') == 'Polygon':
+                            geometry = shape(geojson)
+                        if geometry is not None and geometry.geom_type == 'Polygon':
+                            record_geometry(geometry_cache_db, newest.path, list(geometry.bounds), geometry)
                 except Exception as e:
                     logging.debug(f"Could not load geometry from file: {e}")
             
             # Fallback to bbox if geometry still not set
             if geometry is None:
-                try:
-                    bbox_tuple = tuple(map(float, bbox_str.split(",")))
-                    if len(bbox_tuple) == 4:
-                        geometry = bbox_tuple
-                    else:
-                        raise ValueError(f"Invalid bbox format: expected 4 coordinates, got {len(bbox_tuple)}")
-                except (ValueError, AttributeError) as e:
-                    raise ValueError(f"Invalid bbox format: {bbox_str}. Error: {e}")
+                geometry = _parse_bbox_str(bbox_str)
+                if geometry is None:
+                    raise ValueError(f"Invalid bbox format: {bbox_str}. Expected 4 comma-separated numbers")
         start = start_var.get()
         end = end_var.get()
         out = out_var.get()
@@ -1062,99 +1237,47 @@ def gui_and_run():
         include_viirs = viirs_var.get()
         server_mode = server_mode_var.get()
         
-        try:
-            workers = int(workers_var.get())
-            if workers < 1:
-                workers = DEFAULT_WORKERS
-        except (ValueError, AttributeError):
+        workers = parsed["workers"]
+        if workers is None or workers < 1:
             workers = DEFAULT_WORKERS
         
-        # Server mode: maximize resources
+        # Server mode: use all available CPU cores (resources are raised in _apply_server_mode)
         if server_mode:
-            # Use all available CPU cores
-            workers = multiprocessing.cpu_count()
-            # Increase max workers for dynamic scaling (server mode = overclock)
-            from . import config
-            config.MAX_WORKERS = multiprocessing.cpu_count() * 4  # Server mode: 4x CPU count (I/O-bound tasks benefit)
-            logging.info(f"Server mode enabled: Using {workers} workers, max workers: {config.MAX_WORKERS} (overclocked)")
-            
-            # Set maximum priority (Windows) - try REALTIME if available, fallback to HIGH
-            priority_set = False
-            try:
-                if os.name == 'nt':  # Windows
-                    try:
-                        import psutil
-                        p = psutil.Process()
-                        # Try REALTIME_PRIORITY_CLASS first (maximum performance)
-                        try:
-                            # REALTIME can be dangerous but we're in server mode - push to limit
-                            if hasattr(psutil, 'REALTIME_PRIORITY_CLASS'):
-                                p.nice(psutil.REALTIME_PRIORITY_CLASS)
-                                priority_set = True
-                                logging.info("Server mode: Set process priority to REALTIME_PRIORITY_CLASS (Windows - MAXIMUM)")
-                            else:
-                                p.nice(psutil.HIGH_PRIORITY_CLASS)
-                                priority_set = True
-                                logging.info("Server mode: Set process priority to HIGH_PRIORITY_CLASS (Windows)")
-                        except (OSError, PermissionError, AttributeError):
-                            # Fallback to HIGH if REALTIME fails
-                            p.nice(psutil.HIGH_PRIORITY_CLASS)
-                            priority_set = True
-                            logging.info("Server mode: Set process priority to HIGH_PRIORITY_CLASS (Windows - REALTIME unavailable)")
-                    except ImportError:
-                        logging.warning("Server mode: psutil not available, cannot set process priority. Install with: pip install psutil")
-                    except Exception as e:
-                        logging.warning(f"Server mode: Failed to set process priority: {e}")
-            except Exception as e:
-                logging.debug(f"Server mode: Error checking OS: {e}")
-            
-            # Set maximum priority (Unix/Linux) - push to limit in server mode
-            if not priority_set:
-                try:
-                    if os.name != 'nt':  # Unix/Linux
-                        try:
-                            os.nice(-19)  # Server mode: Maximum priority (-20 is system level, -19 is highest user level)
-                            priority_set = True
-                            logging.info("Server mode: Set process priority to -19 (Unix/Linux - MAXIMUM)")
-                        except PermissionError:
-                            logging.warning("Server mode: Insufficient permissions to set process priority. Run with sudo/admin privileges for maximum performance.")
-                        except OSError as e:
-                            logging.warning(f"Server mode: Failed to set process priority: {e}")
-                except Exception as e:
-                    logging.debug(f"Server mode: Error setting Unix priority: {e}")
-            
-            if not priority_set:
-                logging.info("Server mode: Process priority unchanged (may require elevated privileges)")
+            workers = USABLE_CPUS
         
         resolution_str = resolution_var.get().strip()
         target_resolution = float(resolution_str) if resolution_str else TARGET_RES
         
         # Get max tiles (empty = None for auto-calculation)
-        max_tiles_str = max_tiles_var.get().strip()
-        max_tiles = None
-        if max_tiles_str:
-            try:
-                max_tiles = int(max_tiles_str)
-                if max_tiles < 1:
-                    max_tiles = None
-            except ValueError:
-                max_tiles = None
+        max_tiles = parsed["tiles"]
+        if max_tiles is invalid_entry or (max_tiles is not None and max_tiles < 1):
+            max_tiles = None
         
         # Get dynamic workers setting
         enable_dynamic_workers = dynamic_workers_var.get()
-    else:
+        
+        return cls(geometry, start, end, out, workers, enable_harmonize=enable_harmonize,
+                   include_modis=include_modis, include_aster=include_aster, include_viirs=include_viirs,
+                   target_resolution=target_resolution, max_tiles=max_tiles,
+                   enable_dynamic_workers=enable_dynamic_workers, server_mode=server_mode)
+    
+    @classmethod
+    def from_cli(cls) -> "RunConfig":
+        """Prompt for run parameters on the command line."""
         # Fallback to command line input
         print("No GUI library available. Using command line input.")
         print("Enter parameters:")
         bbox_str = input(f"BBox (lon_min,lat_min,lon_max,lat_max) [{','.join(map(str, DEFAULT_BBOX))}]: ").strip()
-        bbox = tuple(map(float, (bbox_str or ",".join(map(str, DEFAULT_BBOX))).split(",")))
+        bbox = _parse_bbox_str(bbox_str or ",".join(map(str, DEFAULT_BBOX)))
+        if bbox is None:
+            raise ValueError(f"Invalid bbox format: {bbox_str}. Expected 4 comma-separated numbers")
         geometry = bbox  # Set geometry to match GUI path
         start = input(f"Start date (YYYY-MM-DD) [{DEFAULT_START}]: ").strip() or DEFAULT_START
         end = input(f"End date (YYYY-MM-DD) [{DEFAULT_END}]: ").strip() or DEFAULT_END
         out = input(f"Output folder [{OUTDIR_DEFAULT}]: ").strip() or OUTDIR_DEFAULT
         harm_str = input("Enable harmonization? (y/n) [y]: ").strip().lower()
         enable_harmonize = harm_str != 'n'
-        workers_str = input(f"Workers (default {DEFAULT_WORKERS}, CPU count: {multiprocessing.cpu_count()}): ").strip()
+        workers_str = input(f"Workers (default {DEFAULT_WORKERS}, CPU count: {USABLE_CPUS}): ").strip()
         try:
             workers = int(workers_str) if workers_str else DEFAULT_WORKERS
             if workers < 1:
@@ -1181,92 +1304,167 @@ def gui_and_run():
                 else:
                     # Validate tile size for CLI
                     try:
-                        bbox_tuple = tuple(map(float, bbox_str.split(",")))
-                        lon_min, lat_min, lon_max, lat_max = bbox_tuple
-                        center_lat = (lat_min + lat_max) / 2.0
-                        import math
-                        meters_per_deg_lon = 111320 * math.cos(math.radians(center_lat))
-                        meters_per_deg_lat = 111000
-                        lon_span_m = (lon_max - lon_min) * meters_per_deg_lon
-                        lat_span_m = (lat_max - lat_min) * meters_per_deg_lat
-                        aspect = lon_span_m / lat_span_m if lat_span_m > 0 else 1.0
-                        nx = max(1, round(math.sqrt(max_tiles * aspect)))
-                        ny = max(1, round(math.sqrt(max_tiles / aspect)))
-                        tile_width_m = lon_span_m / nx
-                        tile_height_m = lat_span_m / ny
-                        tile_side_m = max(tile_width_m, tile_height_m)
-                        pixels_per_side = tile_side_m / TARGET_RES
-                        pixels_per_tile = pixels_per_side * pixels_per_side
-                        bytes_per_pixel = 6 * 4
-                        size_bytes = pixels_per_tile * bytes_per_pixel
-                        size_mb = size_bytes / (1024 * 1024)
+                        try:
+                            num_workers = int(workers_str) if workers_str else DEFAULT_WORKERS
+                            num_workers = max(1, min(num_workers, 8))
+                        except ValueError:
+                            num_workers = DEFAULT_WORKERS
+                        actual_tiles, size_mb, pixels_per_side, time_str = _calc_tile_geom(
+                            bbox, max_tiles, TARGET_RES, num_workers)
                         if size_mb > 40:
                             print(f"ERROR: Tile size would be {size_mb:.1f} MB per tile, exceeding 40 MB limit!")
                             print(f"Please use more tiles (minimum: {int(max_tiles * (size_mb / 40)) + 1})")
                             max_tiles = None
                         else:
-                            # Estimate processing time
-                            try:
-                                num_workers = int(workers_str) if workers_str else DEFAULT_WORKERS
-                                num_workers = max(1, min(num_workers, 8))
-                            except ValueError:
-                                num_workers = DEFAULT_WORKERS
-                            
-                            # Time estimation (same as GUI)
-                            ee_processing_time = 4.0
-                            download_speed_mbps = 10.0
-                            download_time = size_mb / (download_speed_mbps / 8)
-                            local_processing_time = 1.5
-                            time_per_tile = ee_processing_time + download_time + local_processing_time
-                            
-                            total_tiles = nx * ny
-                            tiles_per_worker = total_tiles / num_workers
-                            estimated_total_seconds = tiles_per_worker * time_per_tile
-                            
-                            if estimated_total_seconds < 60:
-                                time_str = f"{estimated_total_seconds:.0f} sec"
-                            elif estimated_total_seconds < 3600:
-                                time_str = f"{estimated_total_seconds / 60:.1f} min"
-                            else:
-                                time_str = f"{estimated_total_seconds / 3600:.1f} hours"
-                            
-                            print(f"OK: ~{size_mb:.1f} MB per tile ({nx * ny} tiles, ~{int(pixels_per_side)} pixels/tile)")
+                            print(f"OK: ~{size_mb:.1f} MB per tile ({actual_tiles} tiles, ~{int(pixels_per_side)} pixels/tile)")
                             print(f"Estimated processing time: {time_str} (with {num_workers} workers)")
                     except (ValueError, ZeroDivisionError):
                         print("Warning: Could not validate tile size, proceeding anyway...")
             except ValueError:
                 max_tiles = None
+        
+        return cls(geometry, start, end, out, workers, enable_harmonize=enable_harmonize,
+                   include_modis=include_modis, include_aster=include_aster, include_viirs=include_viirs,
+                   target_resolution=target_resolution, max_tiles=max_tiles,
+                   enable_dynamic_workers=enable_dynamic_workers)
+
+
+def _apply_server_mode(workers: int):
+    """Server mode: raise the dynamic worker ceiling and the process priority."""
+    # Increase max workers for dynamic scaling (server mode = overclock)
+    from . import config
+    config.MAX_WORKERS = USABLE_CPUS * 4  # Server mode: 4x CPU count (I/O-bound tasks benefit)
+    logging.info(f"Server mode enabled: Using {workers} workers, max workers: {config.MAX_WORKERS} (overclocked)")
     
-    # Get dynamic workers setting (from GUI/CLI if available, otherwise use config default)
+
+    # Set maximum priority (Windows) - try REALTIME if available, fallback to HIGH
+    priority_set = False
     try:
-        enable_dynamic_workers
-    except NameError:
-        enable_dynamic_workers = ENABLE_DYNAMIC_WORKERS
+        if os.name == 'nt':  # Windows
+            try:
+                import psutil
+                p = psutil.Process()
+                # Try REALTIME_PRIORITY_CLASS first (maximum performance)
+                try:
+                    # REALTIME can be dangerous but we're in server mode - push to limit
+                    if hasattr(psutil, 'REALTIME_PRIORITY_CLASS'):
+                        p.nice(psutil.REALTIME_PRIORITY_CLASS)
+                        priority_set = True
+                        logging.info("Server mode: Set process priority to REALTIME_PRIORITY_CLASS (Windows - MAXIMUM)")
+                    else:
+                        p.nice(psutil.HIGH_PRIORITY_CLASS)
+                        priority_set = True
+                        logging.info("Server mode: Set process priority to HIGH_PRIORITY_CLASS (Windows)")
+                except (OSError, PermissionError, AttributeError):
+                    # Fallback to HIGH if REALTIME fails
+                    p.nice(psutil.HIGH_PRIORITY_CLASS)
+                    priority_set = True
+                    logging.info("Server mode: Set process priority to HIGH_PRIORITY_CLASS (Windows - REALTIME unavailable)")
+            except ImportError:
+                logging.warning("Server mode: psutil not available, cannot set process priority. Install with: pip install psutil")
+            except Exception as e:
+                logging.warning(f"Server mode: Failed to set process priority: {e}")
+    except Exception as e:
+        logging.debug(f"Server mode: Error checking OS: {e}")
+
+    # Set maximum priority (Unix/Linux) - push to limit in server mode
+    if not priority_set:
+        try:
+            if os.name != 'nt':  # Unix/Linux
+                try:
+                    os.nice(-19)  # Server mode: Maximum priority (-20 is system level, -19 is highest user level)
+                    priority_set = True
+                    logging.info("Server mode: Set process priority to -19 (Unix/Linux - MAXIMUM)")
+                except PermissionError:
+                    logging.warning("Server mode: Insufficient permissions to set process priority. Run with sudo/admin privileges for maximum performance.")
+                except OSError as e:
+                    logging.warning(f"Server mode: Failed to set process priority: {e}")
+        except Exception as e:
+            logging.debug(f"Server mode: Error setting Unix priority: {e}")
+
+    if not priority_set:
+        logging.info("Server mode: Process priority unchanged (may require elevated privileges)")
+
+
+def gui_and_run():
+    """
+    Run GUI or CLI interface and process months.
+    With --repeat on the command line, the last submitted parameters are reused without prompting.
+    """
+    from .settings import load_last_run, save_last_run
+    
+    cfg = None
+    if "--repeat" in sys.argv:
+        last_run = load_last_run()
+        if last_run is not None:
+            try:
+                cfg = RunConfig.from_dict(last_run)
+                print("Repeating last run (--repeat)", flush=True)
+                logging.info(f"Repeating last run: {last_run}")
+            except Exception as e:
+                logging.warning(f"Could not reuse last run parameters: {e}")
+        else:
+            print("No recent run to repeat, opening input form...", flush=True)
+    
+    if cfg is None:
+        if TKINTER_AVAILABLE:
+            cfg = RunConfig.from_gui()
+            if cfg is None:
+                return
+        else:
+            cfg = RunConfig.from_cli()
+        save_last_run(cfg.to_dict())
+    
+    if cfg.server_mode:
+        _apply_server_mode(cfg.workers)
+    
+    geometry, start, end, out, workers = cfg.geometry, cfg.start, cfg.end, cfg.out, cfg.workers
+    sensors = Sensors.from_options(cfg.enable_harmonize, cfg.include_modis, cfg.include_aster, cfg.include_viirs)
     
     # Temporarily override config if user specified
     from . import config
     original_dynamic_workers = config.ENABLE_DYNAMIC_WORKERS
-    config.ENABLE_DYNAMIC_WORKERS = enable_dynamic_workers
+    config.ENABLE_DYNAMIC_WORKERS = cfg.enable_dynamic_workers
     
     months = list(month_ranges(start, end))
     logging.info(f"Processing {len(months)} months from {start} to {end}")
     print(f"Processing {len(months)} months...", flush=True)
     
-    # Create console progress display
-    from .console_progress import ConsoleProgress
-    
-    logging.info("Initializing console progress display...")
-    print("Initializing console progress display...", flush=True)
-    
+    # Progress display: a Tk window when a display is available, else the console table.
     # Estimate total tiles (will be updated when we know actual count)
-    progress_window = ConsoleProgress(total_tiles=100, total_months=len(months))
+    progress_window = None
+    if TKINTER_AVAILABLE:
+        try:
+            from .progress_window import ProgressWindow
+            progress_window = ProgressWindow(total_tiles=100, total_months=len(months))
+        except Exception as e:
+            logging.info(f"Progress window unavailable ({e}), using console progress display")
+    gui_progress = progress_window is not None
+    if not gui_progress:
+        from .console_progress import ConsoleProgress
+        
+        logging.info("Initializing console progress display...")
+        print("Initializing console progress display...", flush=True)
+        progress_window = ConsoleProgress(total_tiles=100, total_months=len(months))
     
-    # Process months with progress updates
-    try:
-        for month_idx, (ms, me) in enumerate(months):
-            dt = datetime.fromisoformat(ms)
+    # Months are independent, so a few run at once: one month's stitching and COG build
+    # overlaps the next month's tile downloads. Threads share the initialized Earth Engine
+    # session and the progress display; tile workers are split so the total stays at `workers`.
+    # Each month in flight keeps at least 4 tile workers, so small worker counts stay sequential.
+    months_in_flight = max(1, min(MONTH_CONCURRENCY, len(months), workers // 4))
+    month_workers = max(1, workers // months_in_flight)
+    print_lock = threading.Lock()
+    # Each month reports its own tile counts; the display shows the sums over running months
+    month_totals = MonthProgressTotals(progress_window)
+    
+    def run_month(month_idx, year, month, grid):
+        # Closing the progress window cancels months that have not started yet
+        if not progress_window.is_alive():
+            logging.info("Skipping %d-%02d (cancelled)", year, month)
+            return
+        with print_lock:
             print(f"\n{'='*80}")
-            print(f"Starting month {dt.year}-{dt.month:02d} ({month_idx + 1}/{len(months)})")
+            print(f"Starting month {year}-{month:02d} ({month_idx + 1}/{len(months)})")
             print(f"{'='*80}\n")
             
             if progress_window:
@@ -1274,30 +1472,70 @@ def gui_and_run():
                     progress_window.update_mosaic_progress(month_idx + 1, len(months))
                 except Exception as e:
                     logging.debug(f"Error updating progress display: {e}")
-            
-            process_month(geometry, dt.year, dt.month, out, workers, enable_harmonize, 
-                         include_modis, include_aster, include_viirs, 
-                         target_resolution=target_resolution, max_tiles=max_tiles,
-                         progress_window=progress_window, server_mode=server_mode)
         
-        # Show completion
-        if progress_window:
-            try:
-                progress_window.destroy()
-                print("\n✅ All processing complete!\n")
-            except Exception as e:
-                logging.debug(f"Error finalizing progress display: {e}")
-    except Exception as e:
-        import traceback
-        error_traceback = traceback.format_exc()
-        logging.error(f"Error during processing: {e}\nFull traceback:\n{error_traceback}")
-        print(f"\n❌ Processing error: {e}\n")
-        print(f"Full traceback:\n{error_traceback}")
-        if progress_window:
-            try:
-                progress_window.destroy()
-            except Exception:
-                pass
+        process_month(geometry, year, month, out, month_workers, sensors=sensors,
+                     target_resolution=cfg.target_resolution, max_tiles=cfg.max_tiles,
+                     progress_window=month_totals.view((year, month)), server_mode=cfg.server_mode, grid=grid)
+    
+    def run_months():
+        # Process months with progress updates
+        try:
+            # Same geometry every month: plan the tile layout once
+            grid = plan_tile_grid(geometry, cfg.max_tiles)
+            # Connect to the download host while the first month's mosaics are being built
+            threading.Thread(target=warm_up_session, daemon=True).start()
+            
+            with ThreadPoolExecutor(max_workers=months_in_flight) as month_executor:
+                # Futures keyed by (year, month) so a failure names its month
+                month_futures = {}
+                for month_idx, (year, month, ms, me) in enumerate(months):
+                    # Resume: months finished by an earlier run over the same grid are skipped outright
+                    if month_is_done(out, year, month, grid, sensors):
+                        logging.info("Skipping %d-%02d (already completed)", year, month)
+                        continue
+                    future = month_executor.submit(run_month, month_idx, year, month, grid)
+                    month_futures[future] = (year, month)
+                for future in as_completed(month_futures):
+                    try:
+                        future.result()
+                    except Exception:
+                        year, month = month_futures[future]
+                        logging.error("Month %d-%02d failed, cancelling remaining months", year, month)
+                        # Stop on the first failed month, as the sequential loop did
+                        for pending in month_futures:
+                            pending.cancel()
+                        raise
+            
+            # Show completion
+            if progress_window:
+                try:
+                    progress_window.destroy()
+                    print("\n✅ All processing complete!\n")
+                except Exception as e:
+                    logging.debug(f"Error finalizing progress display: {e}")
+        except Exception as e:
+            import traceback
+            error_traceback = traceback.format_exc()
+            logging.error(f"Error during processing: {e}\nFull traceback:\n{error_traceback}")
+            print(f"\n❌ Processing error: {e}\n")
+            print(f"Full traceback:\n{error_traceback}")
+            if progress_window:
+                try:
+                    progress_window.destroy()
+                except Exception:
+                    pass
+    
+    if gui_progress:
+        # Tk must own the main thread: months run in the background while the window
+        # polls for updates, and the window closes itself when run_months destroys it
+        month_thread = threading.Thread(target=run_months, daemon=True)
+        month_thread.start()
+        progress_window.run()
+        if month_thread.is_alive():
+            print("Progress window closed, finishing months already in progress...", flush=True)
+        month_thread.join()
+    else:
+        run_months()
     
     # Restore original config value
     config.ENABLE_DYNAMIC_WORKERS = original_dynamic_workers
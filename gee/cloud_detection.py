@@ -3,8 +3,20 @@ Cloud detection and masking functions for different satellite sensors.
 """
 import logging
 import ee
+import numpy as np
 from typing import Tuple
 from .ee_collections import apply_dem_illumination_correction
+from .config import SENSOR_BAND_SCHEMA
+
+# Cloud cover metadata properties (percent), in order of preference
+_CLOUD_PROPS = ["CLOUDY_PIXEL_PERCENTAGE", "CLOUD_COVER", "CLOUD_COVER_LAND"]
+_MODIS_CLOUD_PROPS = ["CLOUD_COVER", "CLOUD_COVER_LAND"]
+
+# Landsat Collection 2 QA_PIXEL flag bits to exclude: 1=dilated cloud, 2=cirrus (L8/9),
+# 3=cloud, 4=cloud shadow, 5=snow. Bits 8-9 are the 2-bit cloud confidence field, not a flag.
+BAD_QA_MASK = (1 << 1) | (1 << 2) | (1 << 3) | (1 << 4) | (1 << 5)
+# Reduced set for the basic fallback mask: cirrus, cloud, cloud shadow
+BASIC_BAD_QA_MASK = (1 << 2) | (1 << 3) | (1 << 4)
 
 
 def s2_scl_mask(img):
@@ -18,13 +30,20 @@ def s2_scl_mask(img):
         return img
 
 
-def s2_cloudprob_mask_local(arr, threshold=40):
-    """If using cloudprob locally, arr is ndarray of cloudprob values 0-100 -> return mask."""
-    return arr < threshold
+def s2_cloudprob_mask_local(arr, threshold=40, out=None):
+    """
+    If using cloudprob locally, arr is ndarray of cloudprob values 0-100 -> return mask.
+    Pass a preallocated bool or uint8 array as out to write the mask in place (1 byte/pixel,
+    no temporary allocation).
+    """
+    return np.less(arr, threshold, out=out)
 
 
-def s2_cloud_mask_advanced(img):
-    """Advanced cloud masking using SCL, cloud probability, and EE algorithms."""
+def s2_cloud_mask_advanced(img, collection_id=None):
+    """
+    Advanced cloud masking using SCL, cloud probability, and EE algorithms.
+    If collection_id is in SENSOR_BAND_SCHEMA, its known bands are used instead of a band check.
+    """
     try:
         # Use SCL for primary masking
         scl = img.select("SCL")
@@ -32,12 +51,18 @@ def s2_cloud_mask_advanced(img):
         # Exclude: 0=no data, 1=saturated/defective, 2=dark area, 3=cloud shadows, 8=cloud medium, 9=cloud high, 10=thin cirrus, 11=snow
         valid_mask = scl.gte(4).And(scl.lte(7))  # Keep 4-7
         
-        # If cloud probability band exists, use it for additional filtering
-        if "MSK_CLDPRB" in img.bandNames().getInfo():
-            cloud_prob = img.select("MSK_CLDPRB")
-            # Mask pixels with high cloud probability (>30)
-            cloud_mask = cloud_prob.lt(30)
-            valid_mask = valid_mask.And(cloud_mask)
+        # If cloud probability band exists, use it for additional filtering (mask pixels with
+        # probability >30). For an unknown collection this is checked server-side, so it stays
+        # usable inside ImageCollection.map.
+        schema = SENSOR_BAND_SCHEMA.get(collection_id)
+        cloud_prob_mask = valid_mask.And(img.select("MSK_CLDPRB").lt(30))
+        if schema is not None:
+            if schema["has_msk_cldprb"]:
+                valid_mask = cloud_prob_mask
+        else:
+            valid_mask = ee.Image(ee.Algorithms.If(
+                img.bandNames().contains("MSK_CLDPRB"), cloud_prob_mask, valid_mask
+            ))
         
         # Also check for valid data in key bands
         b4 = img.select("B4")
@@ -52,34 +77,31 @@ def s2_cloud_mask_advanced(img):
         return s2_scl_mask(img)
 
 
-def landsat_cloud_mask_advanced(img):
-    """Advanced Landsat cloud masking using QA_PIXEL and additional checks."""
+def landsat_cloud_mask_advanced(img, collection_id=None):
+    """
+    Advanced Landsat cloud masking using QA_PIXEL and additional checks.
+    If collection_id is in SENSOR_BAND_SCHEMA, its known bands are used instead of a band check.
+    """
     try:
         qa = img.select("QA_PIXEL")
         # Bit flags: 1=dilated cloud, 2=cirrus, 3=cloud, 4=cloud shadow, 5=snow, 6=clear
         # We want to keep clear pixels (bit 6) and exclude clouds/shadows
-        cloud = qa.bitwiseAnd(1 << 3).neq(0)  # Cloud
-        shadow = qa.bitwiseAnd(1 << 4).neq(0)  # Cloud shadow
-        cirrus = qa.bitwiseAnd(1 << 8).neq(0)  # Cirrus (L8/9)
-        dilated_cloud = qa.bitwiseAnd(1 << 1).neq(0)  # Dilated cloud
-        snow = qa.bitwiseAnd(1 << 5).neq(0)  # Snow
-        
-        # Create mask: exclude all problematic pixels
-        mask = cloud.Not().And(shadow.Not()).And(cirrus.Not()).And(dilated_cloud.Not()).And(snow.Not())
+        # Create mask: exclude all problematic pixels in one bitwise test (none of the BAD_QA_MASK bits set)
+        mask = qa.bitwiseAnd(BAD_QA_MASK).eq(0)
         
-        # Also check for valid data in surface reflectance bands
+        # Also check for valid data in surface reflectance bands that are present
+        # (known from the schema, or checked server-side, so no round-trip per image)
         try:
-            sr_bands = ["SR_B4", "SR_B3", "SR_B2"]
-            valid_data = None
-            for band_name in sr_bands:
-                if band_name in img.bandNames().getInfo():
-                    band = img.select(band_name)
-                    if valid_data is None:
-                        valid_data = band.gt(0).And(band.lt(10000))  # Valid SR range
-                    else:
-                        valid_data = valid_data.And(band.gt(0).And(band.lt(10000)))
-            if valid_data is not None:
-                mask = mask.And(valid_data)
+            schema = SENSOR_BAND_SCHEMA.get(collection_id)
+            band_names = img.bandNames()
+            for band_name in ["SR_B4", "SR_B3", "SR_B2"]:
+                band = img.select(band_name)
+                sr_mask = mask.And(band.gt(0).And(band.lt(10000)))  # Valid SR range
+                if schema is not None:
+                    if band_name in schema["sr_bands"]:
+                        mask = sr_mask
+                else:
+                    mask = ee.Image(ee.Algorithms.If(band_names.contains(band_name), sr_mask, mask))
         except Exception:
             pass
         
@@ -88,10 +110,7 @@ def landsat_cloud_mask_advanced(img):
         # Fallback to basic QA masking
         try:
             qa = img.select("QA_PIXEL")
-            cloud = qa.bitwiseAnd(1 << 3).neq(0)
-            shadow = qa.bitwiseAnd(1 << 4).neq(0)
-            cirrus = qa.bitwiseAnd(1 << 8).neq(0)
-            mask = cloud.Not().And(shadow.Not()).And(cirrus.Not())
+            mask = qa.bitwiseAnd(BASIC_BAD_QA_MASK).eq(0)
             return img.updateMask(mask)
         except Exception:
             return img
@@ -102,9 +121,15 @@ def estimate_modis_cloud_fraction(img, geom):
     Estimate MODIS cloud fraction from state_1km band BEFORE masking.
     This must be called on the original image, not the masked one.
     """
-    # First try: Check if state_1km band exists and calculate from it
+    # One round-trip for the band list and cloud metadata
+    try:
+        band_names, props = ee.List([img.bandNames(), img.toDictionary(_MODIS_CLOUD_PROPS)]).getInfo()
+    except Exception as e:
+        logging.debug(f"Error fetching MODIS band names and metadata: {e}")
+        band_names, props = [], {}
+    
+    # First try: calculate from the state_1km band if it exists
     try:
-        band_names = img.bandNames().getInfo()
         if "state_1km" in band_names:
             # MODIS state_1km band: bit 0 = cloud (1 if cloud, 0 if clear)
             qa = img.select("state_1km")
@@ -131,30 +156,16 @@ def estimate_modis_cloud_fraction(img, geom):
     except Exception as e:
         logging.debug(f"Error calculating MODIS cloud fraction from state_1km: {e}")
     
-    # Fallback: try metadata if available
-    try:
-        # Some MODIS collections might have cloud metadata
-        cp = img.get("CLOUD_COVER")
-        if cp is not None:
-            cp_val = cp.getInfo()
-            if cp_val is not None:
-                cloud_frac = max(0.0, min(1.0, float(cp_val) / 100.0))
-                logging.debug(f"MODIS cloud fraction from CLOUD_COVER metadata: {cloud_frac*100:.1f}%")
-                return cloud_frac, 1.0 - cloud_frac
-    except Exception:
-        pass
-    
-    # Try alternative metadata field
-    try:
-        cp = img.get("CLOUD_COVER_LAND")
-        if cp is not None:
-            cp_val = cp.getInfo()
+    # Fallback: try metadata if available (some MODIS collections have cloud metadata)
+    for prop in _MODIS_CLOUD_PROPS:
+        try:
+            cp_val = props.get(prop)
             if cp_val is not None:
                 cloud_frac = max(0.0, min(1.0, float(cp_val) / 100.0))
-                logging.debug(f"MODIS cloud fraction from CLOUD_COVER_LAND metadata: {cloud_frac*100:.1f}%")
+                logging.debug(f"MODIS cloud fraction from {prop} metadata: {cloud_frac*100:.1f}%")
                 return cloud_frac, 1.0 - cloud_frac
-    except Exception:
-        pass
+        except (TypeError, ValueError):
+            pass
     
     # Last resort: Use mask-based calculation (slower but more reliable)
     try:
@@ -185,65 +196,47 @@ def estimate_modis_cloud_fraction(img, geom):
 def estimate_cloud_fraction(img, geom, scale=20):
     """
     Estimate cloud fraction and valid pixel fraction for an image over geom.
-    OPTIMIZED: Uses metadata first to avoid expensive reduceRegion calls.
+    OPTIMIZED: Uses metadata first to avoid expensive reduceRegion calls, all in one getInfo() round-trip.
     NOTE: For MODIS, use estimate_modis_cloud_fraction() instead on the UNMASKED image.
     """
     cloud_frac = None
     valid_frac = None
     
-    # Try metadata first (most accurate for S2) - this is fast, no server computation
+    # Fetch the cloud metadata and, only when none of it is present, the mask mean in one
+    # round-trip: ee.Algorithms.If is evaluated server-side, so the reduceRegion is skipped
+    # whenever metadata exists (the common case).
+    # WARNING: The mask fallback assumes the image has NOT been masked yet!
     try:
-        cp = img.get("CLOUDY_PIXEL_PERCENTAGE")
-        if cp is not None:
-            cp_val = cp.getInfo()
-            if cp_val is not None:
-                cloud_frac = max(0.0, min(1.0, float(cp_val) / 100.0))
-                logging.debug(f"Cloud fraction from CLOUDY_PIXEL_PERCENTAGE metadata: {cloud_frac*100:.1f}%")
-    except Exception:
-        pass
-    
-    # Try CLOUD_COVER for Landsat - also fast metadata access
-    if cloud_frac is None:
-        try:
-            cc = img.get("CLOUD_COVER")
-            if cc is not None:
-                cc_val = cc.getInfo()
-                if cc_val is not None:
-                    cloud_frac = max(0.0, min(1.0, float(cc_val) / 100.0))
-                    logging.debug(f"Cloud fraction from CLOUD_COVER metadata: {cloud_frac*100:.1f}%")
-        except Exception:
-            pass
+        props = img.toDictionary(_CLOUD_PROPS)
+        # Use a coarser scale and fewer pixels for faster computation
+        mask_mean = ee.Algorithms.If(
+            props.size().gt(0), None,
+            img.mask().reduceRegion(ee.Reducer.mean(), geom, scale=scale*2, maxPixels=1e6)
+        )
+        props_info, mask_info = ee.List([props, mask_mean]).getInfo()
+    except Exception as e:
+        logging.debug(f"Error fetching cloud metadata: {e}")
+        props_info, mask_info = {}, None
     
-    # Try CLOUD_COVER_LAND for Landsat Collection 2
-    if cloud_frac is None:
+    # Metadata in order of preference: CLOUDY_PIXEL_PERCENTAGE (S2), CLOUD_COVER (Landsat),
+    # CLOUD_COVER_LAND (Landsat Collection 2)
+    for prop in _CLOUD_PROPS:
         try:
-            cc = img.get("CLOUD_COVER_LAND")
-            if cc is not None:
-                cc_val = cc.getInfo()
-                if cc_val is not None:
-                    cloud_frac = max(0.0, min(1.0, float(cc_val) / 100.0))
-                    logging.debug(f"Cloud fraction from CLOUD_COVER_LAND metadata: {cloud_frac*100:.1f}%")
-        except Exception:
+            cp_val = props_info.get(prop)
+            if cp_val is not None:
+                cloud_frac = max(0.0, min(1.0, float(cp_val) / 100.0))
+                logging.debug(f"Cloud fraction from {prop} metadata: {cloud_frac*100:.1f}%")
+                break
+        except (TypeError, ValueError):
             pass
     
-    # OPTIMIZATION: Skip expensive reduceRegion if we have cloud metadata
-    # Only compute from mask if metadata not available (rare case)
-    # WARNING: This method assumes the image has NOT been masked yet!
-    if cloud_frac is None:
-        try:
-            # Use smaller scale and fewer pixels for faster computation
-            mask = img.mask().reduceRegion(ee.Reducer.mean(), geom, scale=scale*2, maxPixels=1e6)
-            if mask:
-                mask_info = mask.getInfo()
-                if mask_info:
-                    first_val = list(mask_info.values())[0]
-                    if first_val is not None:
-                        valid_frac = float(first_val)
-                        cloud_frac = 1.0 - valid_frac
-                        logging.debug(f"Cloud fraction calculated from mask: {cloud_frac*100:.1f}% (valid: {valid_frac*100:.1f}%)")
-        except Exception as e:
-            logging.debug(f"Error calculating cloud fraction from mask: {e}")
-            pass
+    # Only computed server-side if metadata was not available (rare case)
+    if cloud_frac is None and mask_info:
+        first_val = list(mask_info.values())[0]
+        if first_val is not None:
+            valid_frac = float(first_val)
+            cloud_frac = 1.0 - valid_frac
+            logging.debug(f"Cloud fraction calculated from mask: {cloud_frac*100:.1f}% (valid: {valid_frac*100:.1f}%)")
     
     # Defaults - log warning if we couldn't determine cloud fraction
     if cloud_frac is None:
@@ -1,7 +1,6 @@
 """
 Configuration constants and default values.
 """
-import multiprocessing
 import logging
 import os
 
@@ -15,6 +14,9 @@ import os
 # 4. Custom path set here
 GEE_SERVICE_ACCOUNT_KEY = None  # Set to path like "/path/to/service-account-key.json" if using service account
 GEE_PROJECT = None  # Set to your Google Cloud project ID if needed (extracted from key file if not set)
+# Earth Engine API endpoint. The high-volume endpoint is meant for many concurrent small requests
+# (the parallel getDownloadURL/getInfo calls of tile workers); None uses the default endpoint
+GEE_API_URL = "https://earthengine-highvolume.googleapis.com"
 
 # Default bounding box (Dead Sea approximate)
 # Set to None to start with empty bbox, or provide default coordinates
@@ -45,15 +47,30 @@ MANIFEST_CSV = "deadsea_manifest.csv"
 OUTDIR_DEFAULT = "deadsea_outputs"
 COG_OVERVIEWS = [2, 4, 8, 16, 32]
 MAX_CONCURRENT_TILES = 10  # Limit concurrent tile processing to avoid memory issues
-DEFAULT_WORKERS = min(multiprocessing.cpu_count(), 8)  # Auto-detect CPU count, cap at 8
+# CPUs this process may actually run on (affinity / cgroup cpuset), which can be fewer than the host has
+USABLE_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+DEFAULT_WORKERS = min(USABLE_CPUS, 8)  # Auto-detect CPU count, cap at 8
 ENABLE_DYNAMIC_WORKERS = True  # Enable dynamic worker scaling based on system performance
 DYNAMIC_WORKER_CHECK_INTERVAL = 10  # Check and adjust workers every N completed tiles
 MIN_WORKERS = 1  # Minimum number of workers
 MAX_WORKERS = 16  # Maximum number of workers (can exceed CPU count for I/O-bound tasks)
+MONTH_CONCURRENCY = 2  # Months processed at once; tile workers are split between them
 
 # Limit images fetched per satellite after server-side filtering/sorting
 MAX_IMAGES_PER_SATELLITE = 5
 
+# Band layout of the collections the cloud masks run on, keyed by collection ID, so masking
+# images from a known collection needs no band-presence check (client or server side)
+_LANDSAT_SR_BANDS = ["SR_B4", "SR_B3", "SR_B2"]
+SENSOR_BAND_SCHEMA = {
+    "COPERNICUS/S2_SR_HARMONIZED": {"has_msk_cldprb": True, "sr_bands": []},
+    "LANDSAT/LT04/C02/T1_L2": {"has_msk_cldprb": False, "sr_bands": _LANDSAT_SR_BANDS},
+    "LANDSAT/LT05/C02/T1_L2": {"has_msk_cldprb": False, "sr_bands": _LANDSAT_SR_BANDS},
+    "LANDSAT/LE07/C02/T1_L2": {"has_msk_cldprb": False, "sr_bands": _LANDSAT_SR_BANDS},
+    "LANDSAT/LC08/C02/T1_L2": {"has_msk_cldprb": False, "sr_bands": _LANDSAT_SR_BANDS},
+    "LANDSAT/LC09/C02/T1_L2": {"has_msk_cldprb": False, "sr_bands": _LANDSAT_SR_BANDS},
+}
+
 # Quality weights for scoring (no sensor bias - purely quality-based)
 # Resolution is prioritized: a 30m image with some clouds is better than a 400m image with no clouds
 QUALITY_WEIGHTS = {
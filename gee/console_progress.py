@@ -3,6 +3,8 @@ Console-based progress display with tables and frequent updates.
 """
 import time
 import sys
+import queue
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 import logging
@@ -225,3 +227,119 @@ class ConsoleProgress:
         self._print_progress_table()
         print("\n✅ Processing complete!\n")
 
+
+class MonthProgressTotals:
+    """
+    Sums tile progress over months that run concurrently on one progress display.
+    
+    Each month reports through its own view (see view()), with its own tile total and
+    counts; the display always shows the sums, whichever month updated last.
+    """
+    
+    def __init__(self, display):
+        self.display = display
+        self._lock = threading.Lock()
+        self._months = {}  # key -> [total_tiles, processed, failed]
+    
+    def view(self, key) -> "_MonthProgressView":
+        """Progress display for one month (key, e.g. (year, month))."""
+        with self._lock:
+            self._months.setdefault(key, [0, 0, 0])
+        return _MonthProgressView(self, key)
+    
+    def _update(self, key, total: Optional[int] = None, processed: Optional[int] = None,
+                failed: Optional[int] = None):
+        """Store one month's numbers and push the sums to the display."""
+        with self._lock:
+            counts = self._months[key]
+            for i, value in enumerate((total, processed, failed)):
+                if value is not None:
+                    counts[i] = value
+            total_tiles, processed_tiles, failed_tiles = (sum(c[i] for c in self._months.values()) for i in range(3))
+            display_lock = getattr(self.display, "_lock", None)
+            if display_lock is not None:
+                with display_lock:
+                    self.display.total_tiles = total_tiles
+            else:
+                self.display.total_tiles = total_tiles
+            self.display.update_tile_progress(processed_tiles, failed_tiles)
+
+
+class _MonthProgressView:
+    """One month's handle on a MonthProgressTotals display; other calls go to the display."""
+    
+    def __init__(self, totals: MonthProgressTotals, key):
+        self._totals = totals
+        self._key = key
+        self._lock = threading.Lock()
+    
+    @property
+    def total_tiles(self) -> int:
+        return self._totals._months[self._key][0]
+    
+    @total_tiles.setter
+    def total_tiles(self, value: int):
+        self._totals._update(self._key, total=value)
+    
+    def update_tile_progress(self, processed: int, failed: int = 0):
+        """Update this month's tile progress."""
+        self._totals._update(self._key, processed=processed, failed=failed)
+    
+    def __getattr__(self, name):
+        return getattr(self._totals.display, name)
+
+
+class StatusLinePrinter:
+    """
+    Single-line console status written from one background thread.
+    Worker threads post lines to a queue; the display thread keeps only the newest and
+    rewrites the line at most every `interval` seconds, so workers never block on stdout.
+    """
+    
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._display_loop, daemon=True)
+        self._thread.start()
+    
+    def post(self, line: str):
+        """Queue a status line for display (non-blocking)."""
+        self._queue.put(line)
+    
+    def _display_loop(self):
+        latest = None
+        last_write = 0.0
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                latest = self._queue.get(timeout=self.interval)
+                # Drain the backlog; only the newest line is visible on a \r-rewritten line
+                while True:
+                    latest = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            now = time.time()
+            if latest is not None and now - last_write >= self.interval:
+                sys.stdout.write(f"\r{latest}")
+                sys.stdout.flush()
+                latest = None
+                last_write = now
+        if latest is not None:
+            sys.stdout.write(f"\r{latest}")
+            sys.stdout.flush()
+    
+    def close(self):
+        """Flush the last pending line and stop the display thread."""
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if exc_type is not None:
+            # End the half-drawn status line so the error output starts on its own line
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+        return False
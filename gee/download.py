@@ -2,19 +2,185 @@
 Download helpers for Earth Engine imagery.
 """
 import os
+import re
 import json
 import time
 import logging
+import threading
 import requests
-import zipfile
-from typing import Tuple, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, Tuple, Optional
+from urllib.parse import urlsplit
 
 from .config import (
     EXPORT_POLL_TIMEOUT, EXPORT_POLL_INTERVAL, 
-    DOWNLOAD_RETRIES, DOWNLOAD_RETRY_DELAY, MIN_TILE_PIXELS
+    DOWNLOAD_RETRIES, DOWNLOAD_RETRY_DELAY, MIN_TILE_PIXELS, MAX_WORKERS, GEE_API_URL
 )
 from .raster_processing import extract_and_merge_zip_tiffs
 
+# Leading bytes of a download kept in memory for format sniffing
+HEADER_SNIFF_BYTES = 512
+
+# Size of each socket read during download; chunks are written as-is, so this is also the write size
+DOWNLOAD_CHUNK_BYTES = 1 << 20
+
+# One keep-alive HTTP session shared by all tile workers, so TLS connections are reused
+# across tiles and by workers added later during dynamic scaling
+_session = None
+_session_lock = threading.Lock()
+# Connection pool size of the shared session; set from the effective worker count by
+# set_download_pool_size (falls back to MAX_WORKERS if a download starts before that)
+_pool_size = None
+
+
+def _mount_pool(session: requests.Session, pool_size: int):
+    """Mount a keep-alive connection pool of pool_size on the session. Must be called with _session_lock held."""
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def _get_session() -> requests.Session:
+    """Get the shared download session, creating it on first use."""
+    global _session, _pool_size
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                if _pool_size is None:
+                    # One pooled connection per possible worker, plus headroom for retries
+                    _pool_size = MAX_WORKERS * 2
+                _mount_pool(session, _pool_size)
+                _session = session
+    return _session
+
+
+def set_download_pool_size(pool_size: int):
+    """
+    Size the shared session's connection pool, e.g. from update_connection_pool_size() whenever
+    the worker count changes. An existing session gets a new pool; in-flight downloads finish
+    on the connections they already hold.
+    """
+    global _pool_size
+    with _session_lock:
+        if pool_size == _pool_size:
+            return
+        _pool_size = pool_size
+        if _session is not None:
+            _mount_pool(_session, pool_size)
+
+
+# Host serving getDownloadURL links (the configured API endpoint); contacted once up front to warm DNS and TLS
+EE_DOWNLOAD_HOST = GEE_API_URL or "https://earthengine.googleapis.com"
+
+
+def warm_up_session(timeout: float = 5.0) -> bool:
+    """
+    Open a keep-alive connection to the Earth Engine download host before tiles start, so the
+    first tile downloads don't each pay DNS lookup and TLS handshake. Failures are ignored.
+    """
+    try:
+        _get_session().head(EE_DOWNLOAD_HOST, timeout=timeout, allow_redirects=False).close()
+        return True
+    except requests.exceptions.RequestException as e:
+        logging.debug("Download session warm-up failed: %s", e)
+        return False
+
+
+# Payload signatures, matched once against the download header:
+# TIFF/BigTIFF "II*\0" (little-endian) or "MM\0*" (big-endian); ZIP local-file or empty-archive record
+_PAYLOAD_MAGIC_RE = re.compile(
+    rb'(?P<tiff>II[\x2a\x2b]\x00|MM\x00[\x2a\x2b])|(?P<zip>PK\x03\x04|PK\x05\x06)'
+)
+
+# HTML or JSON error body returned with a 200 status (e.g. quota or expired-URL pages)
+_ERROR_PAGE_RE = re.compile(rb'(?i)<html|<!doctype|\A\s*\{')
+
+
+def _write_all(fh, data):
+    """Write all of data to an unbuffered file, which may accept fewer bytes per write."""
+    view = memoryview(data)
+    while view:
+        written = fh.write(view)
+        view = view[written:]
+
+
+def _remove_quietly(path: str):
+    """Remove a file, ignoring errors (e.g. it was never created)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _sniff_payload(header: bytes) -> Optional[str]:
+    """
+    Identify a download from its leading bytes. Returns "tiff", "zip", or None for anything else.
+    """
+    m = _PAYLOAD_MAGIC_RE.match(header)
+    if m is None:
+        logging.debug("Unexpected download payload: %r", bytes(header[:120]))
+        return None
+    return m.lastgroup
+
+
+# HTTP statuses that mean the host is overloaded or throttling us, rather than a problem with one tile
+_THROTTLE_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class _HostBackoff:
+    """
+    Retry delay for one download host (AIMD): doubles on each throttling failure and steps back
+    down by the base delay on each success. The delay is applied before the next request to the
+    host is sent, and a success releases waiting requests at once, so a recovered host never
+    leaves tiles waiting out a stale backoff.
+    """
+    def __init__(self, base_delay: float, max_delay: float):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._delay = base_delay
+        self._not_before = 0.0
+        self._cond = threading.Condition()
+    
+    def wait_turn(self, retry_at: float = 0.0):
+        """Wait before sending a request until the host's backoff window (and retry_at, a monotonic time) has passed."""
+        with self._cond:
+            while True:
+                remaining = max(self._not_before, retry_at) - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._cond.wait(remaining)
+    
+    def on_failure(self) -> float:
+        """Record a throttling failure and return how long requests to the host are held back."""
+        with self._cond:
+            wait_time = self._delay
+            self._delay = min(self._delay * 2, self.max_delay)
+            self._not_before = max(self._not_before, time.monotonic() + wait_time)
+        return wait_time
+    
+    def on_success(self):
+        """Record a successful download and release requests waiting on the backoff window."""
+        with self._cond:
+            self._delay = max(self._delay - self.base_delay, self.base_delay)
+            self._not_before = 0.0
+            self._cond.notify_all()
+
+
+_host_backoffs: Dict[str, _HostBackoff] = {}
+_host_backoffs_lock = threading.Lock()
+
+
+def _backoff_for(url: str) -> _HostBackoff:
+    """Get the backoff state of the host serving url."""
+    host = urlsplit(url).netloc
+    with _host_backoffs_lock:
+        backoff = _host_backoffs.get(host)
+        if backoff is None:
+            backoff = _HostBackoff(DOWNLOAD_RETRY_DELAY, DOWNLOAD_RETRY_DELAY * 2 ** (DOWNLOAD_RETRIES + 2))
+            _host_backoffs[host] = backoff
+    return backoff
+
 
 def wait_for_task_done(task, timeout_s: int = EXPORT_POLL_TIMEOUT, poll_interval: int = EXPORT_POLL_INTERVAL):
     """Wait for Earth Engine task to complete."""
@@ -50,12 +216,15 @@ def download_tile_from_url(url: str, out_tif: str, tile_idx: Optional[int] = Non
     Returns:
         (success: bool, error_message: Optional[str])
     """
-    # Retry download with exponential backoff
+    # Throttling failures back off the whole host; other failures only delay this tile's retry
+    backoff = _backoff_for(url)
+    retry_at = 0.0
     for attempt in range(DOWNLOAD_RETRIES):
+        backoff.wait_turn(retry_at)
         try:
             if tile_idx is not None:
                 logging.debug("Downloading tile %d from URL... (attempt %d/%d)", tile_idx, attempt + 1, DOWNLOAD_RETRIES)
-            r = requests.get(url, stream=True, timeout=900)
+            r = _get_session().get(url, stream=True, timeout=900)
             if r.status_code != 200:
                 # Try to get error message from response
                 error_msg = ""
@@ -65,11 +234,14 @@ def download_tile_from_url(url: str, out_tif: str, tile_idx: Optional[int] = Non
                     pass
                 
                 if attempt < DOWNLOAD_RETRIES - 1:
-                    wait_time = DOWNLOAD_RETRY_DELAY * (2 ** attempt)
+                    if r.status_code in _THROTTLE_STATUSES:
+                        wait_time = backoff.on_failure()
+                    else:
+                        wait_time = DOWNLOAD_RETRY_DELAY * (2 ** attempt)
+                        retry_at = time.monotonic() + wait_time
                     if tile_idx is not None:
-                        logging.warning("HTTP error %d for tile %d%s, retrying in %d seconds...", 
+                        logging.warning("HTTP error %d for tile %d%s, retrying in %.0f seconds...", 
                                       r.status_code, tile_idx, f": {error_msg}" if error_msg else "", wait_time)
-                    time.sleep(wait_time)
                     continue
                 
                 error_status = f"http_{r.status_code}"
@@ -80,65 +252,80 @@ def download_tile_from_url(url: str, out_tif: str, tile_idx: Optional[int] = Non
                                   f": {error_msg}" if error_msg else "")
                 return False, f"{error_status}: {error_detail}"
             
-            # Download content to memory first (for small files) or check first chunk
-            content_chunks = []
+            # Stream straight to disk; only the first bytes are kept in memory for format sniffing
+            temp_download = out_tif + ".download"
+            header_buf = bytearray(HEADER_SNIFF_BYTES)
+            header_len = 0
+            payload = None
+            format_error = None
             downloaded = 0
-            first_chunk = None
-            
-            for chunk in r.iter_content(chunk_size=32768):
-                if chunk:
-                    if first_chunk is None:
-                        first_chunk = chunk
-                        # Check if first chunk looks like a TIFF or ZIP
-                        if len(chunk) >= 4:
-                            magic = chunk[:4]
-                            # TIFF magic bytes: "II" (little-endian) or "MM" (big-endian) followed by 42 (0x2a)
-                            is_tiff = (magic[:2] == b'II' and magic[2] == 0x2a) or (magic[:2] == b'MM' and magic[2] == 0x2a)
-                            is_zip = magic[:2] == b'PK'  # ZIP files start with "PK"
-                            
-                            if not (is_tiff or is_zip):
-                                return False, "invalid_file_format"
-                    
-                    content_chunks.append(chunk)
-                    downloaded += len(chunk)
+            # Unbuffered: each large chunk goes to the kernel directly from the buffer it was received into
+            try:
+                with open(temp_download, "wb", buffering=0) as fh:
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                        if not chunk:
+                            continue
+                        if header_len < HEADER_SNIFF_BYTES:
+                            # Copy into the preallocated buffer through a memoryview (no slice copy of the chunk)
+                            take = min(HEADER_SNIFF_BYTES - header_len, len(chunk))
+                            header_buf[header_len:header_len + take] = memoryview(chunk)[:take]
+                            header_len += take
+                        # Check magic bytes once, as soon as enough of the header has arrived
+                        if payload is None and header_len >= 4:
+                            header = memoryview(header_buf)[:header_len]
+                            payload = _sniff_payload(header)
+                            if payload is None:
+                                if _ERROR_PAGE_RE.search(header):
+                                    format_error = "error_page"
+                                    logging.warning("Server returned an error page instead of imagery%s: %r",
+                                                    f" for tile {tile_idx}" if tile_idx is not None else "",
+                                                    bytes(header[:200]))
+                                else:
+                                    format_error = "invalid_file_format"
+                                break
+                        _write_all(fh, chunk)
+                        downloaded += len(chunk)
+            except BaseException:
+                # Don't leave a partial .download file behind (retries and interrupts alike)
+                r.close()
+                _remove_quietly(temp_download)
+                raise
             
-            # Write to file
-            with open(out_tif, 'wb') as f:
-                for chunk in content_chunks:
-                    f.write(chunk)
+            if format_error or downloaded == 0:
+                r.close()  # Drop the unread body instead of keeping it on the pooled connection
+                os.remove(temp_download)
+                return False, format_error or "empty_file"
             
-            # Check if file is actually a ZIP (GEE sometimes returns ZIP files)
-            if zipfile.is_zipfile(out_tif):
+            # GEE sometimes returns ZIP files of single-band TIFFs instead of a GeoTIFF
+            if payload == "zip":
                 # Extract and merge ZIP contents
                 logging.debug("Downloaded file is a ZIP archive, extracting and merging...")
-                temp_tif = out_tif + ".merged.tif"
-                if extract_and_merge_zip_tiffs(out_tif, temp_tif):
-                    # Replace original with merged file
-                    os.replace(temp_tif, out_tif)
-                else:
+                merged = extract_and_merge_zip_tiffs(temp_download, out_tif)
+                os.remove(temp_download)
+                if not merged:
                     return False, "zip_extraction_failed"
+            else:
+                os.replace(temp_download, out_tif)
             
-            # Validate downloaded file
-            file_size = os.path.getsize(out_tif)
-            if file_size == 0:
-                return False, "empty_file"
-            
+            backoff.on_success()
             return True, None
             
         except requests.exceptions.Timeout:
             if attempt < DOWNLOAD_RETRIES - 1:
-                wait_time = DOWNLOAD_RETRY_DELAY * (2 ** attempt)
+                wait_time = backoff.on_failure()
                 if tile_idx is not None:
-                    logging.warning("Download timeout for tile %d, retrying in %d seconds...", tile_idx, wait_time)
-                time.sleep(wait_time)
+                    logging.warning("Download timeout for tile %d, retrying in %.0f seconds...", tile_idx, wait_time)
                 continue
             return False, "download_timeout"
         except Exception as e:
             if attempt < DOWNLOAD_RETRIES - 1:
-                wait_time = DOWNLOAD_RETRY_DELAY * (2 ** attempt)
+                if isinstance(e, requests.exceptions.ConnectionError):
+                    wait_time = backoff.on_failure()
+                else:
+                    wait_time = DOWNLOAD_RETRY_DELAY * (2 ** attempt)
+                    retry_at = time.monotonic() + wait_time
                 if tile_idx is not None:
-                    logging.warning("Download error for tile %d: %s, retrying in %d seconds...", tile_idx, str(e), wait_time)
-                time.sleep(wait_time)
+                    logging.warning("Download error for tile %d: %s, retrying in %.0f seconds...", tile_idx, str(e), wait_time)
                 continue
             return False, f"download_error: {str(e)}"
     
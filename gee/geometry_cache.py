@@ -0,0 +1,67 @@
+"""
+Persistent cache of bbox/geometry parsed from imported bbox files, so re-importing an
+unchanged file skips reading and parsing it.
+"""
+import os
+import sqlite3
+import logging
+from contextlib import closing
+from typing import Optional, Tuple
+
+from shapely import wkb
+
+GEOMETRY_CACHE_DB = "geometry_cache.db"
+
+# Seconds a caller waits for another thread's write to the database to finish
+_BUSY_TIMEOUT = 10.0
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open the cache database for one lookup or update; callers close it (closing())."""
+    conn = sqlite3.connect(db_path, timeout=_BUSY_TIMEOUT)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS geometry ("
+        "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+        "lon_min REAL, lat_min REAL, lon_max REAL, lat_max REAL, wkb BLOB)"
+    )
+    return conn
+
+
+def lookup_geometry(db_path: str, path: str) -> Optional[Tuple[list, object]]:
+    """
+    Get the cached (bbox, geometry or None) parsed from a file, or None if the file is
+    missing, was never parsed, or has changed (mtime/size) since it was.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    try:
+        with closing(_connect(db_path)) as conn:
+            row = conn.execute(
+                "SELECT lon_min, lat_min, lon_max, lat_max, wkb FROM geometry "
+                "WHERE path=? AND mtime_ns=? AND size=?",
+                (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logging.debug(f"Geometry cache lookup failed for {path}: {e}")
+        return None
+    if row is None:
+        return None
+    geometry = wkb.loads(row[4]) if row[4] is not None else None
+    return list(row[:4]), geometry
+
+
+def record_geometry(db_path: str, path: str, bbox, geometry=None):
+    """Store the bbox (and polygon geometry, if any) parsed from a file at its current mtime/size."""
+    try:
+        st = os.stat(path)
+        with closing(_connect(db_path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geometry "
+                "(path, mtime_ns, size, lon_min, lat_min, lon_max, lat_max, wkb) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (os.path.realpath(path), st.st_mtime_ns, st.st_size, *bbox,
+                 wkb.dumps(geometry) if geometry is not None else None)
+            )
+    except (OSError, sqlite3.Error) as e:
+        logging.debug(f"Geometry cache update failed for {path}: {e}")
@@ -8,6 +8,9 @@ from .cloud_detection import s2_cloud_mask_advanced, landsat_cloud_mask_advanced
 from .ee_collections import apply_dem_illumination_correction
 from .config import HARMONIZATION_COEFFS
 
+# Collection the S2 images prepared here come from (see ee_collections.sentinel_collection)
+S2_COLLECTION_ID = "COPERNICUS/S2_SR_HARMONIZED"
+
 
 def add_vegetation_indices(img):
     """
@@ -164,7 +167,7 @@ def s2_prepare_image(img):
         pass
     
     # Use advanced cloud masking
-    img2 = s2_cloud_mask_advanced(img2)
+    img2 = s2_cloud_mask_advanced(img2, S2_COLLECTION_ID)
     img2 = apply_dem_illumination_correction(img2)
     
     # Add vegetation indices
@@ -173,9 +176,12 @@ def s2_prepare_image(img):
     return img2
 
 
-def landsat_prepare_image(img):
-    """Server-side Landsat prep: advanced cloud masking, NDWI/MNDWI, IR bands, and vegetation indices."""
-    img = landsat_cloud_mask_advanced(img)
+def landsat_prepare_image(img, collection_id=None):
+    """
+    Server-side Landsat prep: advanced cloud masking, NDWI/MNDWI, IR bands, and vegetation indices.
+    Pass the source collection_id to let the cloud mask use its known band layout.
+    """
+    img = landsat_cloud_mask_advanced(img, collection_id)
     
     # Check available bands first to determine Landsat version
     try:
@@ -4,24 +4,37 @@ Manifest management for tracking processed tiles and mosaics.
 import os
 import csv
 import json
+import threading
 from datetime import datetime
 from typing import List
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .config import MANIFEST_CSV
 
+# Months finishing concurrently share the manifest: serialize the header check and appends
+_manifest_lock = threading.Lock()
+
 
 def manifest_init(path: str = MANIFEST_CSV):
     """Initialize manifest CSV file with headers."""
-    if not os.path.exists(path):
-        with open(path, "w", newline="") as f:
-            w = csv.writer(f)
-            w.writerow(["year", "month", "mosaic", "cog", "tiles", "provenance_json", "timestamp"])
+    with _manifest_lock:
+        if not os.path.exists(path):
+            with open(path, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(["year", "month", "mosaic", "cog", "tiles", "provenance_json", "timestamp"])
 
 
 def manifest_append(year: int, month: int, mosaic: str, cog: str, tiles: List[str], 
                    prov_json: str, path: str = MANIFEST_CSV):
     """Append entry to manifest CSV."""
-    with open(path, "a", newline="") as f:
-        w = csv.writer(f)
-        w.writerow([year, month, mosaic, cog, json.dumps(tiles), prov_json, datetime.utcnow().isoformat()])
+    tiles_json = orjson.dumps(tiles).decode("utf-8") if ORJSON_AVAILABLE else json.dumps(tiles)
+    row = [year, month, mosaic, cog, tiles_json, prov_json, datetime.utcnow().isoformat()]
+    with _manifest_lock:
+        with open(path, "a", newline="") as f:
+            csv.writer(f).writerow(row)
 
@@ -1235,7 +1235,7 @@ def build_best_mosaic_for_tile(tile_bounds: Tuple[float, float, float, float],
                         images_accepted_after_clouds += 1
                         
                         # Now prepare the image (this masks clouds)
-                        img_p = landsat_prepare_image(img)
+                        img_p = landsat_prepare_image(img, coll_id)
                         
                         if key == "LANDSAT_7":
                             try:
@@ -1636,7 +1636,7 @@ def build_best_mosaic_for_tile(tile_bounds: Tuple[float, float, float, float],
                             if vf_cloud_fallback_landsat is None:
                                 cf_fallback_landsat, vf_cloud_fallback_landsat = estimate_cloud_fraction(img_cloud_fallback_landsat, geom)
                             # Prepare the image fully (even with clouds)
-                            img_p_cloud_fallback_landsat = landsat_prepare_image(img_cloud_fallback_landsat)
+                            img_p_cloud_fallback_landsat = landsat_prepare_image(img_cloud_fallback_landsat, coll_id)
                             if enable_harmonize:
                                 img_p_cloud_fallback_landsat = harmonize_image(img_p_cloud_fallback_landsat, "LS_to_LS")
                             # Get band names
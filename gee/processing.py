@@ -7,10 +7,11 @@ import math
 import time
 import logging
 import shutil
-import multiprocessing
 import concurrent.futures
 import threading
 import queue
+from enum import IntFlag
+from functools import partial
 from typing import Tuple, Optional, Union, Dict
 from tqdm import tqdm
 
@@ -21,6 +22,13 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+# Optional orjson for fast provenance serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .config import (
     TARGET_RES, MIN_TILE_PIXELS, MAX_CONCURRENT_TILES, DEFAULT_WORKERS,
     DOWNLOAD_RETRIES, DOWNLOAD_RETRY_DELAY, SAFE_DOWNLOAD_SIZE_BYTES,
@@ -28,34 +36,98 @@ from .config import (
     update_connection_pool_size
 )
 from .optimization_helpers import calculate_tile_variance
-from .utils import month_ranges, make_utm_tiles
+from .utils import month_ranges, make_utm_tiles, remove_file_if_exists
 from .mosaic_builder import build_best_mosaic_for_tile
-from .download import generate_download_url, download_tile_from_url
+from .download import generate_download_url, download_tile_from_url, set_download_pool_size
 from .raster_processing import (
-    validate_geotiff_local, compute_ndwi_mask_local, write_mask,
+    validate_geotiff_local, validate_and_mask, write_mask,
     extract_and_merge_zip_tiffs, add_indices_to_mosaic_local
 )
 from .manifest import manifest_init, manifest_append
+from .validation_cache import validation_cache_path, lookup_validation, record_validation
 from .visualization import SatelliteHistogram
 from .report_generator import MosaicReportGenerator
+from .console_progress import StatusLinePrinter
 
 # Optional ML support
 
 
+def _provenance_json(provenance: Dict, indent: bool = False) -> bytes:
+    """Serialize provenance to UTF-8 JSON (orjson when available); unknown types fall back to str()."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(provenance, option=option, default=str)
+    return json.dumps(provenance, indent=2 if indent else None, default=str).encode("utf-8")
+
+
+def _write_provenance(prov_json: str, provenance: Dict):
+    """Write provenance.json in a single write."""
+    with open(prov_json, "wb") as f:
+        f.write(_provenance_json(provenance, indent=True))
+
+
+# Month (its start date) each thread is working on; months run concurrently, so each month's
+# log file keeps only the records of its own threads (see _MonthLogFilter)
+_log_month = threading.local()
+
+
+class _MonthLogFilter(logging.Filter):
+    """Pass only records logged by threads working on one month."""
+    
+    def __init__(self, month_start: str):
+        super().__init__()
+        self.month_start = month_start
+    
+    def filter(self, record) -> bool:
+        return getattr(_log_month, "month", None) == self.month_start
+
+
+class TileProvenance:
+    """
+    Per-tile provenance record built up inside process_tile.
+    Slotted (no per-instance __dict__); converted to a plain dict only when returned.
+    """
+    __slots__ = ("tile_idx", "bounds", "prefix", "status", "error", "validation_reason",
+                 "tif", "mask", "resumed", "method", "dominant_satellite", "detailed_stats",
+                 "all_test_results", "ranked_image_stats", "gap_filling_stats")
+    
+    def __init__(self, tile_idx: int, bounds, prefix: str):
+        self.tile_idx = tile_idx
+        self.bounds = bounds
+        self.prefix = prefix
+        self.status = None
+        for name in self.__slots__[4:]:
+            setattr(self, name, None)
+    
+    def to_dict(self) -> Dict:
+        """Dict form used by callers; optional fields are omitted until set."""
+        d = {"tile_idx": self.tile_idx, "bounds": self.bounds, "prefix": self.prefix, "status": self.status}
+        for name in self.__slots__[4:]:
+            value = getattr(self, name)
+            if value is not None:
+                d[name] = value
+        return d
+
+
 def process_tile(tile_idx: int, tile_bounds: Tuple[float, float, float, float], 
                  month_start: str, month_end: str, local_temp: str, 
                  include_l7: bool, enable_harmonize: bool, 
                  include_modis: bool = True, include_aster: bool = True, 
                  include_viirs: bool = True, target_resolution: float = TARGET_RES, 
                  progress_callback=None, server_mode: bool = False,
-                 tile_geometry=None):
+                 tile_geometry=None, grid_key: str = ""):
     """
     Process a single tile with detailed progress reporting.
     
     Args:
         progress_callback: Optional function(tile_idx, status, message) for progress updates
         tile_geometry: Optional Shapely Polygon - clipped geometry if tile was clipped to polygon boundary
+        grid_key: Signature of the tile grid and sensors (see _grid_signature); a tile file left by
+            an earlier run is only reused if it was produced for the same grid_key and bounds
     """
+    _log_month.month = month_start
     lonmin, latmin, lonmax, latmax = tile_bounds
     
     # Use clipped geometry if available, otherwise use bounding box rectangle
@@ -70,7 +142,7 @@ def process_tile(tile_idx: int, tile_bounds: Tuple[float, float, float, float],
                                                        [lonmax, latmax], [lonmax, latmin], 
                                                        [lonmin, latmin]]]}
     prefix = f"deadsea_{month_start.replace('-', '')}_t{tile_idx:04d}"
-    provenance = {"tile_idx": tile_idx, "bounds": tile_bounds, "prefix": prefix, "status": None}
+    provenance = TileProvenance(tile_idx, tile_bounds, prefix)
     
     def report(status, message):
         """Helper to report progress"""
@@ -79,7 +151,24 @@ def process_tile(tile_idx: int, tile_bounds: Tuple[float, float, float, float],
         else:
             logging.info(f"Tile {tile_idx:04d} [{status}]: {message}")
     
+    out_tif = os.path.join(local_temp, prefix + ".tif")
+    mask_path = out_tif.replace(".tif", "_mask.tif")
+    cache_db = validation_cache_path(local_temp)
+    # File names only carry the month and tile index, so cache entries are tied to the tile's
+    # bounds and the grid/sensor signature it was produced for
+    tile_key = f"{grid_key}|{[round(v, 9) for v in tile_bounds]}"
+    
     try:
+        # Resume: a tile (and its mask) downloaded and validated by an earlier, interrupted run
+        # for this same tile and grid is reused before any Earth Engine call is made
+        if os.path.exists(mask_path) and lookup_validation(cache_db, out_tif, tile_key) == (True, ""):
+            provenance.status = "ok"
+            provenance.tif = out_tif
+            provenance.mask = mask_path
+            provenance.resumed = True
+            report("SUCCESS", "Reusing tile validated in a previous run")
+            return out_tif, provenance.to_dict()
+        
         report("BUILDING", "Creating mosaic from satellite imagery...")
         
         # Track all test results for this tile
@@ -137,9 +226,9 @@ def process_tile(tile_idx: int, tile_bounds: Tuple[float, float, float, float],
         # Early exit if no operational satellites for this month
         # Note: NOAA is included in check but only used as last resort
         if not (include_s2 or include_landsat or include_modis_flag or include_aster_flag or include_viirs_flag or include_spot_flag or include_mss_flag or include_noaa_flag):
-            provenance["status"] = "no_imagery"
+            provenance.status = "no_imagery"
             report("FAILED", "No operational satellites for this month")
-            return None, provenance
+            return None, provenance.to_dict()
         
         result = build_best_mosaic_for_tile(
             tile_bounds, month_start, month_end, 
@@ -159,16 +248,16 @@ def process_tile(tile_idx: int, tile_bounds: Tuple[float, float, float, float],
             tile_geometry=tile_geometry,
         )
         if result is None or result[0] is None:
-            provenance["status"] = "no_imagery"
+            provenance.status = "no_imagery"
             report("FAILED", "No imagery available for this tile")
-            return None, provenance
+            return None, provenance.to_dict()
         mosaic, method, dominant_satellite, detailed_stats, ranked_image_stats, gap_filling_stats = result
-        provenance["method"] = method
-        provenance["dominant_satellite"] = dominant_satellite
-        provenance["detailed_stats"] = detailed_stats
-        provenance["all_test_results"] = all_test_results  # Store all test results for this tile
-        provenance["ranked_image_stats"] = ranked_image_stats  # Store ranked stats (including fallbacks)
-        provenance["gap_filling_stats"] = gap_filling_stats  # Store gap-filling statistics
+        provenance.method = method
+        provenance.dominant_satellite = dominant_satellite
+        provenance.detailed_stats = detailed_stats
+        provenance.all_test_results = all_test_results  # Store all test results for this tile
+        provenance.ranked_image_stats = ranked_image_stats  # Store ranked stats (including fallbacks)
+        provenance.gap_filling_stats = gap_filling_stats  # Store gap-filling statistics
         report("MOSAIC_OK", f"Mosaic created using {method}")
         
         # Debug: Log dominant satellite selection
@@ -192,8 +281,8 @@ def process_tile(tile_idx: int, tile_bounds: Tuple[float, float, float, float],
                         select_bands.append(target)
             
             if len(select_bands) < 3:
-                provenance["status"] = "missing_bands"
-                return None, provenance
+                provenance.status = "missing_bands"
+                return None, provenance.to_dict()
             
             # Add IR bands (NIR, SWIR1, SWIR2)
             if "B8" in band_names:
@@ -238,64 +327,65 @@ def process_tile(tile_idx: int, tile_bounds: Tuple[float, float, float, float],
             logging.debug(f"Selected {len(select_bands)} bands for download: {select_bands}")
             mosaic_sel = mosaic.select(select_bands)
         except Exception as e:
-            provenance["status"] = f"band_selection_error: {str(e)}"
-            return None, provenance
+            provenance.status = f"band_selection_error: {str(e)}"
+            return None, provenance.to_dict()
         
         # Generate download URL
         report("URL_GEN", "Generating download URL...")
         url, url_error = generate_download_url(mosaic_sel, region, target_resolution, select_bands)
         if url is None:
             if url_error == "tile_too_large":
-                provenance["status"] = "tile_too_large"
-                provenance["error"] = "Tile size exceeds 50MB limit. Reduce tile size."
+                provenance.status = "tile_too_large"
+                provenance.error = "Tile size exceeds 50MB limit. Reduce tile size."
                 logging.warning("Tile %d too large for direct download. Reducing tile size.", tile_idx)
             else:
-                provenance["status"] = f"url_generation_error: {url_error}"
+                provenance.status = f"url_generation_error: {url_error}"
                 logging.warning("Failed to generate download URL for tile %d: %s", tile_idx, url_error)
-            return None, provenance
+            return None, provenance.to_dict()
         
         # Download tile
         report("DOWNLOADING", "Downloading tile data...")
-        out_tif = os.path.join(local_temp, prefix + ".tif")
         success, download_error = download_tile_from_url(url, out_tif, tile_idx)
         if not success:
-            provenance["status"] = download_error or "download_failed"
-            return None, provenance
+            provenance.status = download_error or "download_failed"
+            return None, provenance.to_dict()
         
         report("DOWNLOADED", f"Downloaded {os.path.getsize(out_tif)/1024/1024:.1f}MB successfully")
         
-        # Validate
+        # Validate and compute NDWI mask from a single open of the tile
         report("VALIDATING", "Validating GeoTIFF...")
-        valid, reason = validate_geotiff_local(out_tif)
+        valid, reason, mask, meta = validate_and_mask(out_tif)
         if not valid:
-            provenance["status"] = "validation_failed"
-            provenance["validation_reason"] = reason
+            provenance.status = "validation_failed"
+            provenance.validation_reason = reason
+            record_validation(cache_db, out_tif, tile_key, False, reason)
             report("FAILED", f"Validation failed: {reason}")
-            return None, provenance
+            return None, provenance.to_dict()
         report("VALIDATED", "GeoTIFF validation passed")
         
         # Optional local ML post-process (cloud cleaning) - only if enabled & lib available
-        # Compute NDWI mask
-        report("MASKING", "Computing NDWI water mask...")
-        mask, meta = compute_ndwi_mask_local(out_tif)
-        mask_path = out_tif.replace(".tif", "_mask.tif")
+        # Write NDWI mask
+        report("MASKING", "Writing NDWI water mask...")
         write_mask(mask, meta, mask_path)
-        provenance["status"] = "ok"
-        provenance["tif"] = out_tif
-        provenance["mask"] = mask_path
+        # Only cache once the mask exists too, so a resumed run never picks up a half-finished tile
+        record_validation(cache_db, out_tif, tile_key, True)
+        provenance.status = "ok"
+        provenance.tif = out_tif
+        provenance.mask = mask_path
         report("SUCCESS", "Tile processing completed successfully")
-        return out_tif, provenance
+        return out_tif, provenance.to_dict()
     except Exception as e:
-        provenance["status"] = "error"
-        provenance["error"] = str(e)
+        provenance.status = "error"
+        provenance.error = str(e)
         report("ERROR", f"Exception: {str(e)[:100]}")
-        return None, provenance
+        return None, provenance.to_dict()
 
 
 def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root, include_l7, 
                                         enable_harmonize, include_modis, include_aster,
                                         include_viirs, effective_res, initial_workers, progress_callback,
-                                        histogram, provenance, tile_files, pbar, counters, report_generator, progress_window=None, server_mode=False):
+                                        histogram, provenance, tile_files, pbar, counters, report_generator, progress_window=None, server_mode=False,
+                                        grid_key: str = ""):
     """
     Process tiles with dynamic worker scaling based on system performance.
     Monitors CPU, memory, and processing times to adjust worker count.
@@ -311,6 +401,11 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
                 use_progress_window = True  # If no is_alive method, assume it's alive
         except Exception:
             use_progress_window = False
+    # Freeze the per-month arguments once; each dispatch then only passes the tile
+    run_tile = partial(process_tile, month_start=month_start, month_end=month_end, local_temp=temp_root,
+                       include_l7=include_l7, enable_harmonize=enable_harmonize, include_modis=include_modis,
+                       include_aster=include_aster, include_viirs=include_viirs, target_resolution=effective_res,
+                       progress_callback=progress_callback, server_mode=server_mode, grid_key=grid_key)
     if not PSUTIL_AVAILABLE:
         logging.warning("psutil not available, falling back to fixed workers. Install with: pip install psutil")
         # Fallback to fixed workers if psutil not available
@@ -329,10 +424,7 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
                     tile_bounds = tile
                     tile_geometry = None
                 
-                future = ex.submit(process_tile, idx, tile_bounds, month_start, month_end, temp_root,
-                                 include_l7, enable_harmonize, include_modis,
-                                 include_aster, include_viirs, effective_res, progress_callback,
-                                 server_mode=server_mode, tile_geometry=tile_geometry)
+                future = ex.submit(run_tile, idx, tile_bounds, tile_geometry=tile_geometry)
                 futures[future] = idx
             _process_futures(futures, provenance, tile_files, histogram, pbar, success_count, failed_count, initial_workers, progress_window, use_progress_window)
         return
@@ -344,6 +436,8 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
     active_workers = initial_workers
     lock = threading.Lock()
     stop_event = threading.Event()
+    # Workers whose slot is >= active_workers park here, so scaling down takes effect
+    slot_cond = threading.Condition()
     
     # Performance metrics
     completion_times = []  # Track processing times
@@ -353,9 +447,14 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
     for idx, tile in enumerate(tiles):
         tile_queue.put((idx, tile))
     
-    def worker_thread():
-        """Worker thread that processes tiles from queue"""
+    def worker_thread(slot):
+        """Worker thread that processes tiles from queue while its slot is within active_workers"""
         while not stop_event.is_set():
+            with slot_cond:
+                while slot >= active_workers and not stop_event.is_set():
+                    slot_cond.wait(timeout=1.0)
+            if stop_event.is_set():
+                break
             try:
                 idx, tile = tile_queue.get(timeout=1.0)
                 start_time = time.time()
@@ -370,10 +469,7 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
                     tile_geometry = None
                 
                 try:
-                    out, prov = process_tile(idx, tile_bounds, month_start, month_end, temp_root,
-                                            include_l7, enable_harmonize, include_modis,
-                                            include_aster, include_viirs, effective_res, progress_callback,
-                                            server_mode=server_mode, tile_geometry=tile_geometry)
+                    out, prov = run_tile(idx, tile_bounds, tile_geometry=tile_geometry)
                     processing_time = time.time() - start_time
                     result_queue.put(("success", idx, out, prov, processing_time))
                 except Exception as e:
@@ -387,6 +483,7 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
     
     def manager_thread():
         """Manager thread that monitors performance and adjusts workers"""
+        _log_month.month = month_start
         nonlocal active_workers, last_check_tile_count
         
         # Server mode: check more frequently for faster scaling
@@ -499,30 +596,27 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
             
             # Adjust worker count
             if new_worker_count != active_workers:
-                with lock:
-                    diff = new_worker_count - active_workers
-                    if diff > 0:
-                        # Add workers
-                        for _ in range(diff):
-                            t = threading.Thread(target=worker_thread, daemon=True)
-                            t.start()
-                            worker_threads.append(t)
-                    else:
-                        # Workers will naturally exit when queue is empty
-                        # We can't forcefully kill threads, but they'll finish current work
-                        pass
+                with lock, slot_cond:
+                    # Start threads for slots that have never run; parked ones are woken below.
+                    # When shrinking, workers above the new count park after their current tile.
+                    for slot in range(len(worker_threads), new_worker_count):
+                        t = threading.Thread(target=worker_thread, args=(slot,), daemon=True)
+                        t.start()
+                        worker_threads.append(t)
                     active_workers = new_worker_count
+                    slot_cond.notify_all()
                     
                     # Update connection pool size dynamically based on new worker count
                     new_pool_size = update_connection_pool_size(new_worker_count)
                     if new_pool_size:
+                        set_download_pool_size(new_pool_size)
                         logging.debug(f"Adjusted connection pool size to {new_pool_size} for {new_worker_count} workers")
             
             last_check_tile_count = current_completed
     
     # Start initial workers
-    for _ in range(initial_workers):
-        t = threading.Thread(target=worker_thread, daemon=True)
+    for slot in range(initial_workers):
+        t = threading.Thread(target=worker_thread, args=(slot,), daemon=True)
         t.start()
         worker_threads.append(t)
     
@@ -621,8 +715,10 @@ def _process_tiles_with_dynamic_workers(tiles, month_start, month_end, temp_root
             if all(not t.is_alive() for t in worker_threads) and tile_queue.empty():
                 break
     
-    # Stop all workers
+    # Stop all workers (including parked ones)
     stop_event.set()
+    with slot_cond:
+        slot_cond.notify_all()
     tile_queue.join()  # Wait for all tasks to complete
     
     pbar.close()
@@ -743,52 +839,81 @@ def _process_futures(futures, provenance, tile_files, histogram, pbar, success_c
             pbar.update(1)
 
 
-def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon', Dict], 
-                 year: int, month: int, 
-                 out_folder: str, workers: int = 3, 
-                 enable_harmonize: bool = True, include_modis: bool = True, 
-                 include_aster: bool = True, include_viirs: bool = True, 
-                 target_resolution: float = TARGET_RES, max_tiles: Optional[int] = None,
-                 progress_window=None, server_mode=False):
-    """Process a single month of satellite imagery."""
-    from datetime import datetime
-    from .raster_processing import feather_and_merge, create_cog
-    
-    month_start = f"{year}-{month:02d}-01"
-    if month == 12:
-        month_end = f"{year+1}-01-01"
-    else:
-        month_end = f"{year}-{month+1:02d}-01"
-    out_dir = os.path.join(out_folder, f"{year}_{month:02d}")
-    os.makedirs(out_dir, exist_ok=True)
+class TileGrid:
+    """
+    Tile layout for a geometry, shared by every month processed over it.
+    Slotted like TileProvenance; built by plan_tile_grid.
+    """
+    __slots__ = ("bbox", "resolution", "tiles", "tile_side_m", "avg_tile_pixels")
     
-    # Add file handler for this specific processing run (in addition to main log)
-    # This creates a log file in the output directory for easy access
-    run_log_path = os.path.join(out_dir, f"processing_{year}_{month:02d}.log")
-    run_file_handler = logging.FileHandler(run_log_path, encoding='utf-8', mode='w')
-    run_file_handler.setLevel(logging.DEBUG)
-    run_file_format = logging.Formatter("%(asctime)s [%(levelname)s] [%(filename)s:%(lineno)d] %(message)s")
-    run_file_handler.setFormatter(run_file_format)
-    logger = logging.getLogger()
-    logger.addHandler(run_file_handler)
-    logging.info(f"Processing log file: {run_log_path}")
+    def __init__(self, bbox: Tuple[float, float, float, float], resolution: float, tiles: list,
+                 tile_side_m: float, avg_tile_pixels: int):
+        self.bbox = bbox
+        self.resolution = resolution
+        self.tiles = tiles
+        self.tile_side_m = tile_side_m
+        self.avg_tile_pixels = avg_tile_pixels
+
+
+class Sensors(IntFlag):
+    """Optional sensors and processing steps for a run, packed into one flag value."""
+    HARMONIZE = 1
+    MODIS = 2
+    ASTER = 4
+    VIIRS = 8
     
-    # Reduce third-party log noise (e.g., urllib3 connection pool warnings)
+    @classmethod
+    def from_options(cls, enable_harmonize: bool = True, include_modis: bool = True,
+                     include_aster: bool = True, include_viirs: bool = True) -> "Sensors":
+        """Build the flag from the individual on/off options."""
+        flags = cls(0)
+        if enable_harmonize:
+            flags |= cls.HARMONIZE
+        if include_modis:
+            flags |= cls.MODIS
+        if include_aster:
+            flags |= cls.ASTER
+        if include_viirs:
+            flags |= cls.VIIRS
+        return flags
+
+
+# Written into a month's output folder once its mosaic, COG, manifest row and report are done
+DONE_MARKER = "DONE.marker"
+
+
+def _grid_signature(grid: TileGrid, sensors: Sensors) -> Dict:
+    """
+    What a finished month was built from; a different bbox, tiling, sensor selection or
+    harmonization setting means it must be redone.
+    """
+    return {"bbox": [round(v, 9) for v in grid.bbox], "tiles": len(grid.tiles), "resolution": grid.resolution,
+            "sensors": int(sensors)}
+
+
+def month_is_done(out_folder: str, year: int, month: int, grid: TileGrid, sensors: Sensors) -> bool:
+    """Check for a DONE marker written by process_month for the same tile grid and sensors."""
+    marker = os.path.join(out_folder, f"{year}_{month:02d}", DONE_MARKER)
     try:
-        import logging as _logging
-        _logging.getLogger("urllib3.connectionpool").setLevel(_logging.ERROR)
-        _logging.getLogger("requests.packages.urllib3.connectionpool").setLevel(_logging.ERROR)
-    except Exception:
-        pass
+        with open(marker, "r") as f:
+            return json.load(f) == _grid_signature(grid, sensors)
+    except (OSError, ValueError):
+        return False
+
+
+def plan_tile_grid(geometry: Union[Tuple[float, float, float, float], 'Polygon', Dict],
+                   max_tiles: Optional[int] = None) -> TileGrid:
+    """
+    Split a bbox or polygon into download tiles.
     
-    cog_path = os.path.join(out_dir, f"deadsea_{year}_{month:02d}_COG.tif")
-    if os.path.exists(cog_path):
-        logging.info("Skipping %s-%02d (COG exists)", year, month)
-        # Remove the run-specific handler before returning
-        logger.removeHandler(run_file_handler)
-        run_file_handler.close()
-        return
+    Args:
+        geometry: Bounding box tuple (lon_min, lat_min, lon_max, lat_max), Shapely Polygon, or GeoJSON dict
+        max_tiles: Optional tile count; None picks 256-pixel tiles automatically
     
+    Raises:
+        ValueError: If the geometry cannot be parsed, tiles would exceed the download size limit,
+            or no tiles are generated
+    """
     # Force resolution to always be 5m
     effective_res = 5.0  # Always 5m resolution
     logging.info("Forcing 5m resolution for all satellites")
@@ -901,6 +1026,86 @@ def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon',
     logging.info("Resolution 5m: %d tiles (each tile ~%d pixels) - forced 256 pixel minimum", 
                 len(tiles), avg_tile_pixels)
     
+    return TileGrid(bbox, effective_res, tiles, tile_side_m, avg_tile_pixels)
+
+
+def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon', Dict], 
+                 year: int, month: int, 
+                 out_folder: str, workers: int = 3, 
+                 enable_harmonize: bool = True, include_modis: bool = True, 
+                 include_aster: bool = True, include_viirs: bool = True, 
+                 target_resolution: float = TARGET_RES, max_tiles: Optional[int] = None,
+                 progress_window=None, server_mode=False, grid: Optional[TileGrid] = None,
+                 sensors: Optional[Sensors] = None):
+    """
+    Process a single month of satellite imagery.
+    
+    Args:
+        grid: Optional tile layout from plan_tile_grid(geometry, max_tiles); planned here if omitted
+        sensors: Optional Sensors flags; when given, they replace enable_harmonize and the include_* options
+    """
+    if sensors is not None:
+        enable_harmonize = bool(sensors & Sensors.HARMONIZE)
+        include_modis = bool(sensors & Sensors.MODIS)
+        include_aster = bool(sensors & Sensors.ASTER)
+        include_viirs = bool(sensors & Sensors.VIIRS)
+    else:
+        sensors = Sensors.from_options(enable_harmonize, include_modis, include_aster, include_viirs)
+    from datetime import datetime
+    from .raster_processing import feather_and_merge, create_cog
+    
+    month_start = f"{year}-{month:02d}-01"
+    if month == 12:
+        month_end = f"{year+1}-01-01"
+    else:
+        month_end = f"{year}-{month+1:02d}-01"
+    out_dir = os.path.join(out_folder, f"{year}_{month:02d}")
+    os.makedirs(out_dir, exist_ok=True)
+    
+    # Add file handler for this specific processing run (in addition to main log)
+    # This creates a log file in the output directory for easy access
+    run_log_path = os.path.join(out_dir, f"processing_{year}_{month:02d}.log")
+    run_file_handler = logging.FileHandler(run_log_path, encoding='utf-8', mode='w')
+    run_file_handler.setLevel(logging.DEBUG)
+    run_file_format = logging.Formatter("%(asctime)s [%(levelname)s] [%(filename)s:%(lineno)d] %(message)s")
+    run_file_handler.setFormatter(run_file_format)
+    # Months run concurrently: only this month's threads (this one and its tile workers) log here
+    _log_month.month = month_start
+    run_file_handler.addFilter(_MonthLogFilter(month_start))
+    logger = logging.getLogger()
+    logger.addHandler(run_file_handler)
+    logging.info(f"Processing log file: {run_log_path}")
+    
+    # Reduce third-party log noise (e.g., urllib3 connection pool warnings)
+    try:
+        import logging as _logging
+        _logging.getLogger("urllib3.connectionpool").setLevel(_logging.ERROR)
+        _logging.getLogger("requests.packages.urllib3.connectionpool").setLevel(_logging.ERROR)
+    except Exception:
+        pass
+    
+    cog_path = os.path.join(out_dir, f"deadsea_{year}_{month:02d}_COG.tif")
+    # A COG whose DONE marker records a different grid or sensor selection is rebuilt, not reused
+    stale_output = (grid is not None and os.path.exists(os.path.join(out_dir, DONE_MARKER))
+                    and not month_is_done(out_folder, year, month, grid, sensors))
+    if stale_output:
+        logging.info("Rebuilding %s-%02d (tile grid or sensors changed since it was built)", year, month)
+    elif os.path.exists(cog_path):
+        logging.info("Skipping %s-%02d (COG exists)", year, month)
+        # Remove the run-specific handler before returning
+        logger.removeHandler(run_file_handler)
+        run_file_handler.close()
+        return
+    
+    # The tile layout depends only on the geometry, so multi-month runs plan it once and pass it in
+    if grid is None:
+        grid = plan_tile_grid(geometry, max_tiles)
+    effective_res = grid.resolution
+    bbox = grid.bbox
+    tiles = grid.tiles
+    # Identifies this grid and sensor selection in the tile validation cache
+    grid_key = json.dumps(_grid_signature(grid, sensors), sort_keys=True)
+    
     # Download directly to output directory
     tiles_dir = os.path.join(out_dir, "tiles")
     os.makedirs(tiles_dir, exist_ok=True)
@@ -910,26 +1115,28 @@ def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon',
     include_l7 = True  # included but low-priority
     
     # Dynamic worker management
-    cpu_count = multiprocessing.cpu_count()
+    # Tile workers mostly wait on Earth Engine and downloads, so they are not capped at the CPU
+    # count; the CPU-bound stages (reprojection, mosaicking) size their threads from USABLE_CPUS
     # Server mode: ignore MAX_CONCURRENT_TILES limit, start more aggressively
     if server_mode:
-        # In server mode, start with CPU count and allow scaling up to MAX_WORKERS (4x CPU)
-        max_initial_workers = min(workers, cpu_count, len(tiles))
+        # In server mode, start with the requested workers and allow scaling up to MAX_WORKERS (4x CPU)
+        max_initial_workers = min(workers, len(tiles))
         effective_workers = max_initial_workers
-        logging.info(f"[SERVER MODE] Starting with {effective_workers} workers, will scale up to {MAX_WORKERS} (CPU count: {cpu_count}, tiles: {len(tiles)})")
+        logging.info(f"[SERVER MODE] Starting with {effective_workers} workers, will scale up to {MAX_WORKERS} (tiles: {len(tiles)})")
     else:
         # Normal mode: respect MAX_CONCURRENT_TILES limit
-        effective_workers = min(workers, cpu_count, MAX_CONCURRENT_TILES, len(tiles))
+        effective_workers = min(workers, MAX_CONCURRENT_TILES, len(tiles))
         if workers > effective_workers:
-            logging.info("Reduced workers from %d to %d (CPU count: %d, max concurrent: %d, tiles: %d)", 
-                        workers, effective_workers, cpu_count, MAX_CONCURRENT_TILES, len(tiles))
+            logging.info("Reduced workers from %d to %d (max concurrent: %d, tiles: %d)", 
+                        workers, effective_workers, MAX_CONCURRENT_TILES, len(tiles))
         else:
-            logging.info("Using %d workers for %d tiles (CPU count: %d)", effective_workers, len(tiles), cpu_count)
+            logging.info("Using %d workers for %d tiles", effective_workers, len(tiles))
     
     # Proactively size the connection pool to avoid initial 'pool is full' warnings
     try:
         new_pool = update_connection_pool_size(effective_workers)
         if new_pool:
+            set_download_pool_size(new_pool)
             logging.debug(f"Primed urllib3 connection pool size to {new_pool} (effective workers: {effective_workers})")
     except Exception:
         pass
@@ -980,191 +1187,198 @@ def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon',
     )
     processing_start_time = time.time()
     
-    def progress_callback(tile_idx, status, message):
-        """Callback for tile progress updates"""
-        tile_status[tile_idx] = {"status": status, "message": message, "timestamp": time.time()}
-        status_symbol = {
-            "BUILDING": "🔨", "MOSAIC_OK": "✓", "SELECTING": "📋", "URL_GEN": "🔗",
-            "DOWNLOADING": "⬇️", "DOWNLOADED": "✓", "VALIDATING": "✔", "VALIDATED": "✓",
-            "MASKING": "🎭", "SUCCESS": "✅", "FAILED": "❌", "ERROR": "⚠️"
-        }.get(status, "•")
-        console_msg = f"[Tile {tile_idx:04d}] {status_symbol} {status}: {message[:60]}"
-        print(f"\r{console_msg}", end="", flush=True)
+    # Per-tile status line is rendered by one display thread instead of printed from workers
+    with StatusLinePrinter() as status_printer:
+    
+        def progress_callback(tile_idx, status, message):
+            """Callback for tile progress updates"""
+            tile_status[tile_idx] = {"status": status, "message": message, "timestamp": time.time()}
+            status_symbol = {
+                "BUILDING": "🔨", "MOSAIC_OK": "✓", "SELECTING": "📋", "URL_GEN": "🔗",
+                "DOWNLOADING": "⬇️", "DOWNLOADED": "✓", "VALIDATING": "✔", "VALIDATED": "✓",
+                "MASKING": "🎭", "SUCCESS": "✅", "FAILED": "❌", "ERROR": "⚠️"
+            }.get(status, "•")
+            console_msg = f"[Tile {tile_idx:04d}] {status_symbol} {status}: {message[:60]}"
+            status_printer.post(console_msg)
         
-        # Update progress window if available
-        if use_progress_window and progress_window and progress_window.is_alive():
-            try:
-                # Console progress will update table periodically
-                if hasattr(progress_window, 'add_console_message'):
-                    progress_window.add_console_message(console_msg, status)
-                # Check for pause (if supported)
-                if hasattr(progress_window, 'wait_for_pause'):
-                    progress_window.wait_for_pause()
-            except Exception as e:
-                logging.debug(f"Error updating progress display: {e}")
+            # Update progress window if available
+            if use_progress_window and progress_window and progress_window.is_alive():
+                try:
+                    # Console progress will update table periodically
+                    if hasattr(progress_window, 'add_console_message'):
+                        progress_window.add_console_message(console_msg, status)
+                    # Check for pause (if supported)
+                    if hasattr(progress_window, 'wait_for_pause'):
+                        progress_window.wait_for_pause()
+                except Exception as e:
+                    logging.debug(f"Error updating progress display: {e}")
     
-    # Process tiles with dynamic or fixed workers
-    pbar = tqdm(total=len(tiles), desc=f"Month {year}-{month:02d}", unit="tile", ncols=100)
+        # Process tiles with dynamic or fixed workers
+        pbar = tqdm(total=len(tiles), desc=f"Month {year}-{month:02d}", unit="tile", ncols=100)
     
-    # Use mutable counters for dynamic workers
-    counters = {"success": 0, "failed": 0}
+        # Use mutable counters for dynamic workers
+        counters = {"success": 0, "failed": 0}
     
-    # OPTIMIZATION #9: Tile priority queue (higher variance first)
-    # Compute a simple variance score per tile and sort descending
-    try:
-        print("Calculating tile priorities...", flush=True)
-        scored_tiles = []
-        for tile in tiles:
-            try:
-                # Extract bounds for variance calculation
-                tile_bounds = tile['bounds'] if isinstance(tile, dict) else tile
-                var_score = calculate_tile_variance(tile_bounds, month_start, month_end)
-            except Exception:
-                var_score = 0.0
-            scored_tiles.append((var_score, tile))
-        # Sort by variance descending; fall back to original order on ties
-        scored_tiles.sort(key=lambda x: x[0], reverse=True)
-        priority_tiles = [t for _, t in scored_tiles]
-        print(f"Starting to process {len(priority_tiles)} tiles...\n", flush=True)
-    except Exception:
-        # Fallback to original order if variance calculation fails
-        priority_tiles = tiles
-        print("Using default tile order...\n", flush=True)
-    
-    if ENABLE_DYNAMIC_WORKERS:
-        # Use adaptive worker pool with dynamic scaling
-        # OPTIMIZATION #9: Use priority-ordered tiles (high-variance first)
-        _process_tiles_with_dynamic_workers(
-            priority_tiles, month_start, month_end, temp_root, include_l7,
-            enable_harmonize, include_modis, include_aster, include_viirs,
-            effective_res, effective_workers, progress_callback, histogram,
-            provenance, tile_files, pbar, counters, report_generator, progress_window, server_mode
-        )
-        success_count = counters["success"]
-        failed_count = counters["failed"]
-    else:
-        # Use fixed worker pool (original implementation)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=effective_workers) as ex:
-            futures = {}
-            for idx, tile in enumerate(tiles):
-                # Extract bounds and geometry from tile dict
-                if isinstance(tile, dict):
-                    tile_bounds = tile['bounds']
-                    tile_geometry = tile.get('geometry')
-                else:
-                    # Backward compatibility: assume it's a bounds tuple
-                    tile_bounds = tile
-                    tile_geometry = None
+        # OPTIMIZATION #9: Tile priority queue (higher variance first)
+        # Compute a simple variance score per tile and sort descending
+        try:
+            print("Calculating tile priorities...", flush=True)
+            scored_tiles = []
+            for tile in tiles:
+                try:
+                    # Extract bounds for variance calculation
+                    tile_bounds = tile['bounds'] if isinstance(tile, dict) else tile
+                    var_score = calculate_tile_variance(tile_bounds, month_start, month_end)
+                except Exception:
+                    var_score = 0.0
+                scored_tiles.append((var_score, tile))
+            # Sort by variance descending; fall back to original order on ties
+            scored_tiles.sort(key=lambda x: x[0], reverse=True)
+            priority_tiles = [t for _, t in scored_tiles]
+            print(f"Starting to process {len(priority_tiles)} tiles...\n", flush=True)
+        except Exception:
+            # Fallback to original order if variance calculation fails
+            priority_tiles = tiles
+            print("Using default tile order...\n", flush=True)
+    
+        if ENABLE_DYNAMIC_WORKERS:
+            # Use adaptive worker pool with dynamic scaling
+            # OPTIMIZATION #9: Use priority-ordered tiles (high-variance first)
+            _process_tiles_with_dynamic_workers(
+                priority_tiles, month_start, month_end, temp_root, include_l7,
+                enable_harmonize, include_modis, include_aster, include_viirs,
+                effective_res, effective_workers, progress_callback, histogram,
+                provenance, tile_files, pbar, counters, report_generator, progress_window, server_mode,
+                grid_key=grid_key
+            )
+            status_printer.close()
+            success_count = counters["success"]
+            failed_count = counters["failed"]
+        else:
+            # Use fixed worker pool (original implementation)
+            run_tile = partial(process_tile, month_start=month_start, month_end=month_end, local_temp=temp_root,
+                               include_l7=include_l7, enable_harmonize=enable_harmonize, include_modis=include_modis,
+                               include_aster=include_aster, include_viirs=include_viirs, target_resolution=effective_res,
+                               progress_callback=progress_callback, server_mode=server_mode, grid_key=grid_key)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=effective_workers) as ex:
+                futures = {}
+                for idx, tile in enumerate(tiles):
+                    # Extract bounds and geometry from tile dict
+                    if isinstance(tile, dict):
+                        tile_bounds = tile['bounds']
+                        tile_geometry = tile.get('geometry')
+                    else:
+                        # Backward compatibility: assume it's a bounds tuple
+                        tile_bounds = tile
+                        tile_geometry = None
                 
-                future = ex.submit(process_tile, idx, tile_bounds, month_start, month_end, temp_root, 
-                                 include_l7, enable_harmonize, include_modis, 
-                                 include_aster, include_viirs, effective_res, progress_callback,
-                                 server_mode, tile_geometry=tile_geometry)
-                futures[future] = idx
+                    future = ex.submit(run_tile, idx, tile_bounds, tile_geometry=tile_geometry)
+                    futures[future] = idx
             
-            for fut in concurrent.futures.as_completed(futures):
-                completed_count += 1
-                try:
-                    out, prov = fut.result(timeout=3600)  # 1 hour timeout per tile
-                    idx = prov.get("tile_idx")
-                    provenance[f"tile_{idx}"] = prov
+                for fut in concurrent.futures.as_completed(futures):
+                    completed_count += 1
+                    try:
+                        out, prov = fut.result(timeout=3600)  # 1 hour timeout per tile
+                        idx = prov.get("tile_idx")
+                        provenance[f"tile_{idx}"] = prov
                     
-                    status = prov.get("status", "unknown")
-                    if out and status == "ok":
-                        tile_files.append(out)
-                        success_count += 1
-                        dominant_sat = prov.get("dominant_satellite")
-                        detailed_stats = prov.get("detailed_stats")
-                        tile_idx = prov.get("tile_idx")
-                        all_test_results = prov.get("all_test_results", [])
+                        status = prov.get("status", "unknown")
+                        if out and status == "ok":
+                            tile_files.append(out)
+                            success_count += 1
+                            dominant_sat = prov.get("dominant_satellite")
+                            detailed_stats = prov.get("detailed_stats")
+                            tile_idx = prov.get("tile_idx")
+                            all_test_results = prov.get("all_test_results", [])
                         
-                        # For fixed workers, we don't have individual processing times
-                        # The histogram will use elapsed time / processed count as fallback
-                        processing_time = None
+                            # For fixed workers, we don't have individual processing times
+                            # The histogram will use elapsed time / processed count as fallback
+                            processing_time = None
                         
-                        # Add to report generator
-                        report_generator.add_tile_result(tile_idx, prov, processing_time or 0.0)
+                            # Add to report generator
+                            report_generator.add_tile_result(tile_idx, prov, processing_time or 0.0)
                         
-                        # Update progress window or histogram
-                        if use_progress_window and progress_window is not None:
-                            try:
-                                # Double-check that progress_window is still valid
-                                if hasattr(progress_window, 'is_alive') and not progress_window.is_alive():
-                                    use_progress_window = False
-                                if use_progress_window and progress_window is not None:
-                                    # Update progress window
-                                    progress_window.update_tile_progress(counters["success"], counters["failed"])
-                                    if dominant_sat:
-                                        progress_window.add_satellite(dominant_sat, detailed_stats)
-                                    if processing_time:
-                                        progress_window.add_processing_time(processing_time)
-                                    # Add test results
-                                    for test_result in all_test_results:
-                                        progress_window.add_test_result(test_result)
-                            except Exception as e:
-                                logging.debug(f"Error updating progress display: {e}")
-                                use_progress_window = False  # Disable on error
-                        elif histogram:
-                            # Use histogram
-                            ranked_image_stats = prov.get("ranked_image_stats", [])
-                            if ranked_image_stats:
-                                for ranked_stat in ranked_image_stats:
-                                    ranked_stat["tile_idx"] = tile_idx
-                                    histogram.add_test_result(ranked_stat)
-                            else:
-                                if detailed_stats:
+                            # Update progress window or histogram
+                            if use_progress_window and progress_window is not None:
+                                try:
+                                    # Double-check that progress_window is still valid
+                                    if hasattr(progress_window, 'is_alive') and not progress_window.is_alive():
+                                        use_progress_window = False
+                                    if use_progress_window and progress_window is not None:
+                                        # Update progress window
+                                        progress_window.update_tile_progress(counters["success"], counters["failed"])
+                                        if dominant_sat:
+                                            progress_window.add_satellite(dominant_sat, detailed_stats)
+                                        if processing_time:
+                                            progress_window.add_processing_time(processing_time)
+                                        # Add test results
+                                        for test_result in all_test_results:
+                                            progress_window.add_test_result(test_result)
+                                except Exception as e:
+                                    logging.debug(f"Error updating progress display: {e}")
+                                    use_progress_window = False  # Disable on error
+                            elif histogram:
+                                # Use histogram
+                                ranked_image_stats = prov.get("ranked_image_stats", [])
+                                if ranked_image_stats:
+                                    for ranked_stat in ranked_image_stats:
+                                        ranked_stat["tile_idx"] = tile_idx
+                                        histogram.add_test_result(ranked_stat)
+                                else:
+                                    if detailed_stats:
+                                        for test_result in all_test_results:
+                                            if (test_result.get("satellite") == detailed_stats.get("satellite") and
+                                                abs(test_result.get("quality_score", 0) - detailed_stats.get("quality_score", 0)) < 0.001):
+                                                test_result["is_selected"] = True
+                                                break
                                     for test_result in all_test_results:
-                                        if (test_result.get("satellite") == detailed_stats.get("satellite") and
-                                            abs(test_result.get("quality_score", 0) - detailed_stats.get("quality_score", 0)) < 0.001):
-                                            test_result["is_selected"] = True
-                                            break
-                                for test_result in all_test_results:
-                                    histogram.add_test_result(test_result)
-                            if dominant_sat:
-                                histogram.add_satellite(dominant_sat, detailed_stats, tile_idx, processing_time)
-                        print(f"\n[Tile {idx:04d}] ✅ SUCCESS - Added to mosaic")
-                    else:
-                        failed_count += 1
-                        error_msg = prov.get("error", prov.get("validation_reason", status))
-                        fail_msg = f"[Tile {idx:04d}] ❌ FAILED - {status}: {error_msg[:80]}"
-                        print(f"\n{fail_msg}")
+                                        histogram.add_test_result(test_result)
+                                if dominant_sat:
+                                    histogram.add_satellite(dominant_sat, detailed_stats, tile_idx, processing_time)
+                            print(f"\n[Tile {idx:04d}] ✅ SUCCESS - Added to mosaic")
+                        else:
+                            failed_count += 1
+                            error_msg = prov.get("error", prov.get("validation_reason", status))
+                            fail_msg = f"[Tile {idx:04d}] ❌ FAILED - {status}: {error_msg[:80]}"
+                            print(f"\n{fail_msg}")
                         
-                        # Update progress window
-                        if use_progress_window and progress_window and progress_window.is_alive():
-                            try:
-                                progress_window.update_tile_progress(success_count, failed_count)
-                            except Exception as e:
-                                logging.debug(f"Error updating progress display: {e}")
+                            # Update progress window
+                            if use_progress_window and progress_window and progress_window.is_alive():
+                                try:
+                                    progress_window.update_tile_progress(success_count, failed_count)
+                                except Exception as e:
+                                    logging.debug(f"Error updating progress display: {e}")
                         
-                        # Add failed tile to report
-                        report_generator.add_tile_result(idx, prov, 0.0)
-                        report_generator.add_error(f"Tile {idx:04d}: {status} - {error_msg}")
+                            # Add failed tile to report
+                            report_generator.add_tile_result(idx, prov, 0.0)
+                            report_generator.add_error(f"Tile {idx:04d}: {status} - {error_msg}")
                     
-                    pbar.update(1)
-                    pbar.set_postfix({"OK": success_count, "FAIL": failed_count, "ACTIVE": effective_workers})
+                        pbar.update(1)
+                        pbar.set_postfix({"OK": success_count, "FAIL": failed_count, "ACTIVE": effective_workers})
                     
-                except concurrent.futures.TimeoutError:
-                    failed_count += 1
-                    print(f"\n[Tile ???] ⏱️ TIMEOUT - Processing exceeded 1 hour")
-                    timeout_prov = {"status": "timeout", "error": "Processing exceeded 1 hour", "tile_idx": None}
-                    provenance[f"tile_unknown"] = timeout_prov
-                    report_generator.add_tile_result(-1, timeout_prov, 0.0)
-                    report_generator.add_error("Tile timeout: Processing exceeded 1 hour")
-                    pbar.update(1)
-                except Exception as e:
-                    failed_count += 1
-                    print(f"\n[Tile ???] ⚠️ ERROR - {str(e)[:80]}")
-                    error_prov = {"status": "error", "error": str(e), "tile_idx": None}
-                    provenance[f"tile_unknown"] = error_prov
-                    report_generator.add_tile_result(-1, error_prov, 0.0)
-                    report_generator.add_error(f"Tile processing error: {str(e)}")
-                    pbar.update(1)
+                    except concurrent.futures.TimeoutError:
+                        failed_count += 1
+                        print(f"\n[Tile ???] ⏱️ TIMEOUT - Processing exceeded 1 hour")
+                        timeout_prov = {"status": "timeout", "error": "Processing exceeded 1 hour", "tile_idx": None}
+                        provenance[f"tile_unknown"] = timeout_prov
+                        report_generator.add_tile_result(-1, timeout_prov, 0.0)
+                        report_generator.add_error("Tile timeout: Processing exceeded 1 hour")
+                        pbar.update(1)
+                    except Exception as e:
+                        failed_count += 1
+                        print(f"\n[Tile ???] ⚠️ ERROR - {str(e)[:80]}")
+                        error_prov = {"status": "error", "error": str(e), "tile_idx": None}
+                        provenance[f"tile_unknown"] = error_prov
+                        report_generator.add_tile_result(-1, error_prov, 0.0)
+                        report_generator.add_error(f"Tile processing error: {str(e)}")
+                        pbar.update(1)
         
-        pbar.close()
-        completed_count = success_count + failed_count
-        print(f"\n{'='*80}")
-        print(f"Tile Processing Summary: {success_count} succeeded, {failed_count} failed out of {completed_count} total")
-        print(f"{'='*80}\n")
+            status_printer.close()
+            pbar.close()
+            completed_count = success_count + failed_count
+            print(f"\n{'='*80}")
+            print(f"Tile Processing Summary: {success_count} succeeded, {failed_count} failed out of {completed_count} total")
+            print(f"{'='*80}\n")
     
     if not tile_files:
         logging.warning("No tiles produced for %s", month_start)
@@ -1231,8 +1445,7 @@ def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon',
     if not valid:
         logging.error("Mosaic validation failed: %s. Keeping individual tiles for debugging.", reason)
         prov_json = os.path.join(out_dir, "provenance.json")
-        with open(prov_json, "w") as f:
-            json.dump(provenance, f, indent=2, default=str)
+        _write_provenance(prov_json, provenance)
         return
     
     # Create COG
@@ -1259,37 +1472,29 @@ def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon',
     if not valid_cog:
         logging.error("COG validation failed: %s. Keeping individual tiles for debugging.", reason_cog)
         prov_json = os.path.join(out_dir, "provenance.json")
-        with open(prov_json, "w") as f:
-            json.dump(provenance, f, indent=2, default=str)
+        _write_provenance(prov_json, provenance)
         return
     
     # Mosaic and COG are both valid - safe to delete individual tiles
     logging.info("Mosaic and COG validated successfully. Cleaning up individual tiles...")
     deleted_count = 0
     for t in tile_files:
-        try:
-            if os.path.exists(t):
-                os.remove(t)
-                deleted_count += 1
-        except Exception as e:
-            logging.warning("Failed to delete tile %s: %s", t, str(e))
+        if remove_file_if_exists(t):
+            deleted_count += 1
     
     # Delete mask files too
     for v in provenance.values():
         m = v.get("mask")
-        if m and os.path.exists(m):
-            try:
-                os.remove(m)
-            except Exception as e:
-                logging.warning("Failed to delete mask %s: %s", m, str(e))
+        if m:
+            remove_file_if_exists(m)
     
-    # Remove empty tiles directory
+    # Remove empty tiles directory (rmdir itself refuses non-empty or missing directories)
     try:
-        if os.path.exists(tiles_dir) and not os.listdir(tiles_dir):
-            os.rmdir(tiles_dir)
-            logging.debug("Removed empty tiles directory")
-    except Exception as e:
-        logging.warning("Could not remove tiles directory: %s", str(e))
+        os.rmdir(tiles_dir)
+        logging.debug("Removed empty tiles directory")
+    except OSError as e:
+        # Missing, or still holds files we did not create
+        logging.debug("Kept tiles directory: %s", str(e))
     
     logging.info("Deleted %d individual tile files. Keeping mosaic and COG.", deleted_count)
     
@@ -1314,12 +1519,11 @@ def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon',
     
     # Save provenance
     prov_json = os.path.join(out_dir, "provenance.json")
-    with open(prov_json, "w") as f:
-        json.dump(provenance, f, indent=2, default=str)
+    _write_provenance(prov_json, provenance)
     
     # Manifest
     manifest_init()
-    prov_json_str = json.dumps(provenance, default=str)
+    prov_json_str = _provenance_json(provenance).decode("utf-8")
     manifest_append(year, month, mosaic_path, cog_path, tile_files, prov_json_str)
     
     # Generate PDF report
@@ -1349,4 +1553,11 @@ def process_month(geometry: Union[Tuple[float, float, float, float], 'Polygon',
         print(f"❌ Error generating PDF report: {str(e)}")
     
     logging.info("Completed %s - Mosaic: %s, COG: %s", month_start, mosaic_path, cog_path)
+    
+    # Mark the month finished so resumed runs skip it without reopening its log or outputs
+    try:
+        with open(os.path.join(out_dir, DONE_MARKER), "w") as f:
+            json.dump(_grid_signature(grid, sensors), f)
+    except OSError as e:
+        logging.warning("Could not write %s for %s-%02d: %s", DONE_MARKER, year, month, e)
 
@@ -9,11 +9,12 @@ import shutil
 import tempfile
 import zipfile
 import subprocess
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 import numpy as np
 import rasterio
 from rasterio.transform import from_origin
-from rasterio.warp import Resampling
+from rasterio.warp import Resampling, reproject, transform_bounds
+from rasterio.windows import Window, from_bounds, bounds as window_bounds
 from skimage.filters import threshold_otsu
 from skimage.morphology import remove_small_objects, binary_closing, disk
 try:
@@ -22,7 +23,8 @@ try:
 except ImportError:
     SCIPY_AVAILABLE = False
 
-from .config import TARGET_RES, MIN_WATER_AREA_PX, COG_OVERVIEWS
+from .config import TARGET_RES, MIN_WATER_AREA_PX, COG_OVERVIEWS, USABLE_CPUS
+from .utils import remove_file_if_exists
 
 
 def extract_and_merge_zip_tiffs(zip_path: str, out_tif: str) -> bool:
@@ -30,68 +32,53 @@ def extract_and_merge_zip_tiffs(zip_path: str, out_tif: str) -> bool:
     Extract single-band TIFF files from ZIP and merge into multi-band TIFF.
     GEE sometimes returns ZIP files containing multiple single-band TIFFs.
     Preserves band order based on expected band sequence.
+    Members are read in place through GDAL's /vsizip/ handler, so nothing is extracted to disk.
     """
     try:
-        extract_dir = tempfile.mkdtemp(prefix="gee_zip_extract_")
-        try:
-            # Extract ZIP file
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            
-            # Find all TIFF files in extracted directory
-            tiff_files = []
-            for root, dirs, files in os.walk(extract_dir):
-                for file in files:
-                    if file.lower().endswith('.tif') or file.lower().endswith('.tiff'):
-                        tiff_files.append(os.path.join(root, file))
-            
-            if not tiff_files:
-                logging.warning("No TIFF files found in ZIP archive")
-                return False
-            
-            # Expected band order (based on our selection: RGB, IR, water, vegetation indices)
-            band_order = ["B4", "B3", "B2", "B8", "B11", "B12", "MNDWI", "NDWI", 
-                         "NDVI", "EVI", "SAVI", "AVI", "FVI", "SR_B4", "SR_B3", "SR_B2", 
-                         "SR_B5", "SR_B6", "SR_B7"]
-            
-            def get_band_priority(filepath):
-                """Get priority for band ordering based on filename."""
-                filename = os.path.basename(filepath).upper()
-                for idx, band_name in enumerate(band_order):
-                    if band_name.upper() in filename:
-                        return idx
-                # If no match, use a high number to sort to end
-                return 9999
-            
-            # Sort files by band priority, then alphabetically
-            tiff_files.sort(key=lambda x: (get_band_priority(x), os.path.basename(x)))
-            
-            # Read all bands and merge into single multi-band TIFF
-            bands_data = []
-            profile = None
-            
-            for tiff_file in tiff_files:
-                with rasterio.open(tiff_file) as src:
-                    if profile is None:
-                        # Use first file's profile as template
-                        profile = src.profile.copy()
-                        profile.update(count=len(tiff_files))
-                    
-                    # Read band data
-                    band_data = src.read(1)  # Read first band
-                    bands_data.append(band_data)
-            
-            # Write merged multi-band TIFF
-            with rasterio.open(out_tif, 'w', **profile) as dst:
-                for band_idx, band_data in enumerate(bands_data, start=1):
-                    dst.write(band_data, band_idx)
-            
-            logging.debug(f"Extracted and merged {len(tiff_files)} bands from ZIP to {out_tif}")
-            return True
-            
-        finally:
-            # Clean up extraction directory
-            shutil.rmtree(extract_dir, ignore_errors=True)
+        # Find all TIFF members in the archive
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            tiff_members = [name for name in zip_ref.namelist()
+                            if name.lower().endswith('.tif') or name.lower().endswith('.tiff')]
+        
+        if not tiff_members:
+            logging.warning("No TIFF files found in ZIP archive")
+            return False
+        
+        # Expected band order (based on our selection: RGB, IR, water, vegetation indices)
+        band_order = ["B4", "B3", "B2", "B8", "B11", "B12", "MNDWI", "NDWI", 
+                     "NDVI", "EVI", "SAVI", "AVI", "FVI", "SR_B4", "SR_B3", "SR_B2", 
+                     "SR_B5", "SR_B6", "SR_B7"]
+        
+        def get_band_priority(member):
+            """Get priority for band ordering based on filename."""
+            filename = os.path.basename(member).upper()
+            for idx, band_name in enumerate(band_order):
+                if band_name.upper() in filename:
+                    return idx
+            # If no match, use a high number to sort to end
+            return 9999
+        
+        # Sort members by band priority, then alphabetically
+        tiff_members.sort(key=lambda x: (get_band_priority(x), os.path.basename(x)))
+        
+        # Curly braces delimit the archive path: GDAL otherwise splits it at a ".zip" extension,
+        # and the downloader's temp file is named "<tile>.tif.download"
+        archive = os.path.abspath(zip_path).replace("\\", "/")
+        member_paths = [f"/vsizip/{{{archive}}}/{member}" for member in tiff_members]
+        
+        # Use first member's profile as template
+        with rasterio.open(member_paths[0]) as src:
+            profile = src.profile.copy()
+        profile.update(count=len(member_paths))
+        
+        # Copy each band straight into the merged multi-band TIFF
+        with rasterio.open(out_tif, 'w', **profile) as dst:
+            for band_idx, member_path in enumerate(member_paths, start=1):
+                with rasterio.open(member_path) as src:
+                    dst.write(src.read(1), band_idx)  # Read first band
+        
+        logging.debug(f"Extracted and merged {len(member_paths)} bands from ZIP to {out_tif}")
+        return True
             
     except Exception as e:
         logging.warning(f"Error extracting ZIP file: {e}")
@@ -100,32 +87,48 @@ def extract_and_merge_zip_tiffs(zip_path: str, out_tif: str) -> bool:
         return False
 
 
+def _check_tile_file(path: str) -> str:
+    """Cheap on-disk checks before opening a GeoTIFF. Returns a failure reason, or "" if ok."""
+    if not os.path.exists(path):
+        return "file_not_found"
+    file_size = os.path.getsize(path)
+    if file_size == 0:
+        return "empty_file"
+    if file_size < 1024:  # Less than 1KB is suspicious
+        return "file_too_small"
+    return ""
+
+
+def _check_tile_dataset(src) -> str:
+    """Check an open dataset has valid dimensions and readable bands. Returns a failure reason, or "" if ok."""
+    if src.width == 0 or src.height == 0:
+        return "zero-dim"
+    if src.count == 0:
+        return "no_bands"
+    # Try reading a small sample from each band
+    for band_idx in range(1, min(src.count + 1, 5)):  # Check first 4 bands
+        try:
+            sample = src.read(band_idx, out_shape=(1, min(10, src.height), min(10, src.width)))
+            if sample.size == 0:
+                return f"band_{band_idx}_empty"
+        except Exception as e:
+            return f"band_{band_idx}_read_error: {str(e)}"
+    # Check CRS is valid
+    if src.crs is None:
+        logging.warning("GeoTIFF has no CRS information")
+    return ""
+
+
 def validate_geotiff_local(path: str) -> Tuple[bool, str]:
     """Validate GeoTIFF file is readable and has valid dimensions."""
     try:
-        if not os.path.exists(path):
-            return False, "file_not_found"
-        file_size = os.path.getsize(path)
-        if file_size == 0:
-            return False, "empty_file"
-        if file_size < 1024:  # Less than 1KB is suspicious
-            return False, "file_too_small"
+        reason = _check_tile_file(path)
+        if reason:
+            return False, reason
         with rasterio.open(path) as src:
-            if src.width == 0 or src.height == 0:
-                return False, "zero-dim"
-            if src.count == 0:
-                return False, "no_bands"
-            # Try reading a small sample from each band
-            for band_idx in range(1, min(src.count + 1, 5)):  # Check first 4 bands
-                try:
-                    sample = src.read(band_idx, out_shape=(1, min(10, src.height), min(10, src.width)))
-                    if sample.size == 0:
-                        return False, f"band_{band_idx}_empty"
-                except Exception as e:
-                    return False, f"band_{band_idx}_read_error: {str(e)}"
-            # Check CRS is valid
-            if src.crs is None:
-                logging.warning("GeoTIFF has no CRS information")
+            reason = _check_tile_dataset(src)
+            if reason:
+                return False, reason
         return True, ""
     except rasterio.errors.RasterioIOError as e:
         return False, f"io_error: {str(e)}"
@@ -133,17 +136,11 @@ def validate_geotiff_local(path: str) -> Tuple[bool, str]:
         return False, f"validation_error: {str(e)}"
 
 
-def compute_ndwi_mask_local(path: str, ndwi_index: int = -1, min_area_px: int = MIN_WATER_AREA_PX):
-    """Compute NDWI-based water mask from local GeoTIFF."""
-    with rasterio.open(path) as src:
-        arr = src.read().astype(np.float32)
-        meta = src.meta.copy()
-    if arr.shape[0] == 0:
-        raise RuntimeError("no bands")
-    ndwi = arr[ndwi_index]
+def _ndwi_water_mask(ndwi: np.ndarray, min_area_px: int = MIN_WATER_AREA_PX) -> np.ndarray:
+    """Threshold an NDWI band (Otsu) and clean it up into a uint8 water mask."""
     maxv = ndwi.max()
     if maxv > 2:
-        ndwi = ndwi / maxv
+        ndwi = np.divide(ndwi, maxv, out=ndwi)  # ndwi is a private float32 copy; scale in place
     try:
         flat = ndwi[~np.isnan(ndwi)]
         thresh = threshold_otsu(flat)
@@ -157,13 +154,53 @@ def compute_ndwi_mask_local(path: str, ndwi_index: int = -1, min_area_px: int =
     except TypeError:
         # Fallback for older scikit-image versions
         mask = binary_closing(mask, selem=disk(2))
-    return mask.astype(np.uint8), meta
+    return mask.astype(np.uint8)
+
+
+def _read_ndwi_band(src, ndwi_index: int) -> np.ndarray:
+    """Read only the NDWI band (python-style index into the band stack) as float32."""
+    if src.count == 0:
+        raise RuntimeError("no bands")
+    band_idx = range(1, src.count + 1)[ndwi_index]
+    return src.read(band_idx).astype(np.float32)
+
+
+def compute_ndwi_mask_local(path: str, ndwi_index: int = -1, min_area_px: int = MIN_WATER_AREA_PX):
+    """Compute NDWI-based water mask from local GeoTIFF."""
+    with rasterio.open(path) as src:
+        ndwi = _read_ndwi_band(src, ndwi_index)
+        meta = src.meta.copy()
+    return _ndwi_water_mask(ndwi, min_area_px), meta
+
+
+def validate_and_mask(path: str, ndwi_index: int = -1, min_area_px: int = MIN_WATER_AREA_PX):
+    """
+    Validate a downloaded GeoTIFF and compute its NDWI water mask with a single open of the file.
+    
+    Returns:
+        (valid: bool, reason: str, mask: Optional[np.ndarray], meta: Optional[dict])
+    """
+    try:
+        reason = _check_tile_file(path)
+        if reason:
+            return False, reason, None, None
+        with rasterio.open(path) as src:
+            reason = _check_tile_dataset(src)
+            if reason:
+                return False, reason, None, None
+            ndwi = _read_ndwi_band(src, ndwi_index)
+            meta = src.meta.copy()
+    except rasterio.errors.RasterioIOError as e:
+        return False, f"io_error: {str(e)}", None, None
+    except Exception as e:
+        return False, f"validation_error: {str(e)}", None, None
+    return True, "", _ndwi_water_mask(ndwi, min_area_px), meta
 
 
 def write_mask(mask_arr: np.ndarray, meta: dict, out_path: str):
-    """Write mask array to GeoTIFF file."""
+    """Write mask array to GeoTIFF file, bit-packed (NBITS=1) since values are 0/1."""
     m = meta.copy()
-    m.update(dtype=rasterio.uint8, count=1)
+    m.update(dtype=rasterio.uint8, count=1, nbits=1)
     with rasterio.open(out_path, "w", **m) as dst:
         dst.write(mask_arr[np.newaxis, :, :].astype(rasterio.uint8))
 
@@ -198,41 +235,130 @@ def compute_common_grid(tile_paths: List[str], target_res: int = TARGET_RES):
 
 def reproject_to_target(src_path: str, target_meta: dict, out_path: str):
     """
-    Reproject a tile to target grid. Memory-efficient: processes bands one at a time
-    to avoid loading entire dataset into memory.
+    Reproject a tile to target grid. Memory-efficient: a tile already in the grid's CRS is
+    resampled band by band over its own footprint only; otherwise GDAL's warper streams each
+    band block by block (bounded by warp_mem_limit) and spreads the work across all cores.
     """
-    with rasterio.open(src_path) as src:
-        dst_profile = src.profile.copy()
-        dst_profile.update({
-            "crs": target_meta["crs"], 
-            "transform": target_meta["transform"], 
-            "width": target_meta["width"], 
-            "height": target_meta["height"],
-            "compress": "LZW",
-            "tiled": True,
-            "blockxsize": 512,
-            "blockysize": 512
-        })
+    num_threads = USABLE_CPUS
+    with rasterio.Env(GDAL_CACHEMAX=512, CHECK_DISK_FREE_SPACE="NO"):
+        with rasterio.open(src_path) as src:
+            dst_profile = src.profile.copy()
+            dst_profile.update({
+                "crs": target_meta["crs"], 
+                "transform": target_meta["transform"], 
+                "width": target_meta["width"], 
+                "height": target_meta["height"],
+                "compress": "LZW",
+                "tiled": True,
+                "blockxsize": 512,
+                "blockysize": 512
+            })
+            
+            with rasterio.open(out_path, "w", **dst_profile) as dst:
+                if src.crs == target_meta["crs"]:
+                    # Same CRS: no warp needed. Only the grid window under the tile's footprint is
+                    # resampled, one band at a time; the rest of the grid is left as nodata
+                    grid_window = _grid_window(src_path, target_meta)
+                    if grid_window is not None:
+                        rows, cols = grid_window
+                        dst_window = Window(cols.start, rows.start, cols.stop - cols.start, rows.stop - rows.start)
+                        src_window = from_bounds(*window_bounds(dst_window, target_meta["transform"]),
+                                                 transform=src.transform)
+                        for band_idx in range(1, src.count + 1):
+                            data = src.read(
+                                band_idx,
+                                window=src_window,
+                                out_shape=(dst_window.height, dst_window.width),
+                                resampling=Resampling.cubic,
+                                boundless=True,
+                                fill_value=src.nodata if src.nodata is not None else 0
+                            )
+                            dst.write(data, band_idx, window=dst_window)
+                else:
+                    for band_idx in range(1, src.count + 1):
+                        warp_kwargs = dict(
+                            source=rasterio.band(src, band_idx),
+                            destination=rasterio.band(dst, band_idx),
+                            src_nodata=src.nodata,
+                            dst_nodata=src.nodata,
+                            num_threads=num_threads,
+                            warp_mem_limit=512,  # MB
+                        )
+                        try:
+                            # Try cubic resampling first for better quality
+                            reproject(resampling=Resampling.cubic, **warp_kwargs)
+                        except Exception:
+                            # Fallback to bilinear if cubic fails
+                            reproject(resampling=Resampling.bilinear, **warp_kwargs)
+
+
+def _valid_data_mask(arr_band: np.ndarray, nodata, out: np.ndarray, scratch: np.ndarray) -> np.ndarray:
+    """
+    Build the valid-pixel mask for a band into preallocated boolean buffers.
+    Each comparison is written with out= so no full-size temporaries are created per tile.
+    """
+    if nodata is not None:
+        np.not_equal(arr_band, nodata, out=out)
+        np.not_equal(arr_band, 0, out=scratch)
+        np.logical_and(out, scratch, out=out)
+    else:
+        # If no nodata, check for reasonable values
+        np.greater(arr_band, 0, out=out)
+    np.isfinite(arr_band, out=scratch)
+    np.logical_and(out, scratch, out=out)
+    return out
+
+
+# Cosine feather curve 0.5 * (1 + cos(pi * t)) sampled on [0, 1); indexed instead of calling np.cos per pixel
+_FEATHER_LUT_SIZE = 1024
+_FEATHER_LUT = (0.5 * (1.0 + np.cos(np.pi * np.arange(_FEATHER_LUT_SIZE, dtype=np.float32) / _FEATHER_LUT_SIZE))).astype(np.float32)
+
+
+def _feather_weight(tile_h: int, tile_w: int, feather_px: int) -> np.ndarray:
+    """
+    Create the distance-based feather weight mask for a tile of the given shape.
+    Pixels within feather_px of an edge are ramped down along a cosine curve looked up from _FEATHER_LUT.
+    """
+    weight = np.ones((tile_h, tile_w), dtype=np.float32)
+    
+    # Only apply feathering if tile is larger than feather region
+    if tile_h > feather_px * 2 and tile_w > feather_px * 2:
+        # Create distance arrays for smoother feathering
+        y_coords, x_coords = np.ogrid[:tile_h, :tile_w]
+        
+        # Find minimum distance to any edge
+        dist_to_edge = np.minimum(
+            np.minimum(x_coords, tile_w - 1 - x_coords),
+            np.minimum(y_coords, tile_h - 1 - y_coords)
+        )
         
-        # Memory-efficient: process bands one at a time instead of loading all at once
-        # This prevents memory errors for large tiles
-        with rasterio.open(out_path, "w", **dst_profile) as dst:
-            for band_idx in range(1, src.count + 1):
-                try:
-                    # Try cubic resampling first for better quality
-                    data = src.read(
-                        band_idx,
-                        out_shape=(target_meta["height"], target_meta["width"]), 
-                        resampling=Resampling.cubic
-                    )
-                except Exception:
-                    # Fallback to bilinear if cubic fails
-                    data = src.read(
-                        band_idx,
-                        out_shape=(target_meta["height"], target_meta["width"]), 
-                        resampling=Resampling.bilinear
-                    )
-                dst.write(data, band_idx)
+        mask = dist_to_edge < feather_px
+        if np.any(mask):
+            # dist_to_edge < feather_px, so the index stays below _FEATHER_LUT_SIZE
+            idx = (dist_to_edge[mask] * _FEATHER_LUT_SIZE) // feather_px
+            weight[mask] = _FEATHER_LUT[idx]
+    return weight
+
+
+def _grid_window(src_path: str, grid: dict, pad_px: int = 2) -> Optional[Tuple[slice, slice]]:
+    """
+    Rows/cols of the common grid covered by a source tile's footprint, or None if it misses the grid.
+    Padded by a couple of pixels to cover resampling kernel spill at the tile edge.
+    """
+    with rasterio.open(src_path) as src:
+        left, bottom, right, top = src.bounds
+        if src.crs != grid["crs"]:
+            left, bottom, right, top = transform_bounds(src.crs, grid["crs"], left, bottom, right, top, densify_pts=21)
+    inv = ~grid["transform"]
+    c0, r0 = inv * (left, top)
+    c1, r1 = inv * (right, bottom)
+    row_start = max(0, int(math.floor(min(r0, r1))) - pad_px)
+    row_stop = min(grid["height"], int(math.ceil(max(r0, r1))) + pad_px)
+    col_start = max(0, int(math.floor(min(c0, c1))) - pad_px)
+    col_stop = min(grid["width"], int(math.ceil(max(c0, c1))) + pad_px)
+    if row_start >= row_stop or col_start >= col_stop:
+        return None
+    return slice(row_start, row_stop), slice(col_start, col_stop)
 
 
 def feather_and_merge(tile_paths: List[str], out_path: str, feather_px: int = 50, progress_callback=None):
@@ -256,6 +382,9 @@ def feather_and_merge(tile_paths: List[str], out_path: str, feather_px: int = 50
     grid = compute_common_grid(tile_paths)
     tmpdir = tempfile.mkdtemp(prefix="deadsea_reproj_")
     reprojected = []
+    tile_windows = []
+    datasets = []
+    numerator = denominator = None
     
     try:
         # Reproject all tiles to common grid
@@ -268,6 +397,7 @@ def feather_and_merge(tile_paths: List[str], out_path: str, feather_px: int = 50
             outp = os.path.join(tmpdir, f"reproj_{i}.tif")
             reproject_to_target(p, grid, outp)
             reprojected.append(outp)
+            tile_windows.append(_grid_window(p, grid))
             if pbar_reproj:
                 pbar_reproj.update(1)
             if progress_callback:
@@ -280,7 +410,8 @@ def feather_and_merge(tile_paths: List[str], out_path: str, feather_px: int = 50
         if progress_callback:
             progress_callback(num_tiles, num_tiles, "Opening reprojected tiles...")
         logging.info("Opening reprojected tiles...")
-        datasets = [rasterio.open(p) for p in reprojected]
+        for p in reprojected:
+            datasets.append(rasterio.open(p))
         count = datasets[0].count
         out_h = grid["height"]
         out_w = grid["width"]
@@ -300,7 +431,9 @@ def feather_and_merge(tile_paths: List[str], out_path: str, feather_px: int = 50
             "blockxsize": 512, 
             "blockysize": 512, 
             "bigtiff": "IF_SAFER",
-            "nodata": nodata
+            "nodata": nodata,
+            # Compress output blocks on all cores
+            "num_threads": "ALL_CPUS"
         })
         
         # Process band by band for memory efficiency
@@ -309,150 +442,162 @@ def feather_and_merge(tile_paths: List[str], out_path: str, feather_px: int = 50
         else:
             pbar_bands = None
         
-        mosaic_bands = []
-        for band_idx in range(1, count + 1):
-            band_name = f"Band {band_idx}"
-            if progress_callback:
-                progress_callback(band_idx, count, f"Processing {band_name}: {band_idx}/{count}")
-            
-            # Initialize accumulation arrays
-            numerator = np.zeros((out_h, out_w), dtype=np.float64)
-            denominator = np.zeros((out_h, out_w), dtype=np.float64)
-            
-            # Process each tile
-            for i, ds in enumerate(datasets):
-                # Read band data
-                arr_band = ds.read(band_idx).astype(np.float32)  # (h, w)
+        # Feather weights depend only on the footprint shape, so build each shape once
+        weights_by_shape = {}
+
+        # Reusable mask buffers (all reprojected tiles share the output grid shape)
+        valid_mask = np.empty((out_h, out_w), dtype=np.bool_)
+        mask_scratch = np.empty((out_h, out_w), dtype=np.bool_)
+
+        # Accumulators live in file-backed memmaps under tmpdir so the OS can page them out
+        # for mosaics larger than RAM; they are reused (zeroed) for every band
+        numerator = np.memmap(os.path.join(tmpdir, "feather_num.dat"), dtype=np.float32, mode="w+", shape=(out_h, out_w))
+        denominator = np.memmap(os.path.join(tmpdir, "feather_den.dat"), dtype=np.float32, mode="w+", shape=(out_h, out_w))
+
+        # Stream each finished band straight to disk so peak memory stays at one band
+        with rasterio.open(out_path, "w", **out_meta) as dst:
+            for band_idx in range(1, count + 1):
+                band_name = f"Band {band_idx}"
+                if progress_callback:
+                    progress_callback(band_idx, count, f"Processing {band_name}: {band_idx}/{count}")
+            
+                # Reset accumulation arrays
+                numerator[:] = 0
+                denominator[:] = 0
+            
+                # Process each tile
+                for i, ds in enumerate(datasets):
+                    # Tiles whose footprint misses the grid contribute nothing
+                    if tile_windows[i] is None:
+                        continue
+                    rows, cols = tile_windows[i]
                 
-                # Create valid data mask (handle nodata)
-                if nodata is not None:
-                    valid_mask = (arr_band != nodata) & (arr_band != 0) & np.isfinite(arr_band)
-                else:
-                    # If no nodata, check for reasonable values
-                    valid_mask = (arr_band > 0) & np.isfinite(arr_band)
+                    # Read band data within the tile footprint only
+                    arr_band = ds.read(band_idx, window=Window.from_slices(rows, cols)).astype(np.float32)  # (h, w)
                 
-                # Create distance-based feather weight mask
-                tile_h, tile_w = arr_band.shape
-                weight = np.ones((tile_h, tile_w), dtype=np.float32)
+                    # Create valid data mask (handle nodata)
+                    tile_valid = _valid_data_mask(arr_band, nodata, valid_mask[rows, cols], mask_scratch[rows, cols])
+                    if not tile_valid.any():
+                        continue
                 
-                # Only apply feathering if tile is larger than feather region
-                if tile_h > feather_px * 2 and tile_w > feather_px * 2:
-                    # Create distance arrays for smoother feathering
-                    y_coords, x_coords = np.ogrid[:tile_h, :tile_w]
-                    
-                    # Calculate distances to edges
-                    dist_left = x_coords.astype(np.float32)
-                    dist_right = (tile_w - 1 - x_coords).astype(np.float32)
-                    dist_top = y_coords.astype(np.float32)
-                    dist_bottom = (tile_h - 1 - y_coords).astype(np.float32)
-                    
-                    # Find minimum distance to any edge
-                    dist_to_edge = np.minimum(
-                        np.minimum(dist_left, dist_right),
-                        np.minimum(dist_top, dist_bottom)
-                    )
-                    
-                    # Apply cosine-based feathering for smoother transition
-                    mask = dist_to_edge < feather_px
-                    if np.any(mask):
-                        # Cosine curve: weight = 0.5 * (1 + cos(π * d / feather_px))
-                        feather_dist = dist_to_edge[mask] / feather_px
-                        weight[mask] = 0.5 * (1.0 + np.cos(np.pi * feather_dist))
+                    # Create distance-based feather weight mask for the footprint
+                    tile_shape = arr_band.shape
+                    weight = weights_by_shape.get(tile_shape)
+                    if weight is None:
+                        weight = weights_by_shape[tile_shape] = _feather_weight(tile_shape[0], tile_shape[1], feather_px)
                 
-                # Combine weight with valid data mask
-                final_weight = weight * valid_mask.astype(np.float32)
+                    # Combine weight with valid data mask
+                    final_weight = weight * tile_valid
                 
-                # Accumulate weighted values
-                numerator += (arr_band * final_weight).astype(np.float64)
-                denominator += final_weight.astype(np.float64)
+                    # Accumulate weighted values
+                    numerator[rows, cols] += arr_band * final_weight
+                    denominator[rows, cols] += final_weight
                 
-                # Update progress for tiles within band
-                if progress_callback and (i + 1) % 100 == 0:  # Update every 100 tiles
-                    progress_callback(i + 1, num_tiles, f"Blending {band_name}: tile {i+1}/{num_tiles}")
-            
-            # Normalize by sum of weights (avoid division by zero)
-            mask_valid = denominator > 0
-            mosaic_band = np.zeros((out_h, out_w), dtype=dtype)
-            
-            if np.any(mask_valid):
-                mosaic_band[mask_valid] = (numerator[mask_valid] / denominator[mask_valid]).astype(dtype)
-            
-            # INTERPOLATION: Fill missing bands (zeros) from neighboring tiles
-            # This helps when a tile is missing IR bands but neighbors have them
-            if SCIPY_AVAILABLE and np.any(~mask_valid) and band_idx > 3:  # Only interpolate IR bands and indices (bands 4+), not RGB
-                # Find pixels that are zero/missing but have valid neighbors
-                missing_mask = ~mask_valid
+                    # Update progress for tiles within band
+                    if progress_callback and (i + 1) % 100 == 0:  # Update every 100 tiles
+                        progress_callback(i + 1, num_tiles, f"Blending {band_name}: tile {i+1}/{num_tiles}")
+            
+                # Normalize by sum of weights (avoid division by zero)
+                # Single masked divide into the output buffer (no fancy-index gathers)
+                mask_valid = denominator > 0
+                mosaic_f32 = np.zeros((out_h, out_w), dtype=np.float32)
+                np.divide(numerator, denominator, out=mosaic_f32, where=mask_valid)
+                mosaic_band = mosaic_f32.astype(dtype, copy=False)
+                del mosaic_f32
+            
+                # INTERPOLATION: Fill missing bands (zeros) from neighboring tiles
+                # This helps when a tile is missing IR bands but neighbors have them
+                if SCIPY_AVAILABLE and np.any(~mask_valid) and band_idx > 3:  # Only interpolate IR bands and indices (bands 4+), not RGB
+                    # Find pixels that are zero/missing but have valid neighbors
+                    missing_mask = ~mask_valid
                 
-                # Dilate valid pixels to find nearby valid data
-                # Use a 5-pixel radius for interpolation (about 25m at 5m resolution)
-                dilated_valid = binary_dilation(mask_valid, structure=np.ones((5, 5)))
-                interpolation_candidates = missing_mask & dilated_valid
+                    # Dilate valid pixels to find nearby valid data
+                    # Use a 5-pixel radius for interpolation (about 25m at 5m resolution)
+                    dilated_valid = binary_dilation(mask_valid, structure=np.ones((5, 5)))
+                    interpolation_candidates = missing_mask & dilated_valid
                 
-                if np.any(interpolation_candidates):
-                    # For each missing pixel, find nearest valid pixel and use its value
-                    # Use distance transform to find closest valid pixel
-                    dist_to_valid = distance_transform_edt(~mask_valid)
+                    if np.any(interpolation_candidates):
+                        # For each missing pixel, find nearest valid pixel and use its value
+                        # Use distance transform to find closest valid pixel
+                        dist_to_valid = distance_transform_edt(~mask_valid)
                     
-                    # Only interpolate if within reasonable distance (20 pixels = 100m)
-                    max_interp_dist = 20
-                    can_interpolate = (dist_to_valid <= max_interp_dist) & missing_mask
+                        # Only interpolate if within reasonable distance (20 pixels = 100m)
+                        max_interp_dist = 20
+                        can_interpolate = (dist_to_valid <= max_interp_dist) & missing_mask
                     
-                    if np.any(can_interpolate):
-                        # For each pixel to interpolate, find the closest valid pixel
-                        # Simple approach: use the value from the nearest valid neighbor
-                        # More sophisticated: could use inverse distance weighting
-                        for y, x in zip(*np.where(can_interpolate)):
-                            # Find nearest valid pixel using distance transform
-                            # Get a small window around this pixel
-                            y_min = max(0, y - max_interp_dist)
-                            y_max = min(out_h, y + max_interp_dist + 1)
-                            x_min = max(0, x - max_interp_dist)
-                            x_max = min(out_w, x + max_interp_dist + 1)
+                        if np.any(can_interpolate):
+                            # For each pixel to interpolate, find the closest valid pixel
+                            # Simple approach: use the value from the nearest valid neighbor
+                            # More sophisticated: could use inverse distance weighting
+                            for y, x in zip(*np.where(can_interpolate)):
+                                # Find nearest valid pixel using distance transform
+                                # Get a small window around this pixel
+                                y_min = max(0, y - max_interp_dist)
+                                y_max = min(out_h, y + max_interp_dist + 1)
+                                x_min = max(0, x - max_interp_dist)
+                                x_max = min(out_w, x + max_interp_dist + 1)
                             
-                            window = mask_valid[y_min:y_max, x_min:x_max]
-                            if np.any(window):
-                                # Get valid pixels in window
-                                valid_y, valid_x = np.where(window)
-                                valid_y += y_min
-                                valid_x += x_min
+                                window = mask_valid[y_min:y_max, x_min:x_max]
+                                if np.any(window):
+                                    # Get valid pixels in window
+                                    valid_y, valid_x = np.where(window)
+                                    valid_y += y_min
+                                    valid_x += x_min
                                 
-                                # Find closest valid pixel
-                                distances = np.sqrt((valid_y - y)**2 + (valid_x - x)**2)
-                                closest_idx = np.argmin(distances)
+                                    # Find closest valid pixel
+                                    distances = np.sqrt((valid_y - y)**2 + (valid_x - x)**2)
+                                    closest_idx = np.argmin(distances)
                                 
-                                # Use value from closest valid pixel
-                                closest_y, closest_x = valid_y[closest_idx], valid_x[closest_idx]
-                                mosaic_band[y, x] = mosaic_band[closest_y, closest_x]
-                                mask_valid[y, x] = True  # Mark as valid after interpolation
+                                    # Use value from closest valid pixel
+                                    closest_y, closest_x = valid_y[closest_idx], valid_x[closest_idx]
+                                    mosaic_band[y, x] = mosaic_band[closest_y, closest_x]
+                                    mask_valid[y, x] = True  # Mark as valid after interpolation
             
-            # Set nodata where no valid data (and couldn't be interpolated)
-            if nodata is not None:
-                mosaic_band[~mask_valid] = nodata
-            else:
-                mosaic_band[~mask_valid] = 0
+                # Set nodata where no valid data (and couldn't be interpolated)
+                if nodata is not None:
+                    mosaic_band[~mask_valid] = nodata
+                else:
+                    mosaic_band[~mask_valid] = 0
             
-            mosaic_bands.append(mosaic_band)
-            if pbar_bands:
-                pbar_bands.update(1)
+                # Write this band immediately and release its buffers
+                dst.write(mosaic_band, band_idx)
+                del mosaic_band, mask_valid
+                if pbar_bands:
+                    pbar_bands.update(1)
         
         if pbar_bands:
             pbar_bands.close()
         
-        # Stack bands and write
         if progress_callback:
-            progress_callback(count, count, "Writing mosaic file...")
-        logging.info("Writing mosaic file...")
-        mosaic = np.stack(mosaic_bands, axis=0)
-        with rasterio.open(out_path, "w", **out_meta) as dst:
-            dst.write(mosaic)
-        
-        for ds in datasets: 
-            ds.close()
+            progress_callback(count, count, "Mosaic file written")
+        logging.info("Mosaic file written: %s", out_path)
     finally:
+        # Release the memmaps and tile handles on every path: open files under tmpdir cannot be
+        # deleted on Windows, and rmtree(ignore_errors=True) would silently leave them behind
+        numerator = denominator = None
+        for ds in datasets:
+            ds.close()
         shutil.rmtree(tmpdir, ignore_errors=True)
     return out_path
 
 
+def _normalized_difference(a: np.ndarray, b: np.ndarray, valid_mask: np.ndarray, nodata,
+                           extra_valid: np.ndarray = None) -> np.ndarray:
+    """
+    (a - b) / (a + b) where valid_mask (and extra_valid) hold and a + b > 0, nodata elsewhere.
+    Uses whole-array ufuncs with out=/where= instead of boolean gathers and scatters.
+    """
+    denominator = a + b
+    valid = np.greater(denominator, 0)
+    np.logical_and(valid, valid_mask, out=valid)
+    if extra_valid is not None:
+        np.logical_and(valid, extra_valid, out=valid)
+    numerator = np.subtract(a, b)
+    out = np.full(a.shape, nodata, dtype=np.float32)
+    np.divide(numerator, denominator, out=out, where=valid)
+    return out
+
+
 def add_indices_to_mosaic_local(mosaic_path: str, progress_callback=None) -> str:
     """
     Calculate vegetation and water indices locally from the stitched mosaic.
@@ -513,11 +658,7 @@ def add_indices_to_mosaic_local(mosaic_path: str, progress_callback=None) -> str
             if progress_callback:
                 progress_callback(2, 8, "Calculating NDVI...")
             logging.debug("Calculating NDVI...")
-            ndvi = np.zeros_like(b4, dtype=np.float32)
-            denominator = b8 + b4
-            valid_ndvi = valid_mask & (denominator > 0)
-            ndvi[valid_ndvi] = (b8[valid_ndvi] - b4[valid_ndvi]) / denominator[valid_ndvi]
-            ndvi[~valid_ndvi] = nodata
+            ndvi = _normalized_difference(b8, b4, valid_mask, nodata)
             indices.append(("NDVI", ndvi))
             idx_count += 1
             
@@ -525,24 +666,17 @@ def add_indices_to_mosaic_local(mosaic_path: str, progress_callback=None) -> str
             if progress_callback:
                 progress_callback(3, 8, "Calculating NDWI...")
             logging.debug("Calculating NDWI...")
-            ndwi = np.zeros_like(b3, dtype=np.float32)
-            denominator = b3 + b8
-            valid_ndwi = valid_mask & (denominator > 0)
-            ndwi[valid_ndwi] = (b3[valid_ndwi] - b8[valid_ndwi]) / denominator[valid_ndwi]
-            ndwi[~valid_ndwi] = nodata
+            ndwi = _normalized_difference(b3, b8, valid_mask, nodata)
             indices.append(("NDWI", ndwi))
             idx_count += 1
             
             # MNDWI: (Green - SWIR1) / (Green + SWIR1)
-            if np.any(b11 > 0):
+            b11_valid = b11 > 0
+            if np.any(b11_valid):
                 if progress_callback:
                     progress_callback(4, 8, "Calculating MNDWI...")
                 logging.debug("Calculating MNDWI...")
-                mndwi = np.zeros_like(b3, dtype=np.float32)
-                denominator = b3 + b11
-                valid_mndwi = valid_mask & (denominator > 0) & (b11 > 0)
-                mndwi[valid_mndwi] = (b3[valid_mndwi] - b11[valid_mndwi]) / denominator[valid_mndwi]
-                mndwi[~valid_mndwi] = nodata
+                mndwi = _normalized_difference(b3, b11, valid_mask, nodata, extra_valid=b11_valid)
                 indices.append(("MNDWI", mndwi))
                 idx_count += 1
             
@@ -572,15 +706,11 @@ def add_indices_to_mosaic_local(mosaic_path: str, progress_callback=None) -> str
             idx_count += 1
             
             # FVI: Floating Vegetation Index (NIR - SWIR1) / (NIR + SWIR1)
-            if np.any(b11 > 0):
+            if np.any(b11_valid):
                 if progress_callback:
                     progress_callback(7, 8, "Calculating FVI...")
                 logging.debug("Calculating FVI...")
-                fvi = np.zeros_like(b8, dtype=np.float32)
-                denominator = b8 + b11
-                valid_fvi = valid_mask & (denominator > 0) & (b11 > 0)
-                fvi[valid_fvi] = (b8[valid_fvi] - b11[valid_fvi]) / denominator[valid_fvi]
-                fvi[~valid_fvi] = nodata
+                fvi = _normalized_difference(b8, b11, valid_mask, nodata, extra_valid=b11_valid)
                 indices.append(("FVI", fvi))
                 idx_count += 1
             
@@ -654,21 +784,19 @@ def add_indices_to_mosaic_local(mosaic_path: str, progress_callback=None) -> str
         import traceback
         logging.debug(traceback.format_exc())
         # Clean up temp file if it exists
-        tmp_path = mosaic_path + ".with_indices.tif"
-        if os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
+        remove_file_if_exists(mosaic_path + ".with_indices.tif")
         return mosaic_path
 
 
 def create_cog(in_tif: str, out_cog: str):
     """Create Cloud-Optimized GeoTIFF (COG) from input GeoTIFF."""
     tmp = out_cog + ".tmp.tif"
-    cmd = ["gdal_translate", in_tif, tmp, "-of", "COG", "-co", "COMPRESS=LZW", "-co", "BLOCKSIZE=512"]
+    # Multi-threaded block compression and overview resampling
+    threads = ["--config", "GDAL_NUM_THREADS", "ALL_CPUS"]
+    cmd = ["gdal_translate", in_tif, tmp, "-of", "COG", "-co", "COMPRESS=LZW", "-co", "BLOCKSIZE=512",
+           "-co", "NUM_THREADS=ALL_CPUS"] + threads
     subprocess.run(cmd, check=True)
-    cmd2 = ["gdaladdo", "-r", "average", tmp] + [str(x) for x in COG_OVERVIEWS]
+    cmd2 = ["gdaladdo", "-r", "average"] + threads + [tmp] + [str(x) for x in COG_OVERVIEWS]
     subprocess.run(cmd2, check=True)
     os.replace(tmp, out_cog)
     return out_cog
@@ -4,6 +4,7 @@ Stores settings persistently on C: drive (or user's AppData).
 """
 import os
 import json
+import time
 import logging
 from pathlib import Path
 
@@ -15,23 +16,36 @@ else:
 
 SETTINGS_FILE = SETTINGS_DIR / 'settings.json'
 
+# Parameters of the last submitted run, replayed with --repeat
+LAST_RUN_FILE = SETTINGS_DIR / 'last_run.json'
+LAST_RUN_MAX_AGE_DAYS = 30  # Older saved runs are ignored and the GUI opens instead
+
 # Ensure settings directory exists
 SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Last parsed settings file, reused while its mtime is unchanged
+_cache = {'mtime_ns': None, 'data': None}
+
 
 def load_settings():
-    """Load settings from persistent storage."""
-    if not SETTINGS_FILE.exists():
-        return {}
-    
+    """Load settings from persistent storage (cached until the file changes)."""
     try:
-        with open(SETTINGS_FILE, 'r') as f:
-            settings = json.load(f)
-        logging.info(f"Settings loaded from {SETTINGS_FILE}")
-        return settings
-    except Exception as e:
-        logging.warning(f"Failed to load settings: {e}")
+        mtime_ns = SETTINGS_FILE.stat().st_mtime_ns
+    except OSError:
         return {}
+    
+    if _cache['mtime_ns'] != mtime_ns:
+        try:
+            with open(SETTINGS_FILE, 'r') as f:
+                settings = json.load(f)
+            logging.info(f"Settings loaded from {SETTINGS_FILE}")
+        except Exception as e:
+            logging.warning(f"Failed to load settings: {e}")
+            return {}
+        _cache['mtime_ns'] = mtime_ns
+        _cache['data'] = settings
+    # Callers may modify the returned dict (save_settings does)
+    return dict(_cache['data'])
 
 
 def save_settings(service_account_key: str = None, project_id: str = None, 
@@ -90,6 +104,8 @@ def save_settings(service_account_key: str = None, project_id: str = None,
     try:
         with open(SETTINGS_FILE, 'w') as f:
             json.dump(settings, f, indent=2)
+        # Force a re-read: a rewrite within the filesystem's mtime granularity keeps the old mtime
+        _cache['mtime_ns'] = None
         logging.info(f"Settings saved to {SETTINGS_FILE}")
         return True
     except Exception as e:
@@ -97,6 +113,34 @@ def save_settings(service_account_key: str = None, project_id: str = None,
         return False
 
 
+def load_last_run(max_age_days: float = LAST_RUN_MAX_AGE_DAYS):
+    """Load the last submitted run parameters, or None if missing, unreadable, or stale."""
+    try:
+        age_s = time.time() - LAST_RUN_FILE.stat().st_mtime
+    except OSError:
+        return None
+    if age_s > max_age_days * 86400:
+        logging.info(f"Last run parameters in {LAST_RUN_FILE} are older than {max_age_days} days, ignoring")
+        return None
+    try:
+        with open(LAST_RUN_FILE, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"Failed to load last run parameters: {e}")
+        return None
+
+
+def save_last_run(run: dict):
+    """Save the submitted run parameters for --repeat."""
+    try:
+        with open(LAST_RUN_FILE, 'w') as f:
+            json.dump(run, f, indent=2)
+        return True
+    except Exception as e:
+        logging.warning(f"Failed to save last run parameters: {e}")
+        return False
+
+
 def get_service_account_key():
     """Get service account key path from settings."""
     settings = load_settings()
@@ -117,6 +161,7 @@ def clear_settings():
     try:
         if SETTINGS_FILE.exists():
             SETTINGS_FILE.unlink()
+        _cache['mtime_ns'] = None
         logging.info("Settings cleared")
         return True
     except Exception as e:
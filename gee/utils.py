@@ -6,10 +6,13 @@ import json
 import os
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Tuple, Optional, Union, List, Dict
+import numpy as np
 import pyproj
 from shapely.geometry import box, shape, Polygon, GeometryCollection
 from shapely.ops import transform as shp_transform
+from shapely.prepared import prep
 
 try:
     import fiona
@@ -21,8 +24,23 @@ except ImportError:
 from .config import SAFE_DOWNLOAD_SIZE_BYTES
 
 
+def remove_file_if_exists(path: str) -> bool:
+    """
+    Delete a file without a preceding exists() check (one syscall instead of two).
+    Returns True if the file was removed, False if it was already gone or could not be deleted.
+    """
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logging.warning("Failed to delete %s: %s", path, e)
+        return False
+
+
 def month_ranges(start_iso: str, end_iso: str):
-    """Generate month ranges between start and end dates."""
+    """Generate (year, month, first_day_iso, last_day_iso) for each month between start and end dates."""
     s = datetime.fromisoformat(start_iso)
     e = datetime.fromisoformat(end_iso)
     cur = datetime(s.year, s.month, 1)
@@ -30,7 +48,7 @@ def month_ranges(start_iso: str, end_iso: str):
     while cur <= end_month:
         nxt = (cur.replace(day=28) + timedelta(days=4)).replace(day=1)
         last = nxt - timedelta(days=1)
-        yield cur.date().isoformat(), last.date().isoformat()
+        yield cur.year, cur.month, cur.date().isoformat(), last.date().isoformat()
         cur = nxt
 
 
@@ -158,26 +176,38 @@ def make_utm_tiles(geometry: Union[Tuple[float, float, float, float], Polygon, D
     tiles = []
     tiles_intersecting = 0
     
+    # Grid line positions in UTM, shared by every row/column of tiles
+    xs = minx + np.arange(nx + 1) * (width_m / nx)
+    ys = miny + np.arange(ny + 1) * (height_m / ny)
+    
+    if is_bbox:
+        # Transform every grid node to WGS84 in one call, then take each tile's
+        # (lon_min, lat_min, lon_max, lat_max) over its four corners -> (nx, ny, 4)
+        node_lon, node_lat = to_wgs(*np.meshgrid(xs, ys, indexing="ij"))
+        node_lon = np.asarray(node_lon)
+        node_lat = np.asarray(node_lat)
+        corner_lon = np.stack([node_lon[:-1, :-1], node_lon[1:, :-1], node_lon[:-1, 1:], node_lon[1:, 1:]])
+        corner_lat = np.stack([node_lat[:-1, :-1], node_lat[1:, :-1], node_lat[:-1, 1:], node_lat[1:, 1:]])
+        tile_bounds = np.stack([corner_lon.min(axis=0), corner_lat.min(axis=0),
+                                corner_lon.max(axis=0), corner_lat.max(axis=0)], axis=-1)
+    
+    poly_utm_prepared = prep(poly_utm)
+    
     # Generate grid of tiles and filter/clip to polygon
     for i in range(nx):
         for j in range(ny):
-            x0 = minx + i * width_m / nx
-            x1 = minx + (i + 1) * width_m / nx
-            y0 = miny + j * height_m / ny
-            y1 = miny + (j + 1) * height_m / ny
-            tile_utm = box(x0, y0, x1, y1)
+            tile_utm = box(xs[i], ys[j], xs[i + 1], ys[j + 1])
             
             # Check if tile intersects with polygon
-            if not tile_utm.intersects(poly_utm):
+            if not poly_utm_prepared.intersects(tile_utm):
                 continue  # Skip tiles that don't intersect
             
             tiles_intersecting += 1
             
             if is_bbox:
                 # For bbox, just return the bounds (no clipping needed)
-                tile_wgs = shp_transform(to_wgs, tile_utm)
                 tiles.append({
-                    'bounds': tile_wgs.bounds,
+                    'bounds': tuple(tile_bounds[i, j].tolist()),
                     'geometry': None,
                     'is_clipped': False
                 })
@@ -215,6 +245,7 @@ def make_utm_tiles(geometry: Union[Tuple[float, float, float, float], Polygon, D
     return tiles
 
 
+@lru_cache(maxsize=512)
 def is_satellite_operational(satellite_name: str, start: str, end: str) -> bool:
     """
     Check if a satellite was operational during the requested date range.
@@ -398,8 +429,7 @@ def geojson_string_to_shapefile(geojson_str: str, shapefile_path: str) -> bool:
             return result
         finally:
             # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+            remove_file_if_exists(tmp_path)
                 
     except Exception as e:
         logging.error(f"Error converting GeoJSON string to shapefile: {e}")
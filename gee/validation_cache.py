@@ -0,0 +1,70 @@
+"""
+Persistent cache of GeoTIFF validation results for resuming interrupted runs.
+"""
+import os
+import sqlite3
+import logging
+from contextlib import closing
+from typing import Optional, Tuple
+
+VALIDATION_CACHE_DB = "validation_cache.db"
+
+# Seconds a worker waits for another worker's write to the database to finish
+_BUSY_TIMEOUT = 10.0
+
+
+def validation_cache_path(tiles_dir: str) -> str:
+    """Cache database for a month's tiles, kept next to (not inside) the tiles directory."""
+    return os.path.join(os.path.dirname(os.path.normpath(tiles_dir)), VALIDATION_CACHE_DB)
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """
+    Open the cache database for one lookup or update; callers close it (closing()), so no
+    handle outlives the call. Tile files are named by month and tile index only, so entries
+    also record the key (tile bounds + grid signature) the file was produced for.
+    """
+    conn = sqlite3.connect(db_path, timeout=_BUSY_TIMEOUT)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS tile_validation ("
+        "path TEXT PRIMARY KEY, tile_key TEXT, mtime_ns INTEGER, size INTEGER, valid INTEGER, reason TEXT)"
+    )
+    return conn
+
+
+def lookup_validation(db_path: str, path: str, tile_key: str) -> Optional[Tuple[bool, str]]:
+    """
+    Get the cached (valid, reason) for a file, or None if the file is missing, was never
+    validated, was produced for a different tile_key, or has changed (mtime/size) since.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    try:
+        with closing(_connect(db_path)) as conn:
+            row = conn.execute(
+                "SELECT valid, reason FROM tile_validation "
+                "WHERE path=? AND tile_key=? AND mtime_ns=? AND size=?",
+                (path, tile_key, st.st_mtime_ns, st.st_size)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logging.debug(f"Validation cache lookup failed for {path}: {e}")
+        return None
+    if row is None:
+        return None
+    return bool(row[0]), row[1] or ""
+
+
+def record_validation(db_path: str, path: str, tile_key: str, valid: bool, reason: str = ""):
+    """Store the validation result for a file, produced for tile_key, at its current mtime/size."""
+    try:
+        st = os.stat(path)
+        with closing(_connect(db_path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tile_validation (path, tile_key, mtime_ns, size, valid, reason) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, tile_key, st.st_mtime_ns, st.st_size, int(valid), reason)
+            )
+    except (OSError, sqlite3.Error) as e:
+        logging.debug(f"Validation cache update failed for {path}: {e}")
@@ -9,6 +9,22 @@ import webbrowser
 import shutil
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_bytes(obj, indent: bool = False) -> bytes:
+    """Serialize stats to UTF-8 JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
 
 class SatelliteHistogram:
     """Lightweight HTML-based histogram showing satellite usage across tiles."""
@@ -54,7 +70,7 @@ class SatelliteHistogram:
             }
         
         # Embed data as JSON in the HTML
-        data_json = json.dumps(data)
+        data_json = _json_bytes(data).decode("utf-8")
         html_content = """<!DOCTYPE html>
 <html>
 <head>
@@ -626,8 +642,8 @@ class SatelliteHistogram:
                 "last_update": datetime.utcnow().isoformat()
             }
             # Update JSON file
-            with open(self.json_path, 'w', encoding='utf-8') as f:
-                json.dump(stats, f, indent=2)
+            with open(self.json_path, 'wb') as f:
+                f.write(_json_bytes(stats, indent=True))
             # Regenerate HTML with fresh embedded data (ensures it works even if XMLHttpRequest fails)
             self._create_html_dashboard(stats)
         except Exception as e:
@@ -210,7 +210,7 @@ def initialize_earth_engine():
         try:
             import ee
             import json
-            from gee.config import MAX_WORKERS, update_connection_pool_size, GEE_PROJECT
+            from gee.config import MAX_WORKERS, update_connection_pool_size, GEE_PROJECT, GEE_API_URL
             
             # Try service account authentication first if key file is available
             key_file = find_service_account_key()
@@ -218,27 +218,27 @@ def initialize_earth_engine():
                 try:
                     print(f"🔑 Using service account key file: {key_file}")
                     
-                    # Read the key file to extract project ID if needed
+                    # Read the key file once; it supplies the project ID if needed and the credentials
+                    with open(key_file, 'r') as f:
+                        key_text = f.read()
                     project_id = GEE_PROJECT
                     if not project_id:
                         try:
-                            with open(key_file, 'r') as f:
-                                key_data = json.load(f)
-                                project_id = key_data.get('project_id')
+                            project_id = json.loads(key_text).get('project_id')
                         except Exception:
                             pass
                     
                     # Authenticate using service account
-                    credentials = ee.ServiceAccountCredentials(None, key_file)
+                    credentials = ee.ServiceAccountCredentials(None, key_data=key_text)
                     
                     # Initialize with service account credentials
                     # If project_id is available, use it; otherwise let EE use default
                     if project_id:
-                        ee.Initialize(credentials, project=project_id)
+                        ee.Initialize(credentials, project=project_id, opt_url=GEE_API_URL)
                         logging.info(f"Initialized Earth Engine with service account from {key_file} (project: {project_id})")
                         print(f"✅ Earth Engine initialized with service account (project: {project_id})\n")
                     else:
-                        ee.Initialize(credentials)
+                        ee.Initialize(credentials, opt_url=GEE_API_URL)
                         logging.info(f"Initialized Earth Engine with service account from {key_file}")
                         print("✅ Earth Engine initialized with service account\n")
                     
@@ -269,12 +269,12 @@ def initialize_earth_engine():
             
             # Try to initialize with project if specified
             if project_id:
-                ee.Initialize(project=project_id)
+                ee.Initialize(project=project_id, opt_url=GEE_API_URL)
                 logging.info(f"Initialized Earth Engine with project: {project_id}")
             else:
                 # Try without project first, but this often fails now
                 try:
-                    ee.Initialize()
+                    ee.Initialize(opt_url=GEE_API_URL)
                 except Exception as no_project_error:
                     # If it fails because no project, provide helpful error
                     error_str = str(no_project_error).lower()
@@ -327,7 +327,7 @@ def initialize_earth_engine():
                         
                         # Try to initialize again after authentication
                         try:
-                            from gee.config import MAX_WORKERS, update_connection_pool_size, GEE_PROJECT
+                            from gee.config import MAX_WORKERS, update_connection_pool_size, GEE_PROJECT, GEE_API_URL
                             initial_pool_size = update_connection_pool_size(MAX_WORKERS)
                             if initial_pool_size:
                                 logging.info(f"Initialized urllib3 connection pool size: {initial_pool_size} (based on MAX_WORKERS={MAX_WORKERS})")
@@ -337,11 +337,11 @@ def initialize_earth_engine():
                             project_id = get_project_id() or GEE_PROJECT or os.environ.get('GEE_PROJECT') or os.environ.get('GOOGLE_CLOUD_PROJECT')
                             
                             if project_id:
-                                ee.Initialize(project=project_id)
+                                ee.Initialize(project=project_id, opt_url=GEE_API_URL)
                                 print(f"✅ Earth Engine initialized successfully with project: {project_id}!\n")
                             else:
                                 # Try without project, but it will likely fail
-                                ee.Initialize()
+                                ee.Initialize(opt_url=GEE_API_URL)
                                 print("✅ Earth Engine initialized successfully!\n")
                             return True
                         except Exception as retry_e:
@@ -390,7 +390,7 @@ def initialize_earth_engine():
                         
                         # Try to initialize again after authentication
                         try:
-                            from gee.config import MAX_WORKERS, update_connection_pool_size, GEE_PROJECT
+                            from gee.config import MAX_WORKERS, update_connection_pool_size, GEE_PROJECT, GEE_API_URL
                             initial_pool_size = update_connection_pool_size(MAX_WORKERS)
                             if initial_pool_size:
                                 logging.info(f"Initialized urllib3 connection pool size: {initial_pool_size} (based on MAX_WORKERS={MAX_WORKERS})")
@@ -400,11 +400,11 @@ def initialize_earth_engine():
                             project_id = get_project_id() or GEE_PROJECT or os.environ.get('GEE_PROJECT') or os.environ.get('GOOGLE_CLOUD_PROJECT')
                             
                             if project_id:
-                                ee.Initialize(project=project_id)
+                                ee.Initialize(project=project_id, opt_url=GEE_API_URL)
                                 print(f"✅ Earth Engine initialized successfully with project: {project_id}!\n")
                             else:
                                 # Try without project, but it will likely fail
-                                ee.Initialize()
+                                ee.Initialize(opt_url=GEE_API_URL)
                                 print("✅ Earth Engine initialized successfully!\n")
                             return True
                         except Exception as retry_e:
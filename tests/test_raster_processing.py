@@ -0,0 +1,42 @@
+"""
+Tests for local raster processing helpers.
+"""
+import zipfile
+
+import pytest
+
+np = pytest.importorskip("numpy")
+rasterio = pytest.importorskip("rasterio")
+pytest.importorskip("ee")  # gee/__init__ imports the Earth Engine modules
+from rasterio.transform import from_origin
+
+from gee.raster_processing import extract_and_merge_zip_tiffs
+
+
+def _write_band(path, value):
+    profile = {
+        "driver": "GTiff", "width": 4, "height": 3, "count": 1, "dtype": "uint16",
+        "crs": "EPSG:4326", "transform": from_origin(35.0, 31.5, 0.001, 0.001),
+    }
+    with rasterio.open(path, "w", **profile) as dst:
+        dst.write(np.full((3, 4), value, dtype=np.uint16), 1)
+
+
+def test_merge_zip_with_non_zip_name(tmp_path):
+    """The downloader's temp file is '<tile>.tif.download', not '.zip'."""
+    for name, value in (("B3", 30), ("B4", 40)):
+        _write_band(str(tmp_path / f"tile.{name}.tif"), value)
+    archive = tmp_path / "tile_000.tif.download"
+    with zipfile.ZipFile(archive, "w") as zf:
+        # Written out of band order to check the members are sorted (B4 before B3)
+        zf.write(tmp_path / "tile.B3.tif", "tile.B3.tif")
+        zf.write(tmp_path / "tile.B4.tif", "tile.B4.tif")
+
+    out_tif = str(tmp_path / "tile_000.tif")
+    assert extract_and_merge_zip_tiffs(str(archive), out_tif)
+
+    with rasterio.open(out_tif) as src:
+        assert src.count == 2
+        assert src.crs.to_epsg() == 4326
+        assert (src.read(1) == 40).all()
+        assert (src.read(2) == 30).all()